@@ -0,0 +1,48 @@
+"""Add expense listing indexes
+
+Revision ID: 3a7c9e1b2d40
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c9e1b2d40'
+down_revision: Union[str, None] = 'f1a2b3c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite indexes serving date-ordered expense lists.
+
+    Expense lists are paginated with ORDER BY date DESC LIMIT/OFFSET, either
+    per family or per user within a family. The (user_id, family_id) index
+    is superseded by its date-extended version.
+    """
+    op.drop_index('ix_expenses_user_family', table_name='expenses', if_exists=True)
+    op.create_index(
+        'ix_expenses_user_family_date',
+        'expenses',
+        ['user_id', 'family_id', 'date'],
+        unique=False,
+        if_not_exists=True
+    )
+    op.create_index(
+        'ix_expenses_family_date',
+        'expenses',
+        ['family_id', 'date'],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Restore the previous expense indexes."""
+    op.drop_index('ix_expenses_family_date', table_name='expenses', if_exists=True)
+    op.drop_index('ix_expenses_user_family_date', table_name='expenses', if_exists=True)
+    op.create_index('ix_expenses_user_family', 'expenses', ['user_id', 'family_id'], unique=False)
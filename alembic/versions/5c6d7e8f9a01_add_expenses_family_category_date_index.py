@@ -0,0 +1,37 @@
+"""Add expenses (family_id, category_id, date) index
+
+Revision ID: 5c6d7e8f9a01
+Revises: 9b8c7d6e5f40
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c6d7e8f9a01'
+down_revision: Union[str, None] = '9b8c7d6e5f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite index for per-category expense lists of a family.
+
+    Category drill-downs and search filter by family and category and order
+    by date, which the (family_id, date) index can only partially serve.
+    """
+    op.create_index(
+        'ix_expenses_family_category_date',
+        'expenses',
+        ['family_id', 'category_id', 'date'],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-category expense index."""
+    op.drop_index('ix_expenses_family_category_date', table_name='expenses', if_exists=True)
@@ -0,0 +1,59 @@
+"""Cover expense aggregates in the date indexes
+
+Revision ID: 6e7f8a9b0c12
+Revises: 5c6d7e8f9a01
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e7f8a9b0c12'
+down_revision: Union[str, None] = '5c6d7e8f9a01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Recreate the expense date indexes with INCLUDE columns on PostgreSQL.
+
+    Monthly summaries sum amounts per category and per user over a date
+    range. With category_id, user_id and amount stored in the index leaf,
+    PostgreSQL answers them with an index-only scan. SQLite has no INCLUDE,
+    so nothing changes there.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    op.drop_index('ix_expenses_family_date', table_name='expenses', if_exists=True)
+    op.create_index(
+        'ix_expenses_family_date',
+        'expenses',
+        ['family_id', 'date'],
+        unique=False,
+        postgresql_include=['category_id', 'user_id', 'amount']
+    )
+    op.drop_index('ix_expenses_user_family_date', table_name='expenses', if_exists=True)
+    op.create_index(
+        'ix_expenses_user_family_date',
+        'expenses',
+        ['user_id', 'family_id', 'date'],
+        unique=False,
+        postgresql_include=['category_id', 'amount']
+    )
+
+
+def downgrade() -> None:
+    """Recreate the expense date indexes without INCLUDE columns."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    op.drop_index('ix_expenses_user_family_date', table_name='expenses', if_exists=True)
+    op.create_index(
+        'ix_expenses_user_family_date', 'expenses', ['user_id', 'family_id', 'date'], unique=False
+    )
+    op.drop_index('ix_expenses_family_date', table_name='expenses', if_exists=True)
+    op.create_index('ix_expenses_family_date', 'expenses', ['family_id', 'date'], unique=False)
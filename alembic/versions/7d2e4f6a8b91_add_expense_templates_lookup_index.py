@@ -0,0 +1,40 @@
+"""Add expense_templates lookup index
+
+Revision ID: 7d2e4f6a8b91
+Revises: 3a7c9e1b2d40
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4f6a8b91'
+down_revision: Union[str, None] = '3a7c9e1b2d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace (user_id, family_id) with an index matching the template list order."""
+    op.drop_index(
+        'ix_expense_templates_user_family', table_name='expense_templates', if_exists=True
+    )
+    op.create_index(
+        'ix_expense_templates_lookup',
+        'expense_templates',
+        ['user_id', 'family_id', 'name'],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Restore the (user_id, family_id) index."""
+    op.drop_index('ix_expense_templates_lookup', table_name='expense_templates', if_exists=True)
+    op.create_index(
+        'ix_expense_templates_user_family', 'expense_templates', ['user_id', 'family_id'],
+        unique=False
+    )
@@ -0,0 +1,39 @@
+"""Add expenses (user_id, date) index
+
+Revision ID: 7f8a9b0c1d23
+Revises: 6e7f8a9b0c12
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f8a9b0c1d23'
+down_revision: Union[str, None] = '6e7f8a9b0c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add covering date index for personal statistics.
+
+    Personal statistics filter by user and date range across all families.
+    In (user_id, family_id, date) the date only narrows the scan once the
+    family is fixed, so those queries read every expense of the user.
+    """
+    op.create_index(
+        'ix_expenses_user_date',
+        'expenses',
+        ['user_id', 'date'],
+        unique=False,
+        postgresql_include=['category_id', 'amount'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Drop the personal statistics index."""
+    op.drop_index('ix_expenses_user_date', table_name='expenses', if_exists=True)
@@ -0,0 +1,49 @@
+"""Add unique constraint on family_members (user_id, family_id)
+
+Revision ID: 9b8c7d6e5f40
+Revises: 7d2e4f6a8b91
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b8c7d6e5f40'
+down_revision: Union[str, None] = '7d2e4f6a8b91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Enforce one membership per user and family.
+    
+    The unique index also serves membership lookups by (user_id, family_id),
+    so the plain composite index becomes redundant.
+    """
+    inspector = sa.inspect(op.get_bind())
+    existing = {c['name'] for c in inspector.get_unique_constraints('family_members')}
+    
+    if 'uq_user_family' not in existing:
+        # Keep the oldest row of any duplicated membership
+        op.execute(
+            "DELETE FROM family_members WHERE id NOT IN ("
+            "SELECT MIN(id) FROM family_members GROUP BY user_id, family_id)"
+        )
+        # Using batch mode for SQLite compatibility
+        with op.batch_alter_table('family_members', schema=None) as batch_op:
+            batch_op.create_unique_constraint('uq_user_family', ['user_id', 'family_id'])
+    
+    op.drop_index('ix_family_members_user_family', table_name='family_members', if_exists=True)
+
+
+def downgrade() -> None:
+    """Drop the unique constraint and restore the plain composite index."""
+    op.create_index(
+        'ix_family_members_user_family', 'family_members', ['user_id', 'family_id'], unique=False
+    )
+    with op.batch_alter_table('family_members', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_user_family', type_='unique')
@@ -4,11 +4,12 @@ This package contains the core functionality of the Telegram bot
 for tracking family expenses and income.
 """
 
+import importlib
 import logging
 import warnings
 from typing import Optional
 
-from telegram.ext import Application
+from telegram.ext import AIORateLimiter, Application
 from telegram.warnings import PTBUserWarning
 
 from config.settings import settings
@@ -23,6 +24,120 @@ warnings.filterwarnings(
 
 logger = logging.getLogger(__name__)
 
+# Handler registration tables: (module, [attribute names]) in registration
+# order. PTB dispatches to the first matching handler of a group, so the
+# order below is significant (conversations before plain callbacks).
+PRIORITY_HANDLERS: list[tuple[str, list[str]]] = [
+    ("bot.handlers.navigation", ["navigation_back_callback_handler"]),
+]
+
+HANDLERS: list[tuple[str, list[str]]] = [
+    # Command handlers
+    ("bot.handlers.start", ["start_handler"]),
+    ("bot.handlers.help", ["help_handler"]),
+    ("bot.handlers.settings", ["settings_handler"]),
+    ("bot.handlers.family_settings", ["family_settings_handler_cmd"]),
+    ("bot.handlers.start", ["about_handler"]),
+    ("bot.handlers.categories", ["categories_handler"]),
+    ("bot.handlers.recent_operations", ["recent_operations_command_handler"]),
+    
+    # Conversation handlers (must be before callback handlers)
+    ("bot.handlers.family", ["create_family_handler", "join_family_handler"]),
+    ("bot.handlers.expenses", ["add_expense_handler"]),
+    ("bot.handlers.incomes", ["add_income_handler"]),
+    ("bot.handlers.expenses", ["view_expenses_handler", "family_expenses_handler"]),
+    ("bot.handlers.statistics", ["stats_handler"]),
+    ("bot.handlers.search", ["search_handler"]),
+    ("bot.handlers.quick_expense", ["quick_expense_handler"]),
+    ("bot.handlers.categories", [
+        "add_category_handler",
+        "edit_category_handler",
+        "delete_category_handler",
+    ]),
+    ("bot.handlers.family_settings", ["family_rename_handler"]),
+    
+    # Family command handlers
+    ("bot.handlers.family", [
+        "my_families_handler_cmd",
+        "my_families_handler_callback",
+        "view_family_handler",
+        "leave_family_handler",
+        "confirm_leave_family_handler",
+        "delete_family_handler",
+        "confirm_delete_family_handler",
+    ]),
+    
+    # Pagination and family expenses grouping
+    # (export lives in the statistics section, CSV export was removed)
+    ("bot.handlers.expenses", [
+        "pagination_callback_handler",
+        "family_pagination_callback_handler",
+        "family_grouping_callback_handler",
+    ]),
+    
+    # Categories callback handlers
+    ("bot.handlers.categories", ["show_categories_handler", "categories_callback_handler"]),
+    
+    # Help callback handlers
+    ("bot.handlers.help", [
+        "help_callback_handler",
+        "help_families_handler",
+        "help_expenses_handler",
+        "help_stats_handler",
+        "help_settings_handler",
+    ]),
+    
+    # Settings callback handlers
+    ("bot.handlers.settings", [
+        "settings_callback_handler",
+        "settings_currency_handler",
+        "currency_selection_handler",
+        "settings_timezone_handler",
+        "timezone_selection_handler",
+        "settings_date_format_handler",
+        "date_format_selection_handler",
+        "settings_monthly_summary_handler",
+        "monthly_summary_time_handler",
+        "settings_expense_notifications_handler",
+    ]),
+    
+    # Family settings callback handlers
+    ("bot.handlers.family_settings", [
+        "family_settings_callback_handler",
+        "family_settings_select_handler",
+        "family_regenerate_code_handler",
+        "family_manage_members_handler",
+        "family_leave_handler",
+        "confirm_leave_family_handler",
+        "family_delete_handler",
+        "confirm_delete_family_handler",
+    ]),
+    
+    ("bot.handlers.recent_operations", ["recent_operations_callback_handler"]),
+    ("bot.handlers.start", ["start_callback_handler"]),
+]
+
+ERROR_HANDLERS: list[tuple[str, list[str]]] = [
+    ("bot.handlers.middleware", ["enhanced_error_handler"]),
+    ("bot.handlers.errors", ["error_handler"]),
+]
+
+
+def _load_handlers(table: list[tuple[str, list[str]]]) -> list:
+    """Import handler modules from a registration table.
+    
+    Args:
+        table: List of (module name, handler attribute names)
+        
+    Returns:
+        Handler objects in table order
+    """
+    handlers = []
+    for module_name, attrs in table:
+        module = importlib.import_module(module_name)
+        handlers.extend(getattr(module, attr) for attr in attrs)
+    return handlers
+
 
 class FamilyFinanceBot:
     """Main bot class that encapsulates the bot's functionality."""
@@ -47,240 +162,37 @@ class FamilyFinanceBot:
             logger.error(f"Failed to initialize database: {e}", exc_info=True)
             raise
         
-        # Build the application
+        # Preload known users so their first update after a restart
+        # doesn't need a user lookup
+        from bot.utils.helpers import warm_user_id_cache
+        
+        try:
+            count = await warm_user_id_cache()
+            logger.info(f"Loaded {count} known users")
+        except Exception as e:
+            logger.warning(f"Failed to preload known users: {e}")
+        
+        # Build the application. The rate limiter keeps all bot calls,
+        # including scheduler broadcasts, within Telegram's flood limits;
+        # HTTP/2 lets concurrent calls share one connection
         self.application = (
             Application.builder()
             .token(self.token)
+            .http_version("2")
+            .rate_limiter(AIORateLimiter())
             .build()
         )
         
-        # Import handlers
-        from telegram.ext import CallbackQueryHandler
-        
-        from bot.handlers.categories import (
-            add_category_handler,
-            categories_callback_handler,
-            categories_handler,
-            delete_category_handler,
-            edit_category_handler,
-            show_categories_handler,
-        )
-        from bot.handlers.errors import error_handler
-        from bot.handlers.expenses import (
-            add_expense_handler,
-            view_expenses_handler,
-            family_expenses_handler,
-            # family_export_handler,  # Export moved to statistics section
-            # family_export_csv_handler,  # CSV export removed
-            # family_export_gdocs_handler,  # Export moved to statistics section
-            family_grouping_handler,
-            family_pagination_handler,
-            # my_export_handler,  # Export moved to statistics section
-            # my_export_csv_handler,  # CSV export removed
-            # my_export_gdocs_handler,  # Export moved to statistics section
-            pagination_handler,
-        )
-        from bot.handlers.incomes import add_income_handler
-        from bot.handlers.family import (
-            confirm_delete_family_handler as my_families_confirm_delete_handler,
-            confirm_leave_family_handler as my_families_confirm_leave_handler,
-            create_family_handler,
-            delete_family_handler as my_families_delete_handler,
-            join_family_handler,
-            leave_family_handler as my_families_leave_handler,
-            my_families_handler_callback,
-            my_families_handler_cmd,
-            view_family_handler,
-        )
-        from bot.handlers.family_settings import (
-            confirm_delete_family_handler,
-            confirm_leave_family_handler,
-            family_delete_handler,
-            family_leave_handler,
-            family_manage_members_handler,
-            family_regenerate_code_handler,
-            family_rename_handler,
-            family_settings_callback_handler,
-            family_settings_handler_cmd,
-            family_settings_select_handler,
-        )
-        from bot.handlers.help import (
-            help_callback_handler,
-            help_expenses_handler,
-            help_families_handler,
-            help_handler,
-            help_settings_handler,
-            help_stats_handler,
-        )
-        from bot.handlers.middleware import enhanced_error_handler
-        from bot.handlers.navigation import navigation_back_callback_handler
-        from bot.handlers.quick_expense import quick_expense_handler
-        from bot.handlers.recent_operations import (
-            recent_operations_callback_handler,
-            recent_operations_command_handler,
-        )
-        from bot.handlers.search import search_handler
-        from bot.handlers.settings import (
-            currency_selection_handler,
-            date_format_selection_handler,
-            monthly_summary_time_handler,
-            settings_callback_handler,
-            settings_currency_handler,
-            settings_date_format_handler,
-            settings_expense_notifications_handler,
-            settings_handler,
-            settings_monthly_summary_handler,
-            settings_timezone_handler,
-            timezone_selection_handler,
-        )
-        from bot.handlers.start import about_handler, start_callback_handler, start_handler
-        from bot.handlers.statistics import stats_handler
-        
-        # Register navigation handler FIRST with high priority (group=-1)
-        # This ensures it can end conversations before they process the callback
-        self.application.add_handler(navigation_back_callback_handler, group=-1)
-        
-        # Register command handlers
-        self.application.add_handler(start_handler)
-        self.application.add_handler(help_handler)
-        self.application.add_handler(settings_handler)
-        self.application.add_handler(family_settings_handler_cmd)
-        self.application.add_handler(about_handler)
-        self.application.add_handler(categories_handler)
-        self.application.add_handler(recent_operations_command_handler)
-        
-        # Register conversation handlers (must be before callback handlers)
-        self.application.add_handler(create_family_handler)
-        self.application.add_handler(join_family_handler)
-        self.application.add_handler(add_expense_handler)
-        self.application.add_handler(add_income_handler)
-        self.application.add_handler(view_expenses_handler)
-        self.application.add_handler(family_expenses_handler)
-        self.application.add_handler(stats_handler)
-        self.application.add_handler(search_handler)
-        self.application.add_handler(quick_expense_handler)
-        self.application.add_handler(add_category_handler)
-        self.application.add_handler(edit_category_handler)
-        self.application.add_handler(delete_category_handler)
-        self.application.add_handler(family_rename_handler)
-        
-        # Register family command handlers
-        self.application.add_handler(my_families_handler_cmd)
-        self.application.add_handler(my_families_handler_callback)
-        self.application.add_handler(view_family_handler)
-        self.application.add_handler(my_families_leave_handler)
-        self.application.add_handler(my_families_confirm_leave_handler)
-        self.application.add_handler(my_families_delete_handler)
-        self.application.add_handler(my_families_confirm_delete_handler)
-        
-        # Register pagination handler
-        pagination_callback_handler = CallbackQueryHandler(
-            pagination_handler,
-            pattern="^page_(prev|next|current)$"
-        )
-        self.application.add_handler(pagination_callback_handler)
-        
-        # Register family expenses handlers
-        family_pagination_callback_handler = CallbackQueryHandler(
-            family_pagination_handler,
-            pattern="^family_page_(prev|next|current)$"
-        )
-        self.application.add_handler(family_pagination_callback_handler)
-        
-        family_grouping_callback_handler = CallbackQueryHandler(
-            family_grouping_handler,
-            pattern="^family_group_(user|category|default)$"
-        )
-        self.application.add_handler(family_grouping_callback_handler)
-        
-        # Export handlers moved to statistics section
-        # my_export_callback_handler = CallbackQueryHandler(
-        #     my_export_handler,
-        #     pattern="^my_export$"
-        # )
-        # self.application.add_handler(my_export_callback_handler)
-        
-        # CSV export removed - only HTML export is supported
-        # my_export_csv_callback_handler = CallbackQueryHandler(
-        #     my_export_csv_handler,
-        #     pattern="^my_export_csv$"
-        # )
-        # self.application.add_handler(my_export_csv_callback_handler)
-        
-        # Export handlers moved to statistics section
-        # my_export_gdocs_callback_handler = CallbackQueryHandler(
-        #     my_export_gdocs_handler,
-        #     pattern="^my_export_gdocs$"
-        # )
-        # self.application.add_handler(my_export_gdocs_callback_handler)
-        
-        # Export handlers moved to statistics section
-        # family_export_callback_handler = CallbackQueryHandler(
-        #     family_export_handler,
-        #     pattern="^family_export$"
-        # )
-        # self.application.add_handler(family_export_callback_handler)
-        
-        # CSV export removed - only HTML export is supported
-        # family_export_csv_callback_handler = CallbackQueryHandler(
-        #     family_export_csv_handler,
-        #     pattern="^family_export_csv$"
-        # )
-        # self.application.add_handler(family_export_csv_callback_handler)
-        
-        # Export handlers moved to statistics section
-        # family_export_gdocs_callback_handler = CallbackQueryHandler(
-        #     family_export_gdocs_handler,
-        #     pattern="^family_export_gdocs$"
-        # )
-        # self.application.add_handler(family_export_gdocs_callback_handler)
-        
-        # Detailed report handlers are no longer needed as they are integrated into statistics
-        
-        # Register categories callback handlers
-        self.application.add_handler(show_categories_handler)
-        self.application.add_handler(categories_callback_handler)
-        
-        # Register help callback handlers
-        self.application.add_handler(help_callback_handler)
-        self.application.add_handler(help_families_handler)
-        self.application.add_handler(help_expenses_handler)
-        self.application.add_handler(help_stats_handler)
-        self.application.add_handler(help_settings_handler)
-        
-        # Register settings callback handlers
-        self.application.add_handler(settings_callback_handler)
-        self.application.add_handler(settings_currency_handler)
-        self.application.add_handler(currency_selection_handler)
-        self.application.add_handler(settings_timezone_handler)
-        self.application.add_handler(timezone_selection_handler)
-        self.application.add_handler(settings_date_format_handler)
-        self.application.add_handler(date_format_selection_handler)
-        self.application.add_handler(settings_monthly_summary_handler)
-        self.application.add_handler(monthly_summary_time_handler)
-        self.application.add_handler(settings_expense_notifications_handler)
-        
-        # Register family settings callback handlers
-        self.application.add_handler(family_settings_callback_handler)
-        self.application.add_handler(family_settings_select_handler)
-        self.application.add_handler(family_regenerate_code_handler)
-        self.application.add_handler(family_manage_members_handler)
-        self.application.add_handler(family_leave_handler)
-        self.application.add_handler(confirm_leave_family_handler)
-        self.application.add_handler(family_delete_handler)
-        self.application.add_handler(confirm_delete_family_handler)
-
-        # Register recent operations callback handler
-        self.application.add_handler(recent_operations_callback_handler)
-        
-        # Register start callback handler
-        self.application.add_handler(start_callback_handler)
+        # Navigation handler goes FIRST with high priority (group=-1)
+        # so it can end conversations before they process the callback
+        for handler in _load_handlers(PRIORITY_HANDLERS):
+            self.application.add_handler(handler, group=-1)
         
-        # Navigation handler already registered in group=-1 at the beginning
+        for handler in _load_handlers(HANDLERS):
+            self.application.add_handler(handler)
         
-        # Register enhanced error handler
-        self.application.add_error_handler(enhanced_error_handler)
-        self.application.add_error_handler(error_handler)
+        for error_handler in _load_handlers(ERROR_HANDLERS):
+            self.application.add_error_handler(error_handler)
         
         # TODO: Add inline query handlers
         
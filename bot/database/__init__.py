@@ -3,6 +3,7 @@
 from .database import (
     create_default_categories,
     db_manager,
+    db_session,
     get_db,
     init_database,
     reset_database,
@@ -23,6 +24,7 @@ __all__ = [
     "RoleEnum",
     # Database functions
     "db_manager",
+    "db_session",
     "get_db",
     "init_database",
     "create_default_categories",
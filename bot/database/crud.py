@@ -4,19 +4,240 @@ This module contains functions for Create, Read, Update, Delete operations
 on database models.
 """
 
+import asyncio
+import functools
+import inspect
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
-
-from sqlalchemy import select
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    String,
+    and_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    desc,
+    event,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    type_coerce,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-
-from .models import Category, CategoryTypeEnum, Expense, ExpenseTemplate, Family, FamilyMember, Income, User
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload, selectinload
+
+from .models import (
+    Category,
+    CategoryTypeEnum,
+    Expense,
+    ExpenseTemplate,
+    Family,
+    FamilyMember,
+    Income,
+    RoleEnum,
+    User,
+    generate_invite_code,
+)
 
 logger = logging.getLogger(__name__)
 
+# Retries for invite code regeneration on a UNIQUE constraint collision
+INVITE_CODE_MAX_ATTEMPTS = 5
+
+# Negative cache for invite code lookups: code -> expiry (time.monotonic()).
+# Repeated attempts with a wrong code skip the database until the entry
+# expires; codes are removed as soon as a family starts using them.
+INVALID_INVITE_CODE_TTL = 60
+INVALID_INVITE_CODE_CACHE_SIZE = 10_000
+_invalid_invite_codes: Dict[str, float] = {}
+
+# Expense summaries and statistics for bounded periods, per owner:
+# ('family', family_id) or ('user', user_id) ->
+# {(kind, ..., start_date, end_date): (expiry, summary)}.
+# Users re-open the same period within seconds; writes through this module
+# drop the affected family's and user's entries once they are committed,
+# the TTL bounds anything else. Expired entries of a scope are swept when
+# it is written to. Cached results are shared by every caller and must be
+# treated as read-only.
+SUMMARY_CACHE_TTL = 60
+SUMMARY_CACHE_SIZE = 10_000
+_summary_cache: Dict[Tuple[str, int], Dict[tuple, Tuple[float, dict]]] = {}
+
+
+def _summary_scope(entity_id: int, is_family: bool) -> Tuple[str, int]:
+    """Return the summary cache owner for a user or family."""
+    return ('family' if is_family else 'user', entity_id)
+
+
+def _get_cached_summary(scope: Tuple[str, int], key: tuple) -> Optional[dict]:
+    """Return a cached expenses summary if it has not expired.
+    
+    The result is shared with other callers and must not be modified.
+    """
+    entry = _summary_cache.get(scope, {}).get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _summary_cache[scope][key]
+        return None
+    return entry[1]
+
+
+def _cache_summary(scope: Tuple[str, int], key: tuple, summary: dict) -> None:
+    """Store an expenses summary for SUMMARY_CACHE_TTL seconds."""
+    if len(_summary_cache) >= SUMMARY_CACHE_SIZE:
+        _summary_cache.clear()
+    now = time.monotonic()
+    entries = _summary_cache.setdefault(scope, {})
+    # Periods viewed once are never read again, drop them here
+    for expired in [k for k, (expiry, _) in entries.items() if expiry <= now]:
+        del entries[expired]
+    entries[key] = (now + SUMMARY_CACHE_TTL, summary)
+
+
+def invalidate_summary_cache(
+    family_id: Optional[int] = None,
+    user_id: Optional[int] = None
+) -> None:
+    """Drop cached expense summaries.
+    
+    Args:
+        family_id: Family whose expenses changed
+        user_id: User whose expenses changed
+        
+    With neither argument, every cached summary is dropped.
+    """
+    if family_id is None and user_id is None:
+        _summary_cache.clear()
+        return
+    if family_id is not None:
+        _summary_cache.pop(_summary_scope(family_id, True), None)
+    if user_id is not None:
+        _summary_cache.pop(_summary_scope(user_id, False), None)
+
+
+# Summaries a session's writes made stale, as (family_id, user_id) pairs
+# for invalidate_summary_cache. They are dropped only after the session
+# commits: a reader in between would otherwise re-cache pre-commit data
+# for the whole TTL, and a rollback leaves nothing to invalidate.
+_DIRTY_SUMMARIES_KEY = 'dirty_summary_scopes'
+
+
+def _mark_summaries_dirty(
+    session: AsyncSession,
+    family_id: Optional[int] = None,
+    user_id: Optional[int] = None
+) -> None:
+    """Invalidate cached summaries once the session commits.
+    
+    Args:
+        session: Database session doing the write
+        family_id: Family whose expenses or incomes changed
+        user_id: User whose expenses or incomes changed
+        
+    With neither argument, every cached summary is dropped on commit.
+    """
+    session.info.setdefault(_DIRTY_SUMMARIES_KEY, set()).add((family_id, user_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_summaries(session: Session) -> None:
+    """Drop the summaries made stale by a committed transaction."""
+    for family_id, user_id in session.info.pop(_DIRTY_SUMMARIES_KEY, ()):
+        invalidate_summary_cache(family_id, user_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_dirty_summaries(session: Session, transaction) -> None:
+    """Forget pending invalidations when the outermost transaction rolls back."""
+    if transaction.parent is None:
+        session.info.pop(_DIRTY_SUMMARIES_KEY, None)
+
+
+# Columns that update_user_settings / update_family_settings may change
+USER_SETTINGS_FIELDS = frozenset({
+    'currency', 'timezone', 'date_format',
+    'monthly_summary_enabled', 'monthly_summary_time',
+})
+FAMILY_SETTINGS_FIELDS = frozenset({'name'})
+
+# Statements for hot lookups, built once and executed with bound parameters
+# so each call skips constructing a new Select (the compiled form is reused
+# from the engine's query cache).
+_STMT_USER_BY_TG = select(User).where(User.telegram_id == bindparam('telegram_id'))
+_STMT_FAMILY_BY_ID = select(Family).where(Family.id == bindparam('family_id'))
+_STMT_FAMILY_MEMBER = select(FamilyMember).where(
+    FamilyMember.user_id == bindparam('user_id'),
+    FamilyMember.family_id == bindparam('family_id'),
+)
+_STMT_DEFAULT_CATS = (
+    select(Category)
+    .where(Category.is_default == True)
+    .order_by(Category.id)
+)
+_STMT_DEFAULT_CATS_BY_TYPE = _STMT_DEFAULT_CATS.where(
+    Category.category_type == bindparam('category_type')
+)
+_STMT_FAMILY_EXPENSES = (
+    select(Expense)
+    .options(raiseload('*'))
+    .where(Expense.family_id == bindparam('family_id'))
+    .order_by(Expense.date.desc())
+)
+_STMT_FAMILY_EXPENSES_LIMITED = _STMT_FAMILY_EXPENSES.limit(bindparam('limit'))
+
+# Expense description as shown in reports: missing or empty becomes "—"
+_EXPENSE_DESCRIPTION_OR_DASH = func.coalesce(
+    func.nullif(Expense.description, ''), "—"
+).label('description')
+
+# Loader options for expense lists: only the columns the list views render.
+# Any other relationship access raises instead of silently issuing a query.
+_EXPENSE_LIST_COLUMNS = load_only(
+    Expense.amount,
+    Expense.description,
+    Expense.date,
+    Expense.user_id,
+    Expense.category_id
+)
+_EXPENSE_LIST_OPTIONS = (
+    _EXPENSE_LIST_COLUMNS,
+    selectinload(Expense.category).load_only(Category.name, Category.icon),
+    selectinload(Expense.user).load_only(User.name),
+    raiseload('*'),
+)
+# Same columns, but category and user come from inner JOINs in the main
+# statement; used where both are always read (grouped periods, search).
+_EXPENSE_GROUPING_OPTIONS = (
+    _EXPENSE_LIST_COLUMNS,
+    joinedload(Expense.category, innerjoin=True).load_only(Category.name, Category.icon),
+    joinedload(Expense.user, innerjoin=True).load_only(User.name),
+    raiseload('*'),
+)
+
+
+class CategoryRow(NamedTuple):
+    """Lightweight category row for list views (no ORM instrumentation)."""
+
+    id: int
+    name: str
+    icon: str
+    is_default: bool
+
 
 # ============================================================================
 # User CRUD operations
@@ -37,7 +258,7 @@ async def get_user_by_telegram_id(
     """
     try:
         result = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
+            _STMT_USER_BY_TG, {'telegram_id': telegram_id}
         )
         user = result.scalar_one_or_none()
         
@@ -52,6 +273,30 @@ async def get_user_by_telegram_id(
         raise
 
 
+async def get_user_id_map(
+    session: AsyncSession,
+    limit: Optional[int] = None
+) -> Dict[int, int]:
+    """Get the telegram_id -> user_id mapping of registered users.
+    
+    Args:
+        session: Database session
+        limit: Maximum number of users, newest first (optional)
+        
+    Returns:
+        Dictionary mapping Telegram IDs to user IDs
+    """
+    try:
+        query = select(User.telegram_id, User.id).order_by(User.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        result = await session.execute(query)
+        return dict(result.tuples().all())
+    except Exception as e:
+        logger.error("Error getting user id map: %s", e)
+        raise
+
+
 async def create_user(
     session: AsyncSession,
     telegram_id: int,
@@ -89,6 +334,67 @@ async def create_user(
         raise
 
 
+async def get_or_create_user(
+    session: AsyncSession,
+    telegram_id: int,
+    name: str,
+    username: Optional[str] = None
+) -> Tuple[User, bool]:
+    """Get user by Telegram ID, creating it if missing.
+    
+    Returning users cost a single read. A missing user is inserted with
+    INSERT ... ON CONFLICT (telegram_id) DO NOTHING RETURNING, so a
+    concurrent /start for the same user can't fail on the unique index:
+    when the insert returns nothing, the other request's row is read back.
+    Existing rows are never written.
+    
+    Args:
+        session: Database session
+        telegram_id: Telegram user ID
+        name: User's name for a new user
+        username: Telegram username for a new user (optional)
+        
+    Returns:
+        Tuple of (User object, whether it was created)
+    """
+    try:
+        result = await session.execute(_STMT_USER_BY_TG, {'telegram_id': telegram_id})
+        user = result.scalar_one_or_none()
+        if user is not None:
+            logger.info(f"Found user: {user.name} (telegram_id={telegram_id})")
+            return user, False
+        
+        if session.bind.dialect.name == "postgresql":
+            dialect_insert = postgresql.insert
+        else:
+            dialect_insert = sqlite.insert
+        
+        stmt = (
+            dialect_insert(User)
+            .values(telegram_id=telegram_id, name=name, username=username)
+            .on_conflict_do_nothing(index_elements=[User.telegram_id])
+            .returning(User)
+        )
+        result = await session.execute(stmt)
+        user = result.scalar_one_or_none()
+        
+        if user is None:
+            # Created concurrently by another request
+            result = await session.execute(_STMT_USER_BY_TG, {'telegram_id': telegram_id})
+            user = result.scalar_one()
+            logger.info(f"Found user: {user.name} (telegram_id={telegram_id})")
+            return user, False
+        
+        logger.info(
+            f"Created new user: {user.name} "
+            f"(id={user.id}, telegram_id={telegram_id})"
+        )
+        return user, True
+    except Exception as e:
+        logger.error(f"Error getting or creating user (telegram_id={telegram_id}): {e}")
+        raise
+
+
 async def get_user_by_id(
     session: AsyncSession,
     user_id: int
@@ -103,10 +409,9 @@ async def get_user_by_id(
         User object or None if not found
     """
     try:
-        result = await session.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        # Primary key lookup: served from the identity map when the user
+        # is already loaded in this session, without a query
+        return await session.get(User, user_id)
     except Exception as e:
         logger.error(f"Error getting user by id {user_id}: {e}")
         raise
@@ -122,31 +427,31 @@ async def update_user_settings(
     Args:
         session: Database session
         user_id: User ID
-        **settings: Settings to update (currency, timezone, date_format, 
-                   daily_summary_enabled, daily_summary_time)
+        **settings: Settings to update (currency, timezone, date_format,
+                   monthly_summary_enabled, monthly_summary_time);
+                   unknown keys are ignored
         
     Returns:
         Updated User object or None if not found
     """
     try:
-        user = await get_user_by_id(session, user_id)
+        values = {key: value for key, value in settings.items() if key in USER_SETTINGS_FIELDS}
+        
+        if not values:
+            # Nothing to write: answer from the identity map when possible
+            logger.debug(f"No valid settings for user {user_id}: {list(settings)}")
+            return await session.get(User, user_id)
+        
+        # Single UPDATE ... RETURNING instead of SELECT + flush
+        result = await session.execute(
+            update(User).where(User.id == user_id).values(**values).returning(User)
+        )
+        user = result.scalar_one_or_none()
         
         if not user:
             logger.warning(f"User {user_id} not found for settings update")
             return None
         
-        # Update allowed settings
-        allowed_fields = {
-            'currency', 'timezone', 'date_format',
-            'monthly_summary_enabled', 'monthly_summary_time'
-        }
-        
-        for key, value in settings.items():
-            if key in allowed_fields:
-                setattr(user, key, value)
-        
-        await session.flush()
-        
         logger.info(f"Updated settings for user {user_id}: {settings}")
         
         return user
@@ -161,34 +466,102 @@ async def update_user_settings(
 
 async def get_user_families(
     session: AsyncSession,
-    user_id: int
+    user_id: int,
+    with_members: bool = False
 ) -> List[Family]:
     """Get all families that user belongs to.
     
     Args:
         session: Database session
         user_id: Internal user ID
+        with_members: Preload Family.members[].user with one extra IN query
+            per relationship (lazy loading is not available in async sessions)
         
     Returns:
         List of Family objects
     """
     try:
-        result = await session.execute(
+        query = (
             select(Family)
             .join(FamilyMember)
             .where(FamilyMember.user_id == user_id)
             .order_by(Family.created_at.desc())
         )
+        
+        if with_members:
+            query = query.options(
+                selectinload(Family.members).selectinload(FamilyMember.user)
+            )
+        
+        result = await session.execute(query)
         families = result.scalars().all()
         
         logger.info(f"Found {len(families)} families for user_id={user_id}")
         
-        return list(families)
+        return families
     except Exception as e:
         logger.error(f"Error getting families for user_id {user_id}: {e}")
         raise
 
 
+async def get_users_with_monthly_summary(
+    session: AsyncSession
+) -> List[User]:
+    """Get users with monthly summary enabled, with their families preloaded.
+
+    Memberships and families are loaded with selectinload, so the whole
+    batch costs a fixed number of queries instead of one per user.
+
+    Args:
+        session: Database session
+
+    Returns:
+        List of User objects with family_memberships[].family populated
+    """
+    try:
+        result = await session.execute(
+            select(User)
+            .where(User.monthly_summary_enabled.is_(True))
+            .options(
+                selectinload(User.family_memberships).selectinload(FamilyMember.family)
+            )
+        )
+        users = result.scalars().all()
+
+        logger.info(f"Found {len(users)} users with monthly summary enabled")
+
+        return users
+    except Exception as e:
+        logger.error(f"Error getting users with monthly summary enabled: {e}")
+        raise
+
+
+async def mark_monthly_summaries_sent(
+    session: AsyncSession,
+    user_ids: List[int],
+    sent_at: datetime
+) -> None:
+    """Record that monthly summaries were sent to users.
+    
+    One UPDATE for the whole batch; the caller commits.
+    
+    Args:
+        session: Database session
+        user_ids: Internal user IDs
+        sent_at: Time the summaries were sent
+    """
+    try:
+        await session.execute(
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(last_monthly_summary_sent=sent_at)
+            .execution_options(synchronize_session=False)
+        )
+    except Exception as e:
+        logger.error(f"Error marking monthly summaries sent for {len(user_ids)} users: {e}")
+        raise
+
+
 async def create_family(
     session: AsyncSession,
     name: str
@@ -206,6 +579,7 @@ async def create_family(
         family = Family(name=name)
         session.add(family)
         await session.flush()
+        _invalid_invite_codes.pop(family.invite_code, None)
         
         logger.info(
             f"Created new family: {family.name} "
@@ -231,6 +605,13 @@ async def get_family_by_invite_code(
     Returns:
         Family object or None if not found
     """
+    expires_at = _invalid_invite_codes.get(invite_code)
+    if expires_at is not None:
+        if expires_at > time.monotonic():
+            logger.info(f"Family not found (invite_code={invite_code}, cached)")
+            return None
+        del _invalid_invite_codes[invite_code]
+    
     try:
         result = await session.execute(
             select(Family).where(Family.invite_code == invite_code)
@@ -241,6 +622,9 @@ async def get_family_by_invite_code(
             logger.info(f"Found family by invite code: {family.name}")
         else:
             logger.info(f"Family not found (invite_code={invite_code})")
+            if len(_invalid_invite_codes) >= INVALID_INVITE_CODE_CACHE_SIZE:
+                _invalid_invite_codes.clear()
+            _invalid_invite_codes[invite_code] = time.monotonic() + INVALID_INVITE_CODE_TTL
             
         return family
     except Exception as e:
@@ -263,7 +647,7 @@ async def get_family_by_id(
     """
     try:
         result = await session.execute(
-            select(Family).where(Family.id == family_id)
+            _STMT_FAMILY_BY_ID, {'family_id': family_id}
         )
         return result.scalar_one_or_none()
     except Exception as e:
@@ -271,6 +655,39 @@ async def get_family_by_id(
         raise
 
 
+async def delete_family(
+    session: AsyncSession,
+    family: Family
+) -> None:
+    """Delete a family with its members, expenses and incomes.
+    
+    The cascade removes operations of every user who recorded them in the
+    family, so their personal summaries are invalidated on commit along
+    with the family's. The caller commits.
+    
+    Args:
+        session: Database session
+        family: Family to delete
+    """
+    try:
+        result = await session.execute(
+            union_all(
+                select(Expense.user_id).where(Expense.family_id == family.id),
+                select(Income.user_id).where(Income.family_id == family.id)
+            )
+        )
+        for user_id in set(result.scalars()):
+            _mark_summaries_dirty(session, user_id=user_id)
+        _mark_summaries_dirty(session, family_id=family.id)
+        
+        await session.delete(family)
+        
+        logger.info(f"Deleted family {family.id}")
+    except Exception as e:
+        logger.error(f"Error deleting family {family.id}: {e}")
+        raise
+
+
 async def update_family_settings(
     session: AsyncSession,
     family_id: int,
@@ -281,27 +698,28 @@ async def update_family_settings(
     Args:
         session: Database session
         family_id: Family ID
-        **settings: Settings to update (name, etc.)
+        **settings: Settings to update (name); unknown keys are ignored
         
     Returns:
         Updated Family object or None if not found
     """
     try:
-        family = await get_family_by_id(session, family_id)
+        values = {key: value for key, value in settings.items() if key in FAMILY_SETTINGS_FIELDS}
+        
+        if not values:
+            # Nothing to write: answer from the identity map when possible
+            logger.debug(f"No valid settings for family {family_id}: {list(settings)}")
+            return await session.get(Family, family_id)
+        
+        result = await session.execute(
+            update(Family).where(Family.id == family_id).values(**values).returning(Family)
+        )
+        family = result.scalar_one_or_none()
         
         if not family:
             logger.warning(f"Family {family_id} not found for settings update")
             return None
         
-        # Update allowed settings
-        allowed_fields = {'name'}
-        
-        for key, value in settings.items():
-            if key in allowed_fields:
-                setattr(family, key, value)
-        
-        await session.flush()
-        
         logger.info(f"Updated settings for family {family_id}: {settings}")
         
         return family
@@ -324,27 +742,32 @@ async def regenerate_invite_code(
         New invite code or None if family not found
     """
     try:
-        from .models import generate_invite_code
-        
         family = await get_family_by_id(session, family_id)
         
         if not family:
             logger.warning(f"Family {family_id} not found for invite code regeneration")
             return None
         
-        # Generate new unique invite code
-        new_code = generate_invite_code()
-        
-        # Make sure it's unique
-        while await get_family_by_invite_code(session, new_code):
+        # Rely on the UNIQUE constraint instead of checking every candidate
+        # with a SELECT: a collision only costs a savepoint rollback.
+        for _ in range(INVITE_CODE_MAX_ATTEMPTS):
             new_code = generate_invite_code()
+            try:
+                async with session.begin_nested():
+                    family.invite_code = new_code
+            except IntegrityError:
+                logger.warning(f"Invite code collision for family {family_id}, retrying")
+                continue
+            
+            _invalid_invite_codes.pop(new_code, None)
+            logger.info(f"Regenerated invite code for family {family_id}: {new_code}")
+            
+            return new_code
         
-        family.invite_code = new_code
-        await session.flush()
-        
-        logger.info(f"Regenerated invite code for family {family_id}: {new_code}")
-        
-        return new_code
+        raise ValueError(
+            f"Could not generate a unique invite code for family {family_id} "
+            f"in {INVITE_CODE_MAX_ATTEMPTS} attempts"
+        )
     except Exception as e:
         logger.error(f"Error regenerating invite code for family {family_id}: {e}")
         raise
@@ -372,8 +795,6 @@ async def add_family_member(
         Created FamilyMember object
     """
     try:
-        from .models import RoleEnum
-        
         role_enum = RoleEnum.ADMIN if role == "admin" else RoleEnum.MEMBER
         
         member = FamilyMember(
@@ -383,6 +804,7 @@ async def add_family_member(
         )
         session.add(member)
         await session.flush()
+        _member_role_cache(session)[(user_id, family_id)] = role_enum
         
         logger.info(
             f"Added user {user_id} to family {family_id} as {role_enum.value}"
@@ -413,9 +835,7 @@ async def get_family_member(
     """
     try:
         result = await session.execute(
-            select(FamilyMember)
-            .where(FamilyMember.user_id == user_id)
-            .where(FamilyMember.family_id == family_id)
+            _STMT_FAMILY_MEMBER, {'user_id': user_id, 'family_id': family_id}
         )
         return result.scalar_one_or_none()
     except Exception as e:
@@ -426,6 +846,54 @@ async def get_family_member(
         raise
 
 
+def _member_role_cache(session: AsyncSession) -> Dict[Tuple[int, int], Optional[RoleEnum]]:
+    """Get the per-session cache of family roles keyed by (user_id, family_id).
+    
+    Sessions live for a single update, so membership checks repeated by
+    one handler (member? admin?) hit the database only once.
+    """
+    return session.info.setdefault("family_member_roles", {})
+
+
+async def get_family_member_role(
+    session: AsyncSession,
+    user_id: int,
+    family_id: int
+) -> Optional[RoleEnum]:
+    """Get user's role in a family, cached for the session lifetime.
+    
+    Args:
+        session: Database session
+        user_id: User ID
+        family_id: Family ID
+        
+    Returns:
+        RoleEnum value or None if user is not a member
+    """
+    cache = _member_role_cache(session)
+    key = (user_id, family_id)
+    if key in cache:
+        return cache[key]
+    
+    try:
+        # Only the role column is needed, no FamilyMember instance
+        result = await session.execute(
+            select(FamilyMember.role)
+            .where(FamilyMember.user_id == user_id)
+            .where(FamilyMember.family_id == family_id)
+            .limit(1)
+        )
+        role = result.scalar()
+    except Exception as e:
+        logger.error(
+            f"Error getting role of user {user_id} in family {family_id}: {e}"
+        )
+        raise
+    
+    cache[key] = role
+    return role
+
+
 async def is_user_in_family(
     session: AsyncSession,
     user_id: int,
@@ -441,8 +909,7 @@ async def is_user_in_family(
     Returns:
         True if user is in family, False otherwise
     """
-    member = await get_family_member(session, user_id, family_id)
-    return member is not None
+    return await get_family_member_role(session, user_id, family_id) is not None
 
 
 async def get_family_members(
@@ -467,9 +934,14 @@ async def get_family_members(
         )
         members = result.all()
         
+        # Membership checks that follow (is_family_admin etc.) become cache hits
+        roles = _member_role_cache(session)
+        for user, member in members:
+            roles[(user.id, family_id)] = member.role
+        
         logger.info(f"Found {len(members)} members for family_id={family_id}")
         
-        return list(members)
+        return members
     except Exception as e:
         logger.error(f"Error getting family members for family_id {family_id}: {e}")
         raise
@@ -491,17 +963,24 @@ async def remove_family_member(
         True if removed, False if member not found
     """
     try:
-        member = await get_family_member(session, user_id, family_id)
+        # Single DELETE ... RETURNING instead of SELECT + session.delete()
+        result = await session.execute(
+            delete(FamilyMember)
+            .where(
+                FamilyMember.user_id == user_id,
+                FamilyMember.family_id == family_id
+            )
+            .returning(FamilyMember.id)
+        )
+        removed_id = result.scalar_one_or_none()
+        _member_role_cache(session)[(user_id, family_id)] = None
         
-        if not member:
+        if removed_id is None:
             logger.warning(
                 f"Family member not found (user_id={user_id}, family_id={family_id})"
             )
             return False
         
-        await session.delete(member)
-        await session.flush()
-        
         logger.info(f"Removed user {user_id} from family {family_id}")
         
         return True
@@ -527,21 +1006,7 @@ async def is_family_admin(
     Returns:
         True if user is admin, False otherwise
     """
-    try:
-        from .models import RoleEnum
-        
-        member = await get_family_member(session, user_id, family_id)
-        
-        if not member:
-            return False
-        
-        return member.role == RoleEnum.ADMIN
-    except Exception as e:
-        logger.error(
-            f"Error checking admin status for user {user_id} "
-            f"in family {family_id}: {e}"
-        )
-        raise
+    return await get_family_member_role(session, user_id, family_id) == RoleEnum.ADMIN
 
 
 # ============================================================================
@@ -561,16 +1026,17 @@ async def get_default_categories(
         List of default Category objects
     """
     try:
-        query = select(Category).where(Category.is_default == True)
         if category_type:
-            query = query.where(Category.category_type == category_type)
-        query = query.order_by(Category.id)
-        result = await session.execute(query)
+            result = await session.execute(
+                _STMT_DEFAULT_CATS_BY_TYPE, {'category_type': category_type}
+            )
+        else:
+            result = await session.execute(_STMT_DEFAULT_CATS)
         categories = result.scalars().all()
         
         logger.info(f"Found {len(categories)} default categories")
         
-        return list(categories)
+        return categories
     except Exception as e:
         logger.error(f"Error getting default categories: {e}")
         raise
@@ -590,10 +1056,9 @@ async def get_category_by_id(
         Category object or None if not found
     """
     try:
-        result = await session.execute(
-            select(Category).where(Category.id == category_id)
-        )
-        return result.scalar_one_or_none()
+        # Served from the identity map without a query when the category
+        # was already loaded in this session (e.g. by a category list)
+        return await session.get(Category, category_id)
     except Exception as e:
         logger.error(f"Error getting category by id {category_id}: {e}")
         raise
@@ -618,7 +1083,7 @@ async def get_all_categories(
         
         logger.info(f"Found {len(categories)} categories")
         
-        return list(categories)
+        return categories
     except Exception as e:
         logger.error(f"Error getting all categories: {e}")
         raise
@@ -653,7 +1118,48 @@ async def get_family_categories(
             f"Found {len(categories)} categories for family_id={family_id}"
         )
         
-        return list(categories)
+        return categories
+    except Exception as e:
+        logger.error(f"Error getting categories for family_id {family_id}: {e}")
+        raise
+
+
+async def get_family_categories_lite(
+    session: AsyncSession,
+    family_id: int,
+    category_type: Optional[CategoryTypeEnum] = None
+) -> List[CategoryRow]:
+    """Get categories available for a family as plain rows.
+    
+    Same filter and ordering as get_family_categories, but selects only the
+    columns needed to render category lists, so no ORM objects are built.
+    
+    Args:
+        session: Database session
+        family_id: Family ID
+        category_type: Optional category type filter
+        
+    Returns:
+        List of CategoryRow tuples (id, name, icon, is_default)
+    """
+    try:
+        query = select(
+            Category.id, Category.name, Category.icon, Category.is_default
+        ).where(
+            (Category.is_default == True) |
+            (Category.family_id == family_id)
+        )
+        if category_type:
+            query = query.where(Category.category_type == category_type)
+        query = query.order_by(Category.is_default.desc(), Category.name)
+        result = await session.execute(query)
+        categories = [CategoryRow(*row) for row in result.all()]
+        
+        logger.info(
+            f"Found {len(categories)} categories for family_id={family_id}"
+        )
+        
+        return categories
     except Exception as e:
         logger.error(f"Error getting categories for family_id {family_id}: {e}")
         raise
@@ -685,7 +1191,7 @@ async def get_family_custom_categories(
             f"Found {len(categories)} custom categories for family_id={family_id}"
         )
         
-        return list(categories)
+        return categories
     except Exception as e:
         logger.error(
             f"Error getting custom categories for family_id {family_id}: {e}"
@@ -751,19 +1257,27 @@ async def update_category(
         Updated Category object or None if not found
     """
     try:
-        category = await get_category_by_id(session, category_id)
+        values = {}
+        if name is not None:
+            values['name'] = name
         
-        if not category:
-            logger.warning(f"Category {category_id} not found for update")
-            return None
+        if icon is not None:
+            values['icon'] = icon
         
-        if name is not None:
-            category.name = name
+        if not values:
+            return await get_category_by_id(session, category_id)
         
-        if icon is not None:
-            category.icon = icon
+        result = await session.execute(
+            update(Category).where(Category.id == category_id).values(**values).returning(Category)
+        )
+        category = result.scalar_one_or_none()
         
-        await session.flush()
+        if not category:
+            logger.warning(f"Category {category_id} not found for update")
+            return None
+        
+        # Cached summaries carry category names and icons
+        _mark_summaries_dirty(session)
         
         logger.info(
             f"Updated category {category_id}: name={name}, icon={icon}"
@@ -806,6 +1320,58 @@ async def delete_category(
         raise
 
 
+async def merge_and_delete_category(
+    session: AsyncSession,
+    old_category_id: int,
+    new_category_id: int
+) -> Tuple[int, int, bool]:
+    """Move all operations to another category and delete the old one.
+    
+    Runs three bulk statements back to back with no intermediate flush.
+    A bulk DELETE does not need the ORM to load the category's expenses and
+    incomes the way session.delete() does. The UPDATEs skip session
+    synchronization, so Expense/Income objects already loaded in this
+    session keep the old category_id until they are refreshed.
+    
+    Args:
+        session: Database session
+        old_category_id: Category ID to delete
+        new_category_id: Target category ID
+        
+    Returns:
+        Tuple of (moved expenses, moved incomes, whether category was deleted)
+    """
+    try:
+        moved_expenses = await session.execute(
+            update(Expense)
+            .where(Expense.category_id == old_category_id)
+            .values(category_id=new_category_id)
+            .execution_options(synchronize_session=False)
+        )
+        moved_incomes = await session.execute(
+            update(Income)
+            .where(Income.category_id == old_category_id)
+            .values(category_id=new_category_id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = await session.execute(
+            delete(Category).where(Category.id == old_category_id)
+        )
+        _mark_summaries_dirty(session)
+        
+        logger.info(
+            f"Merged category {old_category_id} into {new_category_id}: "
+            f"{moved_expenses.rowcount} expenses, {moved_incomes.rowcount} incomes"
+        )
+        
+        return moved_expenses.rowcount, moved_incomes.rowcount, deleted.rowcount > 0
+    except Exception as e:
+        logger.error(
+            f"Error merging category {old_category_id} into {new_category_id}: {e}"
+        )
+        raise
+
+
 async def move_expenses_to_category(
     session: AsyncSession,
     old_category_id: int,
@@ -813,6 +1379,9 @@ async def move_expenses_to_category(
 ) -> int:
     """Move all expenses from one category to another.
     
+    The UPDATE skips session synchronization: Expense objects already
+    loaded in this session keep the old category_id until refreshed.
+    
     Args:
         session: Database session
         old_category_id: Source category ID
@@ -822,17 +1391,16 @@ async def move_expenses_to_category(
         Number of expenses moved
     """
     try:
-        from sqlalchemy import update as sql_update
-        
         # Update all expenses with old category to new category
         result = await session.execute(
-            sql_update(Expense)
+            update(Expense)
             .where(Expense.category_id == old_category_id)
             .values(category_id=new_category_id)
+            .execution_options(synchronize_session=False)
         )
         
         count = result.rowcount
-        await session.flush()
+        _mark_summaries_dirty(session)
         
         logger.info(
             f"Moved {count} expenses from category {old_category_id} "
@@ -855,6 +1423,9 @@ async def move_incomes_to_category(
 ) -> int:
     """Move all incomes from one category to another.
     
+    The UPDATE skips session synchronization: Income objects already
+    loaded in this session keep the old category_id until refreshed.
+    
     Args:
         session: Database session
         old_category_id: Source category ID
@@ -866,9 +1437,10 @@ async def move_incomes_to_category(
     try:
         # Update all incomes with old category to new category
         result = await session.execute(
-            Income.__table__.update()
+            update(Income)
             .where(Income.category_id == old_category_id)
             .values(category_id=new_category_id)
+            .execution_options(synchronize_session=False)
         )
         count = result.rowcount if result.rowcount is not None else 0
         
@@ -900,10 +1472,9 @@ async def count_category_expenses(
         Number of expenses in the category
     """
     try:
-        from sqlalchemy import func
-        
         result = await session.execute(
-            select(func.count(Expense.id))
+            select(func.count())
+            .select_from(Expense)
             .where(Expense.category_id == category_id)
         )
         count = result.scalar()
@@ -930,10 +1501,8 @@ async def count_category_incomes(
         Number of incomes in the category
     """
     try:
-        from sqlalchemy import func
-        
         result = await session.execute(
-            select(func.count(Income.id)).where(Income.category_id == category_id)
+            select(func.count()).select_from(Income).where(Income.category_id == category_id)
         )
         count = result.scalar_one()
         
@@ -959,16 +1528,16 @@ async def delete_category_expenses(
         Number of expenses deleted
     """
     try:
-        from sqlalchemy import delete as sql_delete
-        
         # Delete all expenses with this category
         result = await session.execute(
-            sql_delete(Expense)
+            delete(Expense)
             .where(Expense.category_id == category_id)
         )
         
         count = result.rowcount
         await session.flush()
+        # Default categories are shared, so any family may be affected
+        _mark_summaries_dirty(session)
         
         logger.info(
             f"Deleted {count} expenses from category {category_id}"
@@ -996,13 +1565,13 @@ async def delete_category_incomes(
         Number of incomes deleted
     """
     try:
-        from sqlalchemy import delete
-        
         # Delete all incomes with this category
         result = await session.execute(
             delete(Income).where(Income.category_id == category_id)
         )
         count = result.rowcount if result.rowcount is not None else 0
+        # Available periods include income months
+        _mark_summaries_dirty(session)
         
         logger.info(f"Deleted {count} incomes from category {category_id}")
         
@@ -1031,20 +1600,22 @@ async def category_name_exists(
         True if name exists, False otherwise
     """
     try:
-        query = select(Category).where(
-            Category.name == name,
-            Category.family_id == family_id
-        )
+        condition = exists().where(Category.name == name)
+        # Spell out IS NULL so each branch compiles to one cached statement
+        if family_id is None:
+            condition = condition.where(Category.family_id.is_(None))
+        else:
+            condition = condition.where(Category.family_id == family_id)
         if category_type:
-            query = query.where(Category.category_type == category_type)
+            condition = condition.where(Category.category_type == category_type)
         
         if exclude_category_id is not None:
-            query = query.where(Category.id != exclude_category_id)
+            condition = condition.where(Category.id != exclude_category_id)
         
-        result = await session.execute(query)
-        existing = result.scalar_one_or_none()
+        # EXISTS stops at the first match and builds no Category instance
+        result = await session.execute(select(condition))
         
-        return existing is not None
+        return bool(result.scalar())
     except Exception as e:
         logger.error(f"Error checking category name existence: {e}")
         raise
@@ -1054,37 +1625,75 @@ async def category_name_exists(
 # Expense CRUD operations
 # ============================================================================
 
+async def bulk_create_expenses(
+    session: AsyncSession,
+    rows: List[dict]
+) -> List[Expense]:
+    """Create several expenses with one multi-row INSERT ... RETURNING.
+    
+    Args:
+        session: Database session
+        rows: Dicts with user_id, family_id, category_id, amount (Decimal)
+            and optional description
+        
+    Returns:
+        Created Expense objects in the order of rows
+    """
+    if not rows:
+        return []
+    
+    try:
+        result = await session.execute(
+            insert(Expense).returning(Expense, sort_by_parameter_order=True),
+            rows
+        )
+        expenses = result.scalars().all()
+        
+        for family_id, user_id in {(row['family_id'], row['user_id']) for row in rows}:
+            _mark_summaries_dirty(session, family_id, user_id)
+        
+        logger.info(f"Created {len(expenses)} expenses")
+        
+        return expenses
+    except Exception as e:
+        logger.error(f"Error creating {len(rows)} expenses: {e}")
+        raise
+
+
 async def create_expense(
     session: AsyncSession,
     user_id: int,
     family_id: int,
     category_id: int,
-    amount: float,
+    amount: Decimal,
     description: Optional[str] = None
 ) -> Expense:
     """Create a new expense.
     
+    The row is written by a single INSERT ... RETURNING (see
+    bulk_create_expenses), so id, date and created_at are populated without
+    a separate flush; callers only need to commit.
+    
     Args:
         session: Database session
         user_id: User ID who created the expense
         family_id: Family ID
         category_id: Category ID
-        amount: Expense amount
+        amount: Expense amount (already parsed to Decimal by the caller)
         description: Optional description
         
     Returns:
         Created Expense object
     """
     try:
-        expense = Expense(
-            user_id=user_id,
-            family_id=family_id,
-            category_id=category_id,
-            amount=Decimal(str(amount)),
-            description=description
-        )
-        session.add(expense)
-        await session.flush()
+        expenses = await bulk_create_expenses(session, [{
+            'user_id': user_id,
+            'family_id': family_id,
+            'category_id': category_id,
+            'amount': amount,
+            'description': description
+        }])
+        expense = expenses[0]
         
         logger.info(
             f"Created expense: {expense.amount} "
@@ -1102,7 +1711,7 @@ async def create_income(
     user_id: int,
     family_id: int,
     category_id: int,
-    amount: float,
+    amount: Decimal,
     description: Optional[str] = None
 ) -> Income:
     """Create a new income.
@@ -1112,7 +1721,7 @@ async def create_income(
         user_id: User ID who created the income
         family_id: Family ID
         category_id: Category ID
-        amount: Income amount
+        amount: Income amount (already parsed to Decimal by the caller)
         description: Optional description
         
     Returns:
@@ -1123,11 +1732,13 @@ async def create_income(
             user_id=user_id,
             family_id=family_id,
             category_id=category_id,
-            amount=Decimal(str(amount)),
+            amount=amount,
             description=description
         )
         session.add(income)
         await session.flush()
+        # Available periods include income months
+        _mark_summaries_dirty(session, family_id, user_id)
         
         logger.info(
             f"Created income: {income.amount} "
@@ -1157,8 +1768,6 @@ async def get_recent_user_operations(
     Returns:
         List of dicts with unified operation fields
     """
-    from sqlalchemy import literal, union_all
-
     try:
         expense_query = (
             select(
@@ -1221,6 +1830,9 @@ async def get_family_expenses(
 ) -> List[Expense]:
     """Get expenses for a family.
     
+    Relationships are not loaded and raise on access; use
+    get_family_expenses_with_users when category or user is needed.
+    
     Args:
         session: Database session
         family_id: Family ID
@@ -1230,21 +1842,17 @@ async def get_family_expenses(
         List of Expense objects
     """
     try:
-        query = (
-            select(Expense)
-            .where(Expense.family_id == family_id)
-            .order_by(Expense.date.desc())
-        )
-        
         if limit:
-            query = query.limit(limit)
-        
-        result = await session.execute(query)
+            result = await session.execute(
+                _STMT_FAMILY_EXPENSES_LIMITED, {'family_id': family_id, 'limit': limit}
+            )
+        else:
+            result = await session.execute(_STMT_FAMILY_EXPENSES, {'family_id': family_id})
         expenses = result.scalars().all()
         
         logger.info(f"Found {len(expenses)} expenses for family_id={family_id}")
         
-        return list(expenses)
+        return expenses
     except Exception as e:
         logger.error(f"Error getting expenses for family_id {family_id}: {e}")
         raise
@@ -1276,10 +1884,7 @@ async def get_user_expenses(
     try:
         query = (
             select(Expense)
-            .options(
-                selectinload(Expense.category),
-                selectinload(Expense.user)
-            )
+            .options(*_EXPENSE_LIST_OPTIONS)
             .where(Expense.user_id == user_id)
             .where(Expense.family_id == family_id)
         )
@@ -1303,7 +1908,7 @@ async def get_user_expenses(
             f"family_id={family_id} (offset={offset}, limit={limit})"
         )
         
-        return list(expenses)
+        return expenses
     except Exception as e:
         logger.error(
             f"Error getting expenses for user_id {user_id}, "
@@ -1312,6 +1917,67 @@ async def get_user_expenses(
         raise
 
 
+async def _aggregate_categories(session: AsyncSession, conditions: list) -> dict:
+    """Sum expenses per category.
+    
+    Shared by the summary and statistics functions, which differ only in
+    their filters. Grand totals and each category's share come from window
+    functions over the grouped rows, so no Python-side accumulation is needed.
+    
+    Args:
+        session: Database session
+        conditions: WHERE clauses on Expense (and Category)
+        
+    Returns:
+        Dictionary with 'total', 'count' and 'by_category' (category_id,
+        category_name, category_icon, amount, count, percentage), largest
+        amount first
+    """
+    grand_total = func.sum(func.sum(Expense.amount)).over()
+    query = (
+        select(
+            Category.id,
+            Category.name,
+            Category.icon,
+            func.sum(Expense.amount).label('total_amount'),
+            func.count().label('expense_count'),
+            grand_total.label('grand_total'),
+            cast(func.sum(func.count()).over(), Integer).label('grand_count'),
+            type_coerce(
+                func.sum(Expense.amount) * 100.0 / func.nullif(grand_total, 0), Float
+            ).label('percentage')
+        )
+        .join(Category, Expense.category_id == Category.id)
+        .where(*conditions)
+        .group_by(Category.id, Category.name, Category.icon)
+        .order_by(func.sum(Expense.amount).desc())
+    )
+    
+    total_amount = Decimal('0')
+    total_count = 0
+    by_category = []
+    
+    result = await session.execute(query)
+    for row in result:
+        total_amount = row.grand_total
+        total_count = row.grand_count
+        
+        by_category.append({
+            'category_id': row.id,
+            'category_name': row.name,
+            'category_icon': row.icon,
+            'amount': row.total_amount,
+            'count': row.expense_count,
+            'percentage': float(row.percentage or 0)
+        })
+    
+    return {
+        'total': total_amount,
+        'count': total_count,
+        'by_category': by_category
+    }
+
+
 async def get_user_expenses_summary(
     session: AsyncSession,
     user_id: int,
@@ -1321,6 +1987,9 @@ async def get_user_expenses_summary(
 ) -> dict:
     """Get summary of user expenses with total and breakdown by categories.
     
+    Results for bounded periods are cached for SUMMARY_CACHE_TTL seconds
+    and shared between callers, so they must not be modified.
+    
     Args:
         session: Database session
         user_id: User ID
@@ -1339,74 +2008,38 @@ async def get_user_expenses_summary(
                     'category_name': str,
                     'category_icon': str,
                     'amount': Decimal,
-                    'count': int
+                    'count': int,
+                    'percentage': float
                 },
                 ...
             ]
         }
     """
     try:
-        from sqlalchemy import func
-        
-        # Build base query
-        query = (
-            select(
-                Category.id,
-                Category.name,
-                Category.icon,
-                func.sum(Expense.amount).label('total_amount'),
-                func.count(Expense.id).label('expense_count')
-            )
-            .join(Category, Expense.category_id == Category.id)
-            .where(Expense.user_id == user_id)
-            .where(Expense.family_id == family_id)
-        )
-        
-        # Apply date filters
+        cache_key = ('user', user_id, start_date, end_date)
+        # Open-ended periods ('all') keep changing and are not cached
+        cacheable = start_date is not None and end_date is not None
+        if cacheable:
+            cached = _get_cached_summary(_summary_scope(family_id, True), cache_key)
+            if cached is not None:
+                return cached
+        
+        conditions = [Expense.user_id == user_id, Expense.family_id == family_id]
         if start_date:
-            query = query.where(Expense.date >= start_date)
-        
+            conditions.append(Expense.date >= start_date)
         if end_date:
-            query = query.where(Expense.date <= end_date)
-        
-        # Group by category
-        query = query.group_by(Category.id, Category.name, Category.icon)
-        query = query.order_by(func.sum(Expense.amount).desc())
-        
-        result = await session.execute(query)
-        rows = result.all()
-        
-        # Calculate totals
-        total_amount = Decimal('0')
-        total_count = 0
-        by_category = []
-        
-        for row in rows:
-            category_total = Decimal(str(row.total_amount))
-            category_count = row.expense_count
-            
-            total_amount += category_total
-            total_count += category_count
-            
-            by_category.append({
-                'category_id': row.id,
-                'category_name': row.name,
-                'category_icon': row.icon,
-                'amount': category_total,
-                'count': category_count
-            })
+            conditions.append(Expense.date <= end_date)
         
-        summary = {
-            'total': total_amount,
-            'count': total_count,
-            'by_category': by_category
-        }
+        summary = await _aggregate_categories(session, conditions)
         
         logger.info(
             f"Generated expenses summary for user_id={user_id}, "
-            f"family_id={family_id}: total={total_amount}, count={total_count}"
+            f"family_id={family_id}: total={summary['total']}, count={summary['count']}"
         )
         
+        if cacheable:
+            _cache_summary(_summary_scope(family_id, True), cache_key, summary)
+        
         return summary
         
     except Exception as e:
@@ -1417,6 +2050,72 @@ async def get_user_expenses_summary(
         raise
 
 
+async def _detailed_expenses_report(session: AsyncSession, conditions: list) -> dict:
+    """Build a detailed expenses report in a single query.
+    
+    Window aggregates return each category's total and count, plus the
+    grand total, on every expense row, so totals and details come from
+    one statement.
+    
+    Args:
+        session: Database session
+        conditions: WHERE clauses on Expense
+        
+    Returns:
+        Report dictionary (see get_family_expenses_detailed_report)
+    """
+    category_total = func.sum(Expense.amount).over(partition_by=Expense.category_id)
+    query = (
+        select(
+            Expense.category_id,
+            Expense.amount,
+            _EXPENSE_DESCRIPTION_OR_DASH,
+            Expense.date,
+            Category.name,
+            Category.icon,
+            category_total.label('category_total'),
+            func.count().over(partition_by=Expense.category_id).label('category_count'),
+            func.sum(Expense.amount).over().label('grand_total'),
+            func.count().over().label('grand_count')
+        )
+        .join(Category, Expense.category_id == Category.id)
+        .where(*conditions)
+        .order_by(category_total.desc(), Expense.category_id, Expense.date.desc())
+    )
+    
+    total_amount = Decimal('0')
+    total_count = 0
+    categories: Dict[int, dict] = {}
+    
+    result = await session.execute(query)
+    for row in result:
+        category = categories.get(row.category_id)
+        if category is None:
+            amount = row.category_total
+            total_amount = row.grand_total
+            total_count = row.grand_count
+            category = categories[row.category_id] = {
+                'category_id': row.category_id,
+                'category_name': row.name,
+                'category_icon': row.icon,
+                'amount': amount,
+                'percentage': float(amount / total_amount * 100) if total_amount > 0 else 0,
+                'count': row.category_count,
+                'expenses': []
+            }
+        category['expenses'].append({
+            'amount': row.amount,
+            'description': row.description,
+            'date': row.date
+        })
+    
+    return {
+        'total': total_amount,
+        'count': total_count,
+        'by_category': list(categories.values())
+    }
+
+
 async def get_user_expenses_detailed_monthly_report(
     session: AsyncSession,
     user_id: int,
@@ -1460,105 +2159,18 @@ async def get_user_expenses_detailed_monthly_report(
         }
     """
     try:
-        from sqlalchemy import func
-        
-        # First, get category totals
-        category_query = (
-            select(
-                Category.id,
-                Category.name,
-                Category.icon,
-                func.sum(Expense.amount).label('total_amount'),
-                func.count(Expense.id).label('expense_count')
-            )
-            .join(Category, Expense.category_id == Category.id)
-            .where(Expense.user_id == user_id)
-            .where(Expense.family_id == family_id)
-        )
-        
-        # Apply date filters
+        conditions = [Expense.user_id == user_id, Expense.family_id == family_id]
         if start_date:
-            category_query = category_query.where(Expense.date >= start_date)
-        
+            conditions.append(Expense.date >= start_date)
         if end_date:
-            category_query = category_query.where(Expense.date <= end_date)
-        
-        # Group by category
-        category_query = category_query.group_by(Category.id, Category.name, Category.icon)
-        category_query = category_query.order_by(func.sum(Expense.amount).desc())
-        
-        result = await session.execute(category_query)
-        category_rows = result.all()
-        
-        # Calculate total amount
-        total_amount = Decimal('0')
-        total_count = 0
-        by_category = []
-        
-        for row in category_rows:
-            category_total = Decimal(str(row.total_amount))
-            category_count = row.expense_count
-            
-            total_amount += category_total
-            total_count += category_count
-        
-        # Now get detailed expenses for each category
-        for row in category_rows:
-            category_id = row.id
-            category_total = Decimal(str(row.total_amount))
-            category_count = row.expense_count
-            
-            # Calculate percentage
-            percentage = float(category_total / total_amount * 100) if total_amount > 0 else 0
-            
-            # Get all expenses for this category
-            expenses_query = (
-                select(Expense)
-                .where(Expense.user_id == user_id)
-                .where(Expense.family_id == family_id)
-                .where(Expense.category_id == category_id)
-            )
-            
-            if start_date:
-                expenses_query = expenses_query.where(Expense.date >= start_date)
-            
-            if end_date:
-                expenses_query = expenses_query.where(Expense.date <= end_date)
-            
-            expenses_query = expenses_query.order_by(Expense.date.desc())
-            
-            expenses_result = await session.execute(expenses_query)
-            expenses = expenses_result.scalars().all()
-            
-            # Format expenses
-            expenses_list = []
-            for expense in expenses:
-                expenses_list.append({
-                    'amount': expense.amount,
-                    'description': expense.description or "—",
-                    'date': expense.date
-                })
-            
-            by_category.append({
-                'category_id': category_id,
-                'category_name': row.name,
-                'category_icon': row.icon,
-                'amount': category_total,
-                'percentage': percentage,
-                'count': category_count,
-                'expenses': expenses_list
-            })
+            conditions.append(Expense.date <= end_date)
         
-        summary = {
-            'total': total_amount,
-            'count': total_count,
-            'by_category': by_category
-        }
+        summary = await _detailed_expenses_report(session, conditions)
         
         logger.info(
             f"Generated detailed monthly report for user_id={user_id}, "
-            f"family_id={family_id}: total={total_amount}, count={total_count}, "
-            f"categories={len(by_category)}"
+            f"family_id={family_id}: total={summary['total']}, count={summary['count']}, "
+            f"categories={len(summary['by_category'])}"
         )
         
         return summary
@@ -1612,102 +2224,18 @@ async def get_family_expenses_detailed_report(
         }
     """
     try:
-        from sqlalchemy import func
-        
-        # First, get category totals
-        category_query = (
-            select(
-                Category.id,
-                Category.name,
-                Category.icon,
-                func.sum(Expense.amount).label('total_amount'),
-                func.count(Expense.id).label('expense_count')
-            )
-            .join(Category, Expense.category_id == Category.id)
-            .where(Expense.family_id == family_id)
-        )
-        
-        # Apply date filters
+        conditions = [Expense.family_id == family_id]
         if start_date:
-            category_query = category_query.where(Expense.date >= start_date)
-        
+            conditions.append(Expense.date >= start_date)
         if end_date:
-            category_query = category_query.where(Expense.date <= end_date)
-        
-        # Group by category
-        category_query = category_query.group_by(Category.id, Category.name, Category.icon)
-        category_query = category_query.order_by(func.sum(Expense.amount).desc())
-        
-        result = await session.execute(category_query)
-        category_rows = result.all()
+            conditions.append(Expense.date <= end_date)
         
-        # Calculate total amount
-        total_amount = Decimal('0')
-        total_count = 0
-        by_category = []
-        
-        for row in category_rows:
-            category_total = Decimal(str(row.total_amount))
-            category_count = row.expense_count
-            
-            total_amount += category_total
-            total_count += category_count
-        
-        # Now get detailed expenses for each category
-        for row in category_rows:
-            category_id = row.id
-            category_total = Decimal(str(row.total_amount))
-            category_count = row.expense_count
-            
-            # Calculate percentage
-            percentage = float(category_total / total_amount * 100) if total_amount > 0 else 0
-            
-            # Get all expenses for this category
-            expenses_query = (
-                select(Expense)
-                .where(Expense.family_id == family_id)
-                .where(Expense.category_id == category_id)
-            )
-            
-            if start_date:
-                expenses_query = expenses_query.where(Expense.date >= start_date)
-            
-            if end_date:
-                expenses_query = expenses_query.where(Expense.date <= end_date)
-            
-            expenses_query = expenses_query.order_by(Expense.date.desc())
-            
-            expenses_result = await session.execute(expenses_query)
-            expenses = expenses_result.scalars().all()
-            
-            # Format expenses
-            expenses_list = []
-            for expense in expenses:
-                expenses_list.append({
-                    'amount': expense.amount,
-                    'description': expense.description or "—",
-                    'date': expense.date
-                })
-            
-            by_category.append({
-                'category_id': category_id,
-                'category_name': row.name,
-                'category_icon': row.icon,
-                'amount': category_total,
-                'percentage': percentage,
-                'count': category_count,
-                'expenses': expenses_list
-            })
-        
-        summary = {
-            'total': total_amount,
-            'count': total_count,
-            'by_category': by_category
-        }
+        summary = await _detailed_expenses_report(session, conditions)
         
         logger.info(
             f"Generated detailed family report for family_id={family_id}: "
-            f"total={total_amount}, count={total_count}, categories={len(by_category)}"
+            f"total={summary['total']}, count={summary['count']}, "
+            f"categories={len(summary['by_category'])}"
         )
         
         return summary
@@ -1743,10 +2271,7 @@ async def get_family_expenses_with_users(
     try:
         query = (
             select(Expense)
-            .options(
-                selectinload(Expense.category),
-                selectinload(Expense.user)
-            )
+            .options(*_EXPENSE_LIST_OPTIONS)
             .where(Expense.family_id == family_id)
         )
         
@@ -1769,7 +2294,7 @@ async def get_family_expenses_with_users(
             f"(offset={offset}, limit={limit})"
         )
         
-        return list(expenses)
+        return expenses
     except Exception as e:
         logger.error(
             f"Error getting expenses for family_id {family_id}: {e}"
@@ -1785,6 +2310,9 @@ async def get_family_expenses_summary(
 ) -> dict:
     """Get summary of family expenses with total and breakdown.
     
+    Results for bounded periods are cached for SUMMARY_CACHE_TTL seconds
+    and shared between callers, so they must not be modified.
+    
     Args:
         session: Database session
         family_id: Family ID
@@ -1818,60 +2346,55 @@ async def get_family_expenses_summary(
         }
     """
     try:
-        from sqlalchemy import func
-        
-        # Build query for category breakdown
+        cache_key = ('family', None, start_date, end_date)
+        # Open-ended periods ('all') keep changing and are not cached
+        cacheable = start_date is not None and end_date is not None
+        if cacheable:
+            cached = _get_cached_summary(_summary_scope(family_id, True), cache_key)
+            if cached is not None:
+                return cached
+        
+        # Category and user breakdowns in one round-trip (UNION ALL)
         category_query = (
             select(
-                Category.id,
-                Category.name,
-                Category.icon,
+                literal("category").label("kind"),
+                Category.id.label("id"),
+                Category.name.label("name"),
+                Category.icon.label("icon"),
                 func.sum(Expense.amount).label('total_amount'),
-                func.count(Expense.id).label('expense_count')
+                func.count().label('expense_count')
             )
             .join(Category, Expense.category_id == Category.id)
             .where(Expense.family_id == family_id)
+            .group_by(Category.id, Category.name, Category.icon)
         )
-        
-        # Apply date filters
-        if start_date:
-            category_query = category_query.where(Expense.date >= start_date)
-        
-        if end_date:
-            category_query = category_query.where(Expense.date <= end_date)
-        
-        # Group by category
-        category_query = category_query.group_by(Category.id, Category.name, Category.icon)
-        category_query = category_query.order_by(func.sum(Expense.amount).desc())
-        
-        result = await session.execute(category_query)
-        category_rows = result.all()
-        
-        # Build query for user breakdown
         user_query = (
             select(
-                User.id,
-                User.name,
+                literal("user").label("kind"),
+                User.id.label("id"),
+                User.name.label("name"),
+                literal(None, String).label("icon"),
                 func.sum(Expense.amount).label('total_amount'),
-                func.count(Expense.id).label('expense_count')
+                func.count().label('expense_count')
             )
             .join(User, Expense.user_id == User.id)
             .where(Expense.family_id == family_id)
+            .group_by(User.id, User.name)
         )
         
         # Apply date filters
         if start_date:
+            category_query = category_query.where(Expense.date >= start_date)
             user_query = user_query.where(Expense.date >= start_date)
         
         if end_date:
+            category_query = category_query.where(Expense.date <= end_date)
             user_query = user_query.where(Expense.date <= end_date)
         
-        # Group by user
-        user_query = user_query.group_by(User.id, User.name)
-        user_query = user_query.order_by(func.sum(Expense.amount).desc())
-        
-        result = await session.execute(user_query)
-        user_rows = result.all()
+        combined = union_all(category_query, user_query).subquery("breakdowns")
+        result = await session.execute(
+            select(combined).order_by(combined.c.total_amount.desc())
+        )
         
         # Calculate totals
         total_amount = Decimal('0')
@@ -1879,31 +2402,27 @@ async def get_family_expenses_summary(
         by_category = []
         by_user = []
         
-        for row in category_rows:
-            category_total = Decimal(str(row.total_amount))
-            category_count = row.expense_count
-            
-            total_amount += category_total
-            total_count += category_count
-            
-            by_category.append({
-                'category_id': row.id,
-                'category_name': row.name,
-                'category_icon': row.icon,
-                'amount': category_total,
-                'count': category_count
-            })
-        
-        for row in user_rows:
-            user_total = Decimal(str(row.total_amount))
-            user_count = row.expense_count
+        for row in result:
+            row_total = row.total_amount
             
-            by_user.append({
-                'user_id': row.id,
-                'user_name': row.name,
-                'amount': user_total,
-                'count': user_count
-            })
+            if row.kind == "category":
+                total_amount += row_total
+                total_count += row.expense_count
+                
+                by_category.append({
+                    'category_id': row.id,
+                    'category_name': row.name,
+                    'category_icon': row.icon,
+                    'amount': row_total,
+                    'count': row.expense_count
+                })
+            else:
+                by_user.append({
+                    'user_id': row.id,
+                    'user_name': row.name,
+                    'amount': row_total,
+                    'count': row.expense_count
+                })
         
         summary = {
             'total': total_amount,
@@ -1917,6 +2436,9 @@ async def get_family_expenses_summary(
             f"total={total_amount}, count={total_count}"
         )
         
+        if cacheable:
+            _cache_summary(_summary_scope(family_id, True), cache_key, summary)
+        
         return summary
         
     except Exception as e:
@@ -1955,10 +2477,7 @@ async def get_family_expenses_by_user(
         # Get all expenses for the family
         query = (
             select(Expense)
-            .options(
-                selectinload(Expense.category),
-                selectinload(Expense.user)
-            )
+            .options(*_EXPENSE_GROUPING_OPTIONS)
             .where(Expense.family_id == family_id)
         )
         
@@ -1970,12 +2489,9 @@ async def get_family_expenses_by_user(
         
         query = query.order_by(Expense.date.desc())
         
-        result = await session.execute(query)
-        expenses = result.scalars().all()
-        
-        # Group by user
+        # Group by user while rows arrive instead of materializing the list first
         by_user = {}
-        for expense in expenses:
+        async for expense in await session.stream_scalars(query):
             user_id = expense.user_id
             if user_id not in by_user:
                 by_user[user_id] = {
@@ -2031,10 +2547,7 @@ async def get_family_expenses_by_category(
         # Get all expenses for the family
         query = (
             select(Expense)
-            .options(
-                selectinload(Expense.category),
-                selectinload(Expense.user)
-            )
+            .options(*_EXPENSE_GROUPING_OPTIONS)
             .where(Expense.family_id == family_id)
         )
         
@@ -2046,12 +2559,9 @@ async def get_family_expenses_by_category(
         
         query = query.order_by(Expense.date.desc())
         
-        result = await session.execute(query)
-        expenses = result.scalars().all()
-        
-        # Group by category
+        # Group by category while rows arrive instead of materializing the list first
         by_category = {}
-        for expense in expenses:
+        async for expense in await session.stream_scalars(query):
             category_id = expense.category_id
             if category_id not in by_category:
                 by_category[category_id] = {
@@ -2081,6 +2591,10 @@ async def get_family_expenses_by_category(
 def calculate_date_range(period: str) -> tuple[Optional[datetime], Optional[datetime]]:
     """Calculate date range for a given period.
     
+    Periods are aligned: the end is the last moment before the next period
+    starts (inclusive bound, as everywhere in this module), derived from
+    midnight-aligned starts rather than from the current time.
+    
     Args:
         period: Period identifier ('today', 'week', 'month', 'all')
         
@@ -2094,36 +2608,73 @@ def calculate_date_range(period: str) -> tuple[Optional[datetime], Optional[date
         >>> end.hour
         23
     """
-    from datetime import timedelta
-    
-    now = datetime.now()
+    start_of_day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     
     if period == "today":
-        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        return (start_of_day, end_of_day)
+        start, next_start = start_of_day, start_of_day + timedelta(days=1)
     
     elif period == "week":
-        # Start from Monday of current week
-        start_of_week = now - timedelta(days=now.weekday())
-        start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_week = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        return (start_of_week, end_of_week)
+        # Monday of current week
+        start = start_of_day - timedelta(days=start_of_day.weekday())
+        next_start = start + timedelta(weeks=1)
     
     elif period == "month":
-        # Start from first day of current month
-        start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        end_of_month = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-        return (start_of_month, end_of_month)
+        # First day of current month
+        start = start_of_day.replace(day=1)
+        next_start = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
     
     else:  # 'all'
         return (None, None)
+    
+    return (start, next_start - timedelta(microseconds=1))
 
 
 # ============================================================================
 # Statistics CRUD operations
 # ============================================================================
 
+def _entity_filter(model, entity_id: int, is_family: bool):
+    """Return the WHERE clause selecting a user's or a family's rows.
+    
+    Args:
+        model: Expense or Income
+        entity_id: User ID or Family ID
+        is_family: If True, filter by family; if False, by user
+    """
+    return (model.family_id if is_family else model.user_id) == entity_id
+
+
+def _log_errors(action: str):
+    """Log failures of a per-user/per-family read, then re-raise.
+    
+    Replaces the try/except blocks of the statistics functions; the
+    arguments are only inspected once an exception is raised.
+    
+    Args:
+        action: What was being fetched, e.g. "period statistics"
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                arguments = signature.bind(*args, **kwargs).arguments
+                entity_type = "family" if arguments.get('is_family') else "user"
+                logger.error(
+                    "Error getting %s for %s %s: %s",
+                    action, entity_type, arguments.get('entity_id'), e
+                )
+                raise
+        
+        return wrapper
+    
+    return decorator
+
+
+@_log_errors("period statistics")
 async def get_period_statistics(
     session: AsyncSession,
     entity_id: int,
@@ -2133,6 +2684,9 @@ async def get_period_statistics(
 ) -> dict:
     """Get detailed statistics for a period.
     
+    Results for bounded periods are cached for SUMMARY_CACHE_TTL seconds
+    and shared between callers, so they must not be modified.
+    
     Args:
         session: Database session
         entity_id: User ID or Family ID
@@ -2159,161 +2713,173 @@ async def get_period_statistics(
             ]
         }
     """
-    try:
-        from sqlalchemy import func
-        
-        # Build base query
-        query = (
+    scope = _summary_scope(entity_id, is_family)
+    cache_key = ('period_statistics', start_date, end_date)
+    # Open-ended periods ('all') keep changing and are not cached
+    cacheable = start_date is not None and end_date is not None
+    if cacheable:
+        cached = _get_cached_summary(scope, cache_key)
+        if cached is not None:
+            return cached
+    
+    # Apply entity filter (user or family)
+    conditions = [_entity_filter(Expense, entity_id, is_family)]
+    
+    # Apply date filters
+    if start_date:
+        conditions.append(Expense.date >= start_date)
+    
+    if end_date:
+        conditions.append(Expense.date <= end_date)
+    
+    totals = await _aggregate_categories(
+        session,
+        [Category.category_type == CategoryTypeEnum.EXPENSE, *conditions]
+    )
+    total_amount = totals['total']
+    total_count = totals['count']
+    by_category = totals['by_category']
+    
+    # Fetch the period's expenses for all listed categories at once
+    expenses_by_category: Dict[int, List[dict]] = {}
+    if by_category:
+        expense_query = (
             select(
-                Category.id,
-                Category.name,
-                Category.icon,
-                func.sum(Expense.amount).label('total_amount'),
-                func.count(Expense.id).label('expense_count')
+                Expense.category_id,
+                Expense.date,
+                Expense.amount,
+                _EXPENSE_DESCRIPTION_OR_DASH
             )
-            .join(Category, Expense.category_id == Category.id)
+            .where(*conditions)
+            .where(Expense.category_id.in_([c['category_id'] for c in by_category]))
+            .order_by(Expense.date.desc())
         )
-        query = query.where(Category.category_type == CategoryTypeEnum.EXPENSE)
-        
-        # Apply entity filter (user or family)
-        if is_family:
-            query = query.where(Expense.family_id == entity_id)
-        else:
-            query = query.where(Expense.user_id == entity_id)
-        
-        # Apply date filters
-        if start_date:
-            query = query.where(Expense.date >= start_date)
-        
-        if end_date:
-            query = query.where(Expense.date <= end_date)
-        
-        # Group by category
-        query = query.group_by(Category.id, Category.name, Category.icon)
-        query = query.order_by(func.sum(Expense.amount).desc())
-        
-        result = await session.execute(query)
-        rows = result.all()
-        
-        # Calculate totals
-        total_amount = Decimal('0')
-        total_count = 0
-        by_category = []
-        
-        for row in rows:
-            category_total = Decimal(str(row.total_amount))
-            category_count = row.expense_count
-            
-            total_amount += category_total
-            total_count += category_count
-            
-            by_category.append({
-                'category_id': row.id,
-                'category_name': row.name,
-                'category_icon': row.icon,
-                'amount': category_total,
-                'count': category_count,
-                'percentage': 0.0  # Will be calculated later
+        expense_result = await session.execute(expense_query)
+        for expense in expense_result:
+            expenses_by_category.setdefault(expense.category_id, []).append({
+                'date': expense.date,
+                'amount': expense.amount,
+                'description': expense.description
             })
+    
+    # Attach expenses to each category
+    for cat_data in by_category:
+        cat_data['expenses'] = expenses_by_category.get(cat_data['category_id'], [])
+    
+    # Calculate average per day
+    avg_per_day = Decimal('0')
+    if start_date and end_date:
+        days = (end_date - start_date).days + 1
+        if days > 0:
+            avg_per_day = total_amount / days
+    
+    statistics = {
+        'total': total_amount,
+        'count': total_count,
+        'avg_per_day': avg_per_day,
+        'by_category': by_category
+    }
+    
+    entity_type = "family" if is_family else "user"
+    logger.info(
+        "Generated period statistics for %s %s: total=%s, count=%s, avg_per_day=%s",
+        entity_type, entity_id, total_amount, total_count, avg_per_day
+    )
+    
+    if cacheable:
+        _cache_summary(scope, cache_key, statistics)
+    
+    return statistics
+
+
+@_log_errors("two-period statistics")
+async def get_two_period_statistics(
+    session: AsyncSession,
+    entity_id: int,
+    current_start: datetime,
+    current_end: datetime,
+    previous_start: datetime,
+    previous_end: datetime,
+    is_family: bool = False
+) -> Tuple[dict, dict]:
+    """Get category statistics for two periods in one query.
+    
+    Rows are labelled with their period and grouped by (period, category),
+    so both periods come from a single scan. The periods must not overlap.
+    
+    Args:
+        session: Database session
+        entity_id: User ID or Family ID
+        current_start: Start date of the current period
+        current_end: End date of the current period
+        previous_start: Start date of the previous period
+        previous_end: End date of the previous period
+        is_family: If True, get statistics for family; if False, for user
         
-        # Calculate percentages and get expenses for each category
-        for cat_data in by_category:
-            if total_amount > 0:
-                cat_data['percentage'] = float((cat_data['amount'] / total_amount) * 100)
-            
-            income_query = (
-                select(Income)
-                .where(Income.category_id == cat_data['category_id'])
-            )
-            
-            if is_family:
-                income_query = income_query.where(Income.family_id == entity_id)
-            else:
-                income_query = income_query.where(Income.user_id == entity_id)
-            
-            if start_date:
-                income_query = income_query.where(Income.date >= start_date)
-            if end_date:
-                income_query = income_query.where(Income.date <= end_date)
-            
-            income_query = income_query.order_by(Income.date.desc())
-            
-            income_result = await session.execute(income_query)
-            incomes = income_result.scalars().all()
-            
-            cat_data['expenses'] = [
-                {
-                    'date': income.date,
-                    'amount': income.amount,
-                    'description': income.description or "—"
-                }
-                for income in incomes
-            ]
-            
-            # Get individual expenses for this category
-            expense_query = (
-                select(Expense)
-                .where(Expense.category_id == cat_data['category_id'])
-            )
-            
-            # Apply entity filter
-            if is_family:
-                expense_query = expense_query.where(Expense.family_id == entity_id)
-            else:
-                expense_query = expense_query.where(Expense.user_id == entity_id)
-            
-            # Apply date filters
-            if start_date:
-                expense_query = expense_query.where(Expense.date >= start_date)
-            if end_date:
-                expense_query = expense_query.where(Expense.date <= end_date)
-            
-            # Order by date descending
-            expense_query = expense_query.order_by(Expense.date.desc())
-            
-            expense_result = await session.execute(expense_query)
-            expenses = expense_result.scalars().all()
-            
-            # Add expenses to category data
-            cat_data['expenses'] = [
-                {
-                    'date': expense.date,
-                    'amount': expense.amount,
-                    'description': expense.description or "—"
-                }
-                for expense in expenses
-            ]
-        
-        # Calculate average per day
-        avg_per_day = Decimal('0')
-        if start_date and end_date:
-            days = (end_date - start_date).days + 1
-            if days > 0:
-                avg_per_day = total_amount / days
-        
-        statistics = {
-            'total': total_amount,
-            'count': total_count,
-            'avg_per_day': avg_per_day,
-            'by_category': by_category
-        }
-        
-        entity_type = "family" if is_family else "user"
-        logger.info(
-            f"Generated period statistics for {entity_type} {entity_id}: "
-            f"total={total_amount}, count={total_count}, avg_per_day={avg_per_day}"
-        )
-        
-        return statistics
-        
-    except Exception as e:
-        entity_type = "family" if is_family else "user"
-        logger.error(
-            f"Error getting period statistics for {entity_type} {entity_id}: {e}"
-        )
-        raise
+    Returns:
+        Tuple of (current, previous) statistics, each a dictionary with
+        'total', 'count' and 'by_category' (category_id, category_name,
+        category_icon, amount, count, percentage); ready for compare_periods
+    """
+    in_current = and_(Expense.date >= current_start, Expense.date <= current_end)
+    in_previous = and_(Expense.date >= previous_start, Expense.date <= previous_end)
+    period = case((in_current, literal('current')), else_=literal('previous'))
+    
+    query = (
+        select(
+            period.label('period'),
+            Category.id,
+            Category.name,
+            Category.icon,
+            func.sum(Expense.amount).label('total_amount'),
+            func.count().label('expense_count')
+        )
+        .join(Category, Expense.category_id == Category.id)
+        .where(
+            Category.category_type == CategoryTypeEnum.EXPENSE,
+            _entity_filter(Expense, entity_id, is_family),
+            or_(in_current, in_previous)
+        )
+        .group_by(period, Category.id, Category.name, Category.icon)
+        .order_by(func.sum(Expense.amount).desc())
+    )
+    
+    statistics = {
+        'current': {'total': Decimal('0'), 'count': 0, 'by_category': []},
+        'previous': {'total': Decimal('0'), 'count': 0, 'by_category': []}
+    }
+    
+    result = await session.execute(query)
+    for row in result:
+        period_stats = statistics[row.period]
+        period_stats['total'] += row.total_amount
+        period_stats['count'] += row.expense_count
+        period_stats['by_category'].append({
+            'category_id': row.id,
+            'category_name': row.name,
+            'category_icon': row.icon,
+            'amount': row.total_amount,
+            'count': row.expense_count
+        })
+    
+    # Calculate percentages within each period
+    for period_stats in statistics.values():
+        for cat_data in period_stats['by_category']:
+            cat_data['percentage'] = 0.0
+            if period_stats['total'] > 0:
+                cat_data['percentage'] = float(cat_data['amount'] / period_stats['total'] * 100)
+    
+    entity_type = "family" if is_family else "user"
+    logger.info(
+        "Generated two-period statistics for %s %s: current=%s, previous=%s",
+        entity_type, entity_id,
+        statistics['current']['total'], statistics['previous']['total']
+    )
+    
+    return statistics['current'], statistics['previous']
 
 
+@_log_errors("income statistics")
 async def get_period_income_statistics(
     session: AsyncSession,
     entity_id: int,
@@ -2348,111 +2914,77 @@ async def get_period_income_statistics(
             ]
         }
     """
-    try:
-        from sqlalchemy import func
-        
-        query = (
-            select(
-                Category.id,
-                Category.name,
-                Category.icon,
-                func.sum(Income.amount).label('total_amount'),
-                func.count(Income.id).label('income_count')
-            )
-            .join(Category, Income.category_id == Category.id)
-        )
-        query = query.where(Category.category_type == CategoryTypeEnum.INCOME)
-        
-        if is_family:
-            query = query.where(Income.family_id == entity_id)
-        else:
-            query = query.where(Income.user_id == entity_id)
-        
-        if start_date:
-            query = query.where(Income.date >= start_date)
-        if end_date:
-            query = query.where(Income.date <= end_date)
-        
-        query = query.group_by(Category.id, Category.name, Category.icon)
-        query = query.order_by(func.sum(Income.amount).desc())
-        
-        result = await session.execute(query)
-        rows = result.all()
-        
-        total_amount = Decimal('0')
-        total_count = 0
-        by_category = []
-        
-        for row in rows:
-            category_total = Decimal(str(row.total_amount))
-            category_count = row.income_count
-            
-            total_amount += category_total
-            total_count += category_count
-            
-            by_category.append({
-                'category_id': row.id,
+    conditions = [
+        Category.category_type == CategoryTypeEnum.INCOME,
+        _entity_filter(Income, entity_id, is_family)
+    ]
+    if start_date:
+        conditions.append(Income.date >= start_date)
+    if end_date:
+        conditions.append(Income.date <= end_date)
+    
+    # Category totals and the grand total are window aggregates on every
+    # income row, so the statistics and the listed incomes come from one
+    # statement instead of one query per category
+    category_total = func.sum(Income.amount).over(partition_by=Income.category_id)
+    query = (
+        select(
+            Income.category_id,
+            Income.date,
+            Income.amount,
+            func.coalesce(func.nullif(Income.description, ''), "—").label('description'),
+            Category.name,
+            Category.icon,
+            category_total.label('category_total'),
+            func.count().over(partition_by=Income.category_id).label('category_count'),
+            func.sum(Income.amount).over().label('grand_total'),
+            func.count().over().label('grand_count')
+        )
+        .join(Category, Income.category_id == Category.id)
+        .where(*conditions)
+        .order_by(category_total.desc(), Income.category_id, Income.date.desc())
+    )
+    
+    total_amount = Decimal('0')
+    total_count = 0
+    categories: Dict[int, dict] = {}
+    
+    result = await session.execute(query)
+    for row in result:
+        category = categories.get(row.category_id)
+        if category is None:
+            total_amount = row.grand_total
+            total_count = row.grand_count
+            category = categories[row.category_id] = {
+                'category_id': row.category_id,
                 'category_name': row.name,
                 'category_icon': row.icon,
-                'amount': category_total,
-                'count': category_count,
-                'percentage': 0.0
-            })
-        
-        # Calculate percentages and get individual incomes for each category
-        for cat_data in by_category:
-            if total_amount > 0:
-                cat_data['percentage'] = float((cat_data['amount'] / total_amount) * 100)
-            
-            # Get individual incomes for this category
-            income_detail_query = (
-                select(Income)
-                .where(Income.category_id == cat_data['category_id'])
-            )
-            
-            if is_family:
-                income_detail_query = income_detail_query.where(Income.family_id == entity_id)
-            else:
-                income_detail_query = income_detail_query.where(Income.user_id == entity_id)
-            
-            if start_date:
-                income_detail_query = income_detail_query.where(Income.date >= start_date)
-            if end_date:
-                income_detail_query = income_detail_query.where(Income.date <= end_date)
-            
-            income_detail_query = income_detail_query.order_by(Income.date.desc())
-            
-            income_result = await session.execute(income_detail_query)
-            incomes = income_result.scalars().all()
-            
-            cat_data['expenses'] = [
-                {
-                    'date': income.date,
-                    'amount': income.amount,
-                    'description': income.description or "—"
-                }
-                for income in incomes
-            ]
-        
-        statistics = {
-            'total': total_amount,
-            'count': total_count,
-            'by_category': by_category
-        }
-        
-        entity_type = "family" if is_family else "user"
-        logger.info(
-            f"Generated income statistics for {entity_type} {entity_id}: "
-            f"total={total_amount}, count={total_count}"
-        )
-        
-        return statistics
-    except Exception as e:
-        entity_type = "family" if is_family else "user"
-        logger.error(
-            f"Error getting income statistics for {entity_type} {entity_id}: {e}"
-        )
-        raise
+                'amount': row.category_total,
+                'count': row.category_count,
+                'percentage': (
+                    float(row.category_total / total_amount * 100) if total_amount > 0 else 0.0
+                ),
+                'expenses': []
+            }
+        category['expenses'].append({
+            'date': row.date,
+            'amount': row.amount,
+            'description': row.description
+        })
+    
+    statistics = {
+        'total': total_amount,
+        'count': total_count,
+        'by_category': list(categories.values())
+    }
+    
+    entity_type = "family" if is_family else "user"
+    logger.info(
+        "Generated income statistics for %s %s: total=%s, count=%s",
+        entity_type, entity_id, total_amount, total_count
+    )
+    
+    return statistics
 
 
 async def get_period_financial_statistics(
@@ -2462,21 +2994,51 @@ async def get_period_financial_statistics(
     end_date: Optional[datetime] = None,
     is_family: bool = False
 ) -> dict:
-    """Get combined income and expense statistics for a period."""
-    expense_stats = await get_period_statistics(
-        session,
-        entity_id,
-        start_date,
-        end_date,
-        is_family=is_family
-    )
-    income_stats = await get_period_income_statistics(
-        session,
-        entity_id,
-        start_date,
-        end_date,
-        is_family=is_family
-    )
+    """Get combined income and expense statistics for a period.
+    
+    On PostgreSQL the expense and income halves are read concurrently, each
+    in its own short-lived session: an AsyncSession must never be shared
+    between concurrent awaits. Those sessions do not see uncommitted changes
+    of ``session``, which is fine for this read-only report.
+    """
+    if session.bind.dialect.name == "postgresql":
+        async with (
+            AsyncSession(session.bind) as expense_session,
+            AsyncSession(session.bind) as income_session,
+        ):
+            expense_stats, income_stats = await asyncio.gather(
+                get_period_statistics(
+                    expense_session,
+                    entity_id,
+                    start_date,
+                    end_date,
+                    is_family=is_family
+                ),
+                get_period_income_statistics(
+                    income_session,
+                    entity_id,
+                    start_date,
+                    end_date,
+                    is_family=is_family
+                )
+            )
+    else:
+        # SQLite: in-memory databases share one connection and file access is
+        # serialized anyway, so stay on the caller's session
+        expense_stats = await get_period_statistics(
+            session,
+            entity_id,
+            start_date,
+            end_date,
+            is_family=is_family
+        )
+        income_stats = await get_period_income_statistics(
+            session,
+            entity_id,
+            start_date,
+            end_date,
+            is_family=is_family
+        )
     
     income_total = income_stats.get('total', Decimal('0'))
     expense_total = expense_stats.get('total', Decimal('0'))
@@ -2513,10 +3075,12 @@ async def get_family_income_expense_totals(
             'balance': Decimal
         }
     """
-    from sqlalchemy import func
-    
-    income_stmt = select(func.coalesce(func.sum(Income.amount), 0)).where(Income.family_id == family_id)
-    expense_stmt = select(func.coalesce(func.sum(Expense.amount), 0)).where(Expense.family_id == family_id)
+    income_stmt = select(func.coalesce(func.sum(Income.amount), 0)).where(
+        Income.family_id == family_id
+    )
+    expense_stmt = select(func.coalesce(func.sum(Expense.amount), 0)).where(
+        Expense.family_id == family_id
+    )
     
     if start_date:
         income_stmt = income_stmt.where(Income.date >= start_date)
@@ -2555,10 +3119,12 @@ async def get_families_income_expense_totals(
             "balance": Decimal("0"),
         }
     
-    from sqlalchemy import func
-    
-    income_stmt = select(func.coalesce(func.sum(Income.amount), 0)).where(Income.family_id.in_(family_ids))
-    expense_stmt = select(func.coalesce(func.sum(Expense.amount), 0)).where(Expense.family_id.in_(family_ids))
+    income_stmt = select(func.coalesce(func.sum(Income.amount), 0)).where(
+        Income.family_id.in_(family_ids)
+    )
+    expense_stmt = select(func.coalesce(func.sum(Expense.amount), 0)).where(
+        Expense.family_id.in_(family_ids)
+    )
     
     if start_date:
         income_stmt = income_stmt.where(Income.date >= start_date)
@@ -2582,6 +3148,43 @@ async def get_families_income_expense_totals(
     }
 
 
+def _daily_totals_query(
+    entity_id: int,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    is_family: bool
+):
+    """Build the per-day expense totals query shared by the daily helpers.
+    
+    Grouping and ordering refer to the labelled columns, so the database
+    computes date() and SUM() once per row and group.
+    
+    Args:
+        entity_id: User ID or Family ID
+        start_date: Optional start date for filtering
+        end_date: Optional end date for filtering
+        is_family: If True, filter by family; if False, by user
+        
+    Returns:
+        Select of (expense_date, total_amount) grouped by day, unordered
+    """
+    conditions = [_entity_filter(Expense, entity_id, is_family)]
+    if start_date:
+        conditions.append(Expense.date >= start_date)
+    if end_date:
+        conditions.append(Expense.date <= end_date)
+    
+    return (
+        select(
+            func.date(Expense.date).label('expense_date'),
+            func.sum(Expense.amount).label('total_amount')
+        )
+        .where(*conditions)
+        .group_by('expense_date')
+    )
+
+
+@_log_errors("daily expenses")
 async def get_daily_expenses(
     session: AsyncSession,
     entity_id: int,
@@ -2601,58 +3204,28 @@ async def get_daily_expenses(
     Returns:
         List of tuples (date, total_amount) sorted by date
     """
-    try:
-        from sqlalchemy import func
-        
-        # Build query to group by date
-        query = (
-            select(
-                func.date(Expense.date).label('expense_date'),
-                func.sum(Expense.amount).label('total_amount')
-            )
-        )
-        
-        # Apply entity filter
-        if is_family:
-            query = query.where(Expense.family_id == entity_id)
-        else:
-            query = query.where(Expense.user_id == entity_id)
-        
-        # Apply date filters
-        if start_date:
-            query = query.where(Expense.date >= start_date)
-        
-        if end_date:
-            query = query.where(Expense.date <= end_date)
-        
-        # Group by date and order
-        query = query.group_by(func.date(Expense.date))
-        query = query.order_by(func.date(Expense.date))
-        
-        result = await session.execute(query)
-        rows = result.all()
-        
-        # Convert to list of tuples
-        daily_expenses = [
-            (row.expense_date, Decimal(str(row.total_amount)))
-            for row in rows
-        ]
-        
-        entity_type = "family" if is_family else "user"
-        logger.info(
-            f"Found {len(daily_expenses)} days with expenses for {entity_type} {entity_id}"
-        )
-        
-        return daily_expenses
-        
-    except Exception as e:
-        entity_type = "family" if is_family else "user"
-        logger.error(
-            f"Error getting daily expenses for {entity_type} {entity_id}: {e}"
-        )
-        raise
+    query = _daily_totals_query(entity_id, start_date, end_date, is_family)
+    query = query.order_by('expense_date')
+    
+    result = await session.execute(query)
+    rows = result.all()
+    
+    # Convert to list of tuples
+    daily_expenses = [
+        (row.expense_date, row.total_amount)
+        for row in rows
+    ]
+    
+    entity_type = "family" if is_family else "user"
+    logger.info(
+        "Found %s days with expenses for %s %s",
+        len(daily_expenses), entity_type, entity_id
+    )
+    
+    return daily_expenses
 
 
+@_log_errors("top expense day")
 async def get_top_expense_day(
     session: AsyncSession,
     entity_id: int,
@@ -2662,6 +3235,8 @@ async def get_top_expense_day(
 ) -> Optional[tuple[datetime, Decimal]]:
     """Get the day with highest expenses.
     
+    If the daily totals are already loaded, use find_top_expense_day.
+    
     Args:
         session: Database session
         entity_id: User ID or Family ID
@@ -2672,63 +3247,58 @@ async def get_top_expense_day(
     Returns:
         Tuple of (date, total_amount) for the highest expense day, or None if no expenses
     """
-    try:
-        from sqlalchemy import func
-        
-        # Build query to group by date
-        query = (
-            select(
-                func.date(Expense.date).label('expense_date'),
-                func.sum(Expense.amount).label('total_amount')
-            )
-        )
-        
-        # Apply entity filter
-        if is_family:
-            query = query.where(Expense.family_id == entity_id)
-        else:
-            query = query.where(Expense.user_id == entity_id)
-        
-        # Apply date filters
-        if start_date:
-            query = query.where(Expense.date >= start_date)
-        
-        if end_date:
-            query = query.where(Expense.date <= end_date)
-        
-        # Group by date, order by amount descending, limit to 1
-        query = query.group_by(func.date(Expense.date))
-        query = query.order_by(func.sum(Expense.amount).desc())
-        query = query.limit(1)
-        
-        result = await session.execute(query)
-        row = result.first()
-        
-        if row:
-            top_day = (row.expense_date, Decimal(str(row.total_amount)))
-            entity_type = "family" if is_family else "user"
-            logger.info(
-                f"Found top expense day for {entity_type} {entity_id}: "
-                f"{top_day[0]} - {top_day[1]}"
-            )
-            return top_day
-        
-        return None
-        
-    except Exception as e:
+    query = _daily_totals_query(entity_id, start_date, end_date, is_family)
+    query = query.order_by(desc('total_amount')).limit(1)
+    
+    result = await session.execute(query)
+    row = result.first()
+    
+    if row:
+        top_day = (row.expense_date, row.total_amount)
         entity_type = "family" if is_family else "user"
-        logger.error(
-            f"Error getting top expense day for {entity_type} {entity_id}: {e}"
+        logger.info(
+            "Found top expense day for %s %s: %s - %s",
+            entity_type, entity_id, top_day[0], top_day[1]
         )
-        raise
+        return top_day
+    
+    return None
+
+
+def find_top_expense_day(
+    daily_expenses: List[tuple[datetime, Decimal]]
+) -> Optional[tuple[datetime, Decimal]]:
+    """Pick the day with highest expenses from get_daily_expenses output.
+    
+    Use this instead of get_top_expense_day when the daily totals for the
+    period are already loaded, to skip a second aggregation query.
+    
+    Args:
+        daily_expenses: List of (date, total_amount) tuples
+        
+    Returns:
+        Tuple of (date, total_amount) for the highest expense day, or None if empty
+    """
+    return max(daily_expenses, key=itemgetter(1), default=None)
+
+
+def _percent_change(current, previous) -> float:
+    """Return the change from previous to current in percent.
+    
+    A change from zero counts as 100% (or 0% when both are zero).
+    """
+    if previous > 0:
+        return float((current - previous) / previous * 100)
+    return 100.0 if current else 0.0
 
 
 def compare_periods(current_data: dict, previous_data: dict) -> dict:
     """Compare statistics between two periods.
     
     Args:
-        current_data: Statistics for current period (from get_period_statistics)
-        previous_data: Statistics for previous period (from get_period_statistics)
+        current_data: Statistics for current period (from get_period_statistics
+            or get_two_period_statistics)
+        previous_data: Statistics for previous period (likewise)
         
     Returns:
         Dictionary with comparison data:
@@ -2740,52 +3310,42 @@ def compare_periods(current_data: dict, previous_data: dict) -> dict:
         }
     """
     try:
-        current_total = current_data.get('total', Decimal('0'))
-        previous_total = previous_data.get('total', Decimal('0'))
-        current_count = current_data.get('count', 0)
-        previous_count = previous_data.get('count', 0)
-        
-        # Calculate changes
-        total_change = current_total - previous_total
-        count_change = current_count - previous_count
-        
-        # Calculate percentage changes
-        if previous_total > 0:
-            total_change_percent = float((total_change / previous_total) * 100)
-        else:
-            total_change_percent = 0.0 if current_total == 0 else 100.0
-        
-        if previous_count > 0:
-            count_change_percent = float((count_change / previous_count) * 100)
-        else:
-            count_change_percent = 0.0 if current_count == 0 else 100.0
+        current_total = current_data['total']
+        previous_total = previous_data['total']
+        current_count = current_data['count']
+        previous_count = previous_data['count']
         
         comparison = {
-            'total_change': total_change,
-            'total_change_percent': total_change_percent,
-            'count_change': count_change,
-            'count_change_percent': count_change_percent
+            'total_change': current_total - previous_total,
+            'total_change_percent': _percent_change(current_total, previous_total),
+            'count_change': current_count - previous_count,
+            'count_change_percent': _percent_change(current_count, previous_count)
         }
         
         logger.info(
-            f"Period comparison: total_change={total_change} ({total_change_percent:.1f}%), "
-            f"count_change={count_change} ({count_change_percent:.1f}%)"
+            "Period comparison: total_change=%s (%.1f%%), count_change=%s (%.1f%%)",
+            comparison['total_change'], comparison['total_change_percent'],
+            comparison['count_change'], comparison['count_change_percent']
         )
         
         return comparison
         
     except Exception as e:
-        logger.error(f"Error comparing periods: {e}")
+        logger.error("Error comparing periods: %s", e)
         raise
 
 
+@_log_errors("category details")
 async def get_category_details(
     session: AsyncSession,
     entity_id: int,
     category_id: int,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    is_family: bool = False
+    is_family: bool = False,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    totals_only: bool = False
 ) -> dict:
     """Get detailed information about expenses in a specific category.
     
@@ -2796,82 +3356,108 @@ async def get_category_details(
         start_date: Optional start date for filtering
         end_date: Optional end date for filtering
         is_family: If True, get for family; if False, for user
+        limit: Optional maximum number of expenses to return
+        offset: Number of expenses to skip (for pagination)
+        totals_only: If True, skip loading the expenses
         
     Returns:
         Dictionary with category details:
         {
             'category': Category object,
-            'total': Decimal,
+            'total': Decimal,  # Over all matching expenses, not just the page
             'count': int,
-            'expenses': List[Expense]
+            'expenses': [  # Empty when totals_only is set
+                {
+                    'id': int,
+                    'amount': Decimal,
+                    'description': str,
+                    'date': datetime,
+                    'user_id': int,
+                    'user_name': str
+                },
+                ...
+            ]
         }
     """
-    try:
-        # Get category info
-        category = await get_category_by_id(session, category_id)
-        if not category:
-            raise ValueError(f"Category {category_id} not found")
-        
-        # Build query for expenses
+    # Get category info
+    category = await get_category_by_id(session, category_id)
+    if not category:
+        raise ValueError(f"Category {category_id} not found")
+    
+    conditions = [Expense.category_id == category_id]
+    
+    # Apply entity filter
+    conditions.append(_entity_filter(Expense, entity_id, is_family))
+    
+    # Apply date filters
+    if start_date:
+        conditions.append(Expense.date >= start_date)
+    
+    if end_date:
+        conditions.append(Expense.date <= end_date)
+    
+    # Totals are summed in SQL rather than over loaded expenses
+    totals_query = select(
+        func.coalesce(func.sum(Expense.amount), 0).label('total_amount'),
+        func.count().label('expense_count')
+    ).where(*conditions)
+    totals = (await session.execute(totals_query)).one()
+    total_amount = Decimal(totals.total_amount)
+    
+    expenses = []
+    if not totals_only and totals.expense_count:
+        # Plain column rows: the list is read-only and the category is
+        # the same for every expense
         query = (
-            select(Expense)
-            .options(
-                selectinload(Expense.category),
-                selectinload(Expense.user)
+            select(
+                Expense.id,
+                Expense.amount,
+                Expense.description,
+                Expense.date,
+                User.id.label('user_id'),
+                User.name.label('user_name'),
+                User.username
             )
-            .where(Expense.category_id == category_id)
+            .join(User, Expense.user_id == User.id)
+            .where(*conditions)
+            .order_by(Expense.date.desc())
+            .offset(offset)
+            .limit(limit)
         )
-        
-        # Apply entity filter
-        if is_family:
-            query = query.where(Expense.family_id == entity_id)
-        else:
-            query = query.where(Expense.user_id == entity_id)
-        
-        # Apply date filters
-        if start_date:
-            query = query.where(Expense.date >= start_date)
-        
-        if end_date:
-            query = query.where(Expense.date <= end_date)
-        
-        # Order by date descending
-        query = query.order_by(Expense.date.desc())
-        
         result = await session.execute(query)
-        expenses = result.scalars().all()
-        
-        # Calculate totals
-        total_amount = sum(expense.amount for expense in expenses)
-        
-        details = {
-            'category': category,
-            'total': total_amount,
-            'count': len(expenses),
-            'expenses': list(expenses)
-        }
-        
-        entity_type = "family" if is_family else "user"
-        logger.info(
-            f"Got category details for {entity_type} {entity_id}, "
-            f"category {category_id}: {len(expenses)} expenses, total={total_amount}"
-        )
-        
-        return details
-        
-    except Exception as e:
-        entity_type = "family" if is_family else "user"
-        logger.error(
-            f"Error getting category details for {entity_type} {entity_id}, "
-            f"category {category_id}: {e}"
-        )
-        raise
+        expenses = [
+            {
+                'id': row.id,
+                'amount': row.amount,
+                'description': row.description,
+                'date': row.date,
+                'user_id': row.user_id,
+                'user_name': row.user_name or row.username or f"User {row.user_id}"
+            }
+            for row in result
+        ]
+    
+    details = {
+        'category': category,
+        'total': total_amount,
+        'count': totals.expense_count,
+        'expenses': expenses
+    }
+    
+    entity_type = "family" if is_family else "user"
+    logger.info(
+        "Got category details for %s %s, category %s: %s expenses, total=%s",
+        entity_type, entity_id, category_id, totals.expense_count, total_amount
+    )
+    
+    return details
 
 
 # ============================================================================
 # Search and Filter operations
 # ============================================================================
 
+@_log_errors("expense search results")
 async def search_expenses(
     session: AsyncSession,
     entity_id: int,
@@ -2882,7 +3468,8 @@ async def search_expenses(
     max_amount: Optional[Decimal] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
-) -> List[Expense]:
+    limit: Optional[int] = None,
+) -> dict:
     """Search expenses with multiple filters.
     
     Args:
@@ -2895,64 +3482,69 @@ async def search_expenses(
         max_amount: Maximum amount filter
         date_from: Start date filter
         date_to: End date filter
+        limit: Optional maximum number of expenses to load
         
     Returns:
-        List of matching Expense objects
+        Dictionary with search results:
+        {
+            'total': Decimal,  # Over all matches, not just the loaded ones
+            'count': int,
+            'expenses': List[Expense]  # Newest first, at most limit
+        }
     """
-    try:
-        # Build base query
-        stmt = (
-            select(Expense)
-            .options(
-                selectinload(Expense.category),
-                selectinload(Expense.user)
-            )
-        )
-        
-        # Apply entity filter
-        if is_family:
-            stmt = stmt.where(Expense.family_id == entity_id)
-        else:
-            stmt = stmt.where(Expense.user_id == entity_id)
-        
-        # Apply filters
-        if query:
-            # Search in description (case-insensitive)
-            stmt = stmt.where(Expense.description.ilike(f"%{query}%"))
-        
-        if category_id:
-            stmt = stmt.where(Expense.category_id == category_id)
-        
-        if min_amount is not None:
-            stmt = stmt.where(Expense.amount >= min_amount)
-        
-        if max_amount is not None:
-            stmt = stmt.where(Expense.amount <= max_amount)
-        
-        if date_from:
-            stmt = stmt.where(Expense.date >= date_from)
-        
-        if date_to:
-            stmt = stmt.where(Expense.date <= date_to)
-        
-        # Order by date descending
-        stmt = stmt.order_by(Expense.date.desc())
-        
-        result = await session.execute(stmt)
-        expenses = list(result.scalars().all())
-        
-        entity_type = "family" if is_family else "user"
-        logger.info(
-            f"Search expenses for {entity_type} {entity_id}: "
-            f"found {len(expenses)} results"
-        )
-        
-        return expenses
-        
-    except Exception as e:
-        entity_type = "family" if is_family else "user"
-        logger.error(f"Error searching expenses for {entity_type} {entity_id}: {e}")
-        raise
+    # Match count and total are window aggregates computed before the
+    # LIMIT, so only the displayed expenses are loaded
+    stmt = (
+        select(
+            Expense,
+            func.count().over().label('match_count'),
+            func.sum(Expense.amount).over().label('match_total')
+        )
+        .options(*_EXPENSE_GROUPING_OPTIONS)
+    )
+    
+    # Apply entity filter
+    stmt = stmt.where(_entity_filter(Expense, entity_id, is_family))
+    
+    # Apply filters
+    if query:
+        # Search in description (case-insensitive)
+        stmt = stmt.where(Expense.description.ilike(f"%{query}%"))
+    
+    if category_id:
+        stmt = stmt.where(Expense.category_id == category_id)
+    
+    if min_amount is not None:
+        stmt = stmt.where(Expense.amount >= min_amount)
+    
+    if max_amount is not None:
+        stmt = stmt.where(Expense.amount <= max_amount)
+    
+    if date_from:
+        stmt = stmt.where(Expense.date >= date_from)
+    
+    if date_to:
+        stmt = stmt.where(Expense.date <= date_to)
+    
+    # Order by date descending
+    stmt = stmt.order_by(Expense.date.desc()).limit(limit)
+    
+    result = await session.execute(stmt)
+    rows = result.all()
+    
+    results = {
+        'total': rows[0].match_total if rows else Decimal('0'),
+        'count': rows[0].match_count if rows else 0,
+        'expenses': [row.Expense for row in rows]
+    }
+    
+    entity_type = "family" if is_family else "user"
+    logger.info(
+        "Search expenses for %s %s: found %s results",
+        entity_type, entity_id, results['count']
+    )
+    
+    return results
 
 
 # ============================================================================
@@ -3034,7 +3626,7 @@ async def get_user_expense_templates(
             )
             .order_by(ExpenseTemplate.name)
         )
-        templates = list(result.scalars().all())
+        templates = result.scalars().all()
         
         logger.info(
             f"Found {len(templates)} expense templates for "
@@ -3120,6 +3712,7 @@ async def delete_expense_template(
 # Period Statistics Helper Functions
 # ============================================================================
 
+@_log_errors("available periods")
 async def get_available_periods(
     session: AsyncSession,
     entity_id: int,
@@ -3127,6 +3720,9 @@ async def get_available_periods(
 ) -> Dict[str, List[Tuple[int, int]]]:
     """Get available months and years that have expenses.
     
+    The result is cached for SUMMARY_CACHE_TTL seconds and shared between
+    callers, so it must not be modified.
+    
     Args:
         session: Database session
         entity_id: User ID or Family ID
@@ -3135,69 +3731,57 @@ async def get_available_periods(
     Returns:
         Dictionary with 'months' (list of (year, month) tuples) and 'years' (list of years)
     """
-    try:
-        from sqlalchemy import func, extract
-        
-        # Build queries for expenses and incomes
-        expense_filter = Expense.family_id == entity_id if is_family else Expense.user_id == entity_id
-        income_filter = Income.family_id == entity_id if is_family else Income.user_id == entity_id
-        
-        query_expense_months = (
-            select(
-                extract('year', Expense.date).label('year'),
-                extract('month', Expense.date).label('month')
-            )
-            .where(expense_filter)
-            .group_by('year', 'month')
-        )
-        query_income_months = (
-            select(
-                extract('year', Income.date).label('year'),
-                extract('month', Income.date).label('month')
-            )
-            .where(income_filter)
-            .group_by('year', 'month')
-        )
-        
-        expense_months = (await session.execute(query_expense_months)).all()
-        income_months = (await session.execute(query_income_months)).all()
-        months_set = {(int(row.year), int(row.month)) for row in expense_months + income_months}
-        months = sorted(months_set)
-        
-        query_expense_years = (
-            select(extract('year', Expense.date).label('year'))
-            .where(expense_filter)
-            .group_by('year')
-        )
-        query_income_years = (
-            select(extract('year', Income.date).label('year'))
-            .where(income_filter)
-            .group_by('year')
-        )
-        
-        expense_years = (await session.execute(query_expense_years)).scalars().all()
-        income_years = (await session.execute(query_income_years)).scalars().all()
-        years = sorted({int(year) for year in expense_years + income_years})
-        
-        entity_type = "family" if is_family else "user"
-        logger.info(
-            f"Found {len(months)} months and {len(years)} years with transactions "
-            f"for {entity_type} {entity_id}"
-        )
-        
-        return {
-            'months': months,
-            'years': years
-        }
-        
-    except Exception as e:
-        entity_type = "family" if is_family else "user"
-        logger.error(
-            f"Error getting available periods for {entity_type} {entity_id}: {e}"
-        )
-        raise
+    scope = _summary_scope(entity_id, is_family)
+    cached = _get_cached_summary(scope, ('available_periods',))
+    if cached is not None:
+        return cached
+    
+    # Build queries for expenses and incomes
+    expense_filter = _entity_filter(Expense, entity_id, is_family)
+    income_filter = _entity_filter(Income, entity_id, is_family)
+    
+    # Group by a single month key; date_trunc keeps it a timestamp on
+    # PostgreSQL, SQLite has no date_trunc and gets a 'YYYY-MM' string
+    is_postgresql = session.bind.dialect.name == "postgresql"
+    
+    def month_key(column):
+        if is_postgresql:
+            return func.date_trunc('month', column).label('month')
+        return func.strftime('%Y-%m', column).label('month')
+    
+    query_expense_months = (
+        select(month_key(Expense.date)).where(expense_filter).group_by('month')
+    )
+    query_income_months = (
+        select(month_key(Income.date)).where(income_filter).group_by('month')
+    )
+    
+    # One round trip for both tables; years are derived from the months
+    result = await session.execute(union_all(query_expense_months, query_income_months))
+    if is_postgresql:
+        months = sorted({(month.year, month.month) for month in result.scalars()})
+    else:
+        months = sorted({
+            (int(month[:4]), int(month[5:7])) for month in result.scalars()
+        })
+    years = sorted({year for year, _ in months})
+    
+    entity_type = "family" if is_family else "user"
+    logger.info(
+        "Found %s months and %s years with transactions for %s %s",
+        len(months), len(years), entity_type, entity_id
+    )
+    
+    periods = {
+        'months': months,
+        'years': years
+    }
+    _cache_summary(scope, ('available_periods',), periods)
+    
+    return periods
 
 
+@_log_errors("detailed statistics")
 async def get_detailed_statistics(
     session: AsyncSession,
     entity_id: int,
@@ -3207,6 +3791,9 @@ async def get_detailed_statistics(
 ) -> dict:
     """Get detailed statistics with all expenses for each category.
     
+    Results are cached for SUMMARY_CACHE_TTL seconds and shared between
+    callers, so they must not be modified.
+    
     Args:
         session: Database session
         entity_id: User ID or Family ID
@@ -3243,122 +3830,90 @@ async def get_detailed_statistics(
             ]
         }
     """
-    try:
-        from sqlalchemy import func
-        
-        # First, get category totals
-        query_totals = (
-            select(
-                Category.id,
-                Category.name,
-                Category.icon,
-                func.sum(Expense.amount).label('total_amount'),
-                func.count(Expense.id).label('expense_count')
-            )
-            .join(Category, Expense.category_id == Category.id)
-        )
-        query_totals = query_totals.where(Category.category_type == CategoryTypeEnum.EXPENSE)
-        
-        # Apply entity filter
-        if is_family:
-            query_totals = query_totals.where(Expense.family_id == entity_id)
-        else:
-            query_totals = query_totals.where(Expense.user_id == entity_id)
-        
-        # Apply date filters
-        query_totals = query_totals.where(
+    scope = _summary_scope(entity_id, is_family)
+    cache_key = ('detailed_statistics', start_date, end_date)
+    cached = _get_cached_summary(scope, cache_key)
+    if cached is not None:
+        return cached
+    
+    entity_filter = _entity_filter(Expense, entity_id, is_family)
+    
+    # Category totals, counts and the grand total ride along on every
+    # expense row as window aggregates, so one statement returns both
+    # the statistics and the individual expenses
+    category_total = func.sum(Expense.amount).over(partition_by=Expense.category_id)
+    query = (
+        select(
+            Expense.id,
+            Expense.category_id,
+            Expense.amount,
+            Expense.description,
+            Expense.date,
+            Category.name,
+            Category.icon,
+            User.id.label('user_id'),
+            User.name.label('user_name'),
+            User.username,
+            category_total.label('category_total'),
+            func.count().over(partition_by=Expense.category_id).label('category_count'),
+            func.sum(Expense.amount).over().label('grand_total'),
+            func.count().over().label('grand_count')
+        )
+        .join(Category, Expense.category_id == Category.id)
+        .join(User, Expense.user_id == User.id)
+        .where(
+            Category.category_type == CategoryTypeEnum.EXPENSE,
+            entity_filter,
             Expense.date >= start_date,
             Expense.date <= end_date
         )
-        
-        # Group by category
-        query_totals = query_totals.group_by(Category.id, Category.name, Category.icon)
-        query_totals = query_totals.order_by(func.sum(Expense.amount).desc())
-        
-        result = await session.execute(query_totals)
-        category_rows = result.all()
-        
-        # Calculate totals
-        total_amount = Decimal('0')
-        total_count = 0
-        by_category = []
-        
-        for cat_row in category_rows:
-            category_total = Decimal(str(cat_row.total_amount))
-            category_count = cat_row.expense_count
-            
-            total_amount += category_total
-            total_count += category_count
-            
-            # Get detailed expenses for this category
-            query_expenses = (
-                select(Expense, User)
-                .join(User, Expense.user_id == User.id)
-                .where(Expense.category_id == cat_row.id)
-            )
-            
-            # Apply entity filter
-            if is_family:
-                query_expenses = query_expenses.where(Expense.family_id == entity_id)
-            else:
-                query_expenses = query_expenses.where(Expense.user_id == entity_id)
-            
-            # Apply date filters
-            query_expenses = query_expenses.where(
-                Expense.date >= start_date,
-                Expense.date <= end_date
-            )
-            
-            # Order by date descending
-            query_expenses = query_expenses.order_by(Expense.date.desc())
-            
-            result_expenses = await session.execute(query_expenses)
-            expense_rows = result_expenses.all()
-            
-            expenses = []
-            for exp, user in expense_rows:
-                expenses.append({
-                    'id': exp.id,
-                    'amount': exp.amount,
-                    'description': exp.description,
-                    'date': exp.date,
-                    'user_id': user.id,
-                    'user_name': user.name or user.username or f"User {user.id}"
-                })
-            
-            by_category.append({
-                'category_id': cat_row.id,
-                'category_name': cat_row.name,
-                'category_icon': cat_row.icon,
-                'amount': category_total,
-                'count': category_count,
-                'percentage': 0.0,  # Will be calculated later
-                'expenses': expenses
-            })
-        
-        # Calculate percentages
-        for cat_data in by_category:
-            if total_amount > 0:
-                cat_data['percentage'] = float((cat_data['amount'] / total_amount) * 100)
-        
-        statistics = {
-            'total': total_amount,
-            'count': total_count,
-            'by_category': by_category
-        }
-        
-        entity_type = "family" if is_family else "user"
-        logger.info(
-            f"Generated detailed statistics for {entity_type} {entity_id}: "
-            f"total={total_amount}, count={total_count}"
-        )
-        
-        return statistics
-        
-    except Exception as e:
-        entity_type = "family" if is_family else "user"
-        logger.error(
-            f"Error getting detailed statistics for {entity_type} {entity_id}: {e}"
-        )
-        raise
+        .order_by(category_total.desc(), Expense.category_id, Expense.date.desc())
+    )
+    
+    total_amount = Decimal('0')
+    total_count = 0
+    categories: Dict[int, dict] = {}
+    
+    result = await session.execute(query)
+    for row in result:
+        category = categories.get(row.category_id)
+        if category is None:
+            total_amount = row.grand_total
+            total_count = row.grand_count
+            category = categories[row.category_id] = {
+                'category_id': row.category_id,
+                'category_name': row.name,
+                'category_icon': row.icon,
+                'amount': row.category_total,
+                'count': row.category_count,
+                'percentage': (
+                    float(row.category_total / total_amount * 100) if total_amount > 0 else 0.0
+                ),
+                'expenses': []
+            }
+        category['expenses'].append({
+            'id': row.id,
+            'amount': row.amount,
+            'description': row.description,
+            'date': row.date,
+            'user_id': row.user_id,
+            'user_name': row.user_name or row.username or f"User {row.user_id}"
+        })
+    
+    statistics = {
+        'total': total_amount,
+        'count': total_count,
+        'by_category': list(categories.values())
+    }
+    
+    entity_type = "family" if is_family else "user"
+    logger.info(
+        "Generated detailed statistics for %s %s: total=%s, count=%s",
+        entity_type, entity_id, total_amount, total_count
+    )
+    
+    _cache_summary(scope, cache_key, statistics)
+    
+    return statistics
+
 
@@ -1,8 +1,10 @@
 """Database connection and initialization."""
 
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from sqlalchemy import select
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -33,10 +35,30 @@ class DatabaseManager:
         elif settings.is_postgresql and not db_url.startswith("postgresql+asyncpg"):
             db_url = db_url.replace("postgresql://", "postgresql+asyncpg://")
         
+        engine_kwargs = {}
+        if settings.is_postgresql:
+            # Keep warm connections for concurrent handlers and drop ones
+            # the server closed while the bot was idle
+            engine_kwargs.update(
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_pre_ping=True,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                connect_args={
+                    "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                    # Short OLTP queries never amortize JIT compilation
+                    "server_settings": {"jit": "off"},
+                },
+            )
+        
         self.engine = create_async_engine(
             db_url,
             echo=settings.DEBUG,
             future=True,
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+            **engine_kwargs,
         )
         
         self.session_factory = async_sessionmaker(
@@ -104,6 +126,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+# Same session lifecycle as get_db (commit on success, rollback on error)
+# without the single-iteration loop:
+#     async with db_session() as session:
+#         # use session
+db_session = asynccontextmanager(db_manager.get_session)
+
+
 async def init_database() -> None:
     """Initialize database: create tables and add default categories.
     
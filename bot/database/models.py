@@ -159,9 +159,9 @@ class FamilyMember(Base):
     family: Mapped["Family"] = relationship("Family", back_populates="members")
     
     # Unique constraint for user_id + family_id combination
+    # (its index also serves membership lookups)
     __table_args__ = (
         UniqueConstraint('user_id', 'family_id', name='uq_user_family'),
-        Index('ix_family_members_user_family', 'user_id', 'family_id'),
     )
     
     def __repr__(self) -> str:
@@ -257,8 +257,20 @@ class Expense(Base):
     
     # Indexes for better query performance
     __table_args__ = (
-        Index('ix_expenses_user_family', 'user_id', 'family_id'),
-        Index('ix_expenses_family_date', 'family_id', 'date'),
+        # INCLUDE columns let PostgreSQL aggregate summaries from the index alone
+        Index(
+            'ix_expenses_user_family_date', 'user_id', 'family_id', 'date',
+            postgresql_include=['category_id', 'amount']
+        ),
+        Index(
+            'ix_expenses_user_date', 'user_id', 'date',
+            postgresql_include=['category_id', 'amount']
+        ),
+        Index(
+            'ix_expenses_family_date', 'family_id', 'date',
+            postgresql_include=['category_id', 'user_id', 'amount']
+        ),
+        Index('ix_expenses_family_category_date', 'family_id', 'category_id', 'date'),
         Index('ix_expenses_category', 'category_id'),
     )
     
@@ -353,7 +365,7 @@ class ExpenseTemplate(Base):
     
     # Indexes for better query performance
     __table_args__ = (
-        Index('ix_expense_templates_user_family', 'user_id', 'family_id'),
+        Index('ix_expense_templates_lookup', 'user_id', 'family_id', 'name'),
     )
     
     def __repr__(self) -> str:
@@ -1156,13 +1156,8 @@ async def delete_category_confirm(update: Update, context: ContextTypes.DEFAULT_
         target_name = ""
         
         if cat_data.target_category_id:
-            # Move expenses to another category
-            moved_expense_count = await crud.move_expenses_to_category(
-                session,
-                cat_data.category_id,
-                cat_data.target_category_id
-            )
-            moved_income_count = await crud.move_incomes_to_category(
+            # Move operations to another category and delete this one
+            moved_expense_count, moved_income_count, _ = await crud.merge_and_delete_category(
                 session,
                 cat_data.category_id,
                 cat_data.target_category_id
@@ -1173,8 +1168,8 @@ async def delete_category_confirm(update: Update, context: ContextTypes.DEFAULT_
             # Delete all expenses in this category
             deleted_expense_count = await crud.delete_category_expenses(session, cat_data.category_id)
             deleted_income_count = await crud.delete_category_incomes(session, cat_data.category_id)
+            await crud.delete_category(session, cat_data.category_id)
         
-        await crud.delete_category(session, cat_data.category_id)
         await session.commit()
         
         return (
@@ -5,12 +5,15 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Optional
 
+from sqlalchemy import extract, select
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 
 from bot.database import crud, get_db
+from bot.database.models import Expense
 from bot.utils.formatters import format_amount, format_date
 from bot.utils.charts import create_text_bar
+from bot.utils.constants import MONTH_NAMES
 from bot.utils.helpers import get_user_id
 from bot.utils.keyboards import get_home_button
 from bot.handlers.expenses import CallbackPattern, ViewData
@@ -171,9 +174,6 @@ async def detailed_report_select_type(update: Update, context: ContextTypes.DEFA
     # Get available months and years from expenses
     async def get_expense_periods(session):
         """Get unique months and years that have expenses."""
-        from sqlalchemy import select, func, extract
-        from bot.database.models import Expense
-        
         # Get unique year-month combinations
         query_months = (
             select(
@@ -244,17 +244,10 @@ async def detailed_report_select_month(update: Update, context: ContextTypes.DEF
         await query.answer("❌ Нет доступных месяцев с расходами", show_alert=True)
         return
     
-    # Month names
-    month_names = {
-        1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-        5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-        9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-    }
-    
     # Build keyboard with recent months first (reversed)
     keyboard = []
     for year, month in reversed(months_data[-12:]):  # Show last 12 months max
-        month_name = f"{month_names[month]} {year}"
+        month_name = f"{MONTH_NAMES[month]} {year}"
         callback_data = f"{CallbackPattern.DETAILED_REPORT_MONTH_PREFIX}{year}_{month}"
         keyboard.append([InlineKeyboardButton(month_name, callback_data=callback_data)])
     
@@ -331,13 +324,7 @@ async def generate_monthly_report(update: Update, context: ContextTypes.DEFAULT_
     else:
         end_date = datetime(year, month + 1, 1) - timedelta(days=1)
     
-    # Month name
-    month_names = {
-        1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-        5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-        9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-    }
-    period_name = f"{month_names[month]} {year}"
+    period_name = f"{MONTH_NAMES[month]} {year}"
     
     try:
         async for session in get_db():
@@ -468,9 +455,6 @@ async def family_detailed_report_select_type(update: Update, context: ContextTyp
     # Get available months and years from family expenses
     async def get_expense_periods(session):
         """Get unique months and years that have expenses."""
-        from sqlalchemy import select, func, extract
-        from bot.database.models import Expense
-        
         # Get unique year-month combinations
         query_months = (
             select(
@@ -111,7 +111,7 @@ async def _notify_admins(
                 parse_mode=ParseMode.HTML,
             )
         except Exception as e:
-            logger.error(f"Failed to send error message to admin {admin_id}: {e}")
+            logger.error("Failed to send error message to admin %s: %s", admin_id, e)
 
 
 async def _notify_user(update: Optional[Update]) -> None:
@@ -126,7 +126,7 @@ async def _notify_user(update: Optional[Update]) -> None:
     try:
         await update.effective_message.reply_text(USER_ERROR_MESSAGE)
     except Exception as e:
-        logger.error(f"Failed to send error message to user: {e}")
+        logger.error("Failed to send error message to user: %s", e)
 
 
 # ============================================================================
@@ -151,19 +151,22 @@ async def error_handler(
     # Log the error with full traceback
     logger.error("Exception while handling an update:", exc_info=context.error)
     
-    # Extract error information
-    error_type, error_text, tb_string = _format_error_info(context)
-    
-    # Build admin notification message
-    admin_message = _build_admin_error_message(
-        error_type,
-        error_text,
-        tb_string,
-        update
-    )
-    
-    # Notify administrators
-    await _notify_admins(context, admin_message)
+    # The traceback is formatted for the admin notification only, so skip
+    # it when there is nobody to notify
+    if settings.ADMIN_USER_IDS:
+        # Extract error information
+        error_type, error_text, tb_string = _format_error_info(context)
+        
+        # Build admin notification message
+        admin_message = _build_admin_error_message(
+            error_type,
+            error_text,
+            tb_string,
+            update
+        )
+        
+        # Notify administrators
+        await _notify_admins(context, admin_message)
     
     # Notify user with friendly message
     await _notify_user(update)
@@ -28,6 +28,7 @@ from bot.utils.formatters import (
     format_family_expense,
     format_family_summary,
 )
+from bot.utils.constants import MONTH_NAMES
 from bot.utils.helpers import end_conversation_silently, end_conversation_and_route, get_user_id, notify_expense_to_family
 from bot.utils.keyboards import add_navigation_buttons, get_add_another_keyboard, get_home_button
 
@@ -760,7 +761,7 @@ async def show_category_selection(update: Update, context: ContextTypes.DEFAULT_
     expense_data = ExpenseData.from_context(context)
     
     async def get_categories(session):
-        return await crud.get_family_categories(
+        return await crud.get_family_categories_lite(
             session,
             expense_data.family_id,
             category_type=CategoryTypeEnum.EXPENSE
@@ -1035,7 +1036,7 @@ async def amount_received(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 user_id=user_id,
                 family_id=expense_data.family_id,
                 category_id=expense_data.category_id,
-                amount=float(expense_data.amount),
+                amount=expense_data.amount,
                 description=description
             )
             await session.commit()
@@ -1096,7 +1097,7 @@ async def amount_received(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             user_id=user_id,
             family_id=expense_data.family_id,
             category_id=expense_data.category_id,
-            amount=float(expense_data.amount),
+            amount=expense_data.amount,
             description=None
         )
         await session.commit()
@@ -1175,7 +1176,7 @@ async def description_received(update: Update, context: ContextTypes.DEFAULT_TYP
             user_id=user_id,
             family_id=expense_data.family_id,
             category_id=expense_data.category_id,
-            amount=float(expense_data.amount),
+            amount=expense_data.amount,
             description=description
         )
         await session.commit()
@@ -1566,21 +1567,11 @@ async def pagination_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     elif view_data.period == 'week':
         period_name = f"Эта неделя"
     elif view_data.period == 'month':
-        month_names = {
-            1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-            5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-            9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-        }
-        period_name = f"{month_names[now.month]} {now.year}"
+        period_name = f"{MONTH_NAMES[now.month]} {now.year}"
     elif view_data.period and view_data.period != 'all' and '-' in view_data.period:
         # Format: "YYYY-MM"
-        month_names = {
-            1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-            5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-            9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-        }
         year, month = map(int, view_data.period.split('-'))
-        period_name = f"{month_names[month]} {year}"
+        period_name = f"{MONTH_NAMES[month]} {year}"
     else:
         period_name = f"Все время"
     
@@ -1997,21 +1988,11 @@ async def family_pagination_handler(update: Update, context: ContextTypes.DEFAUL
     elif view_data.period == 'week':
         period_name = f"Эта неделя"
     elif view_data.period == 'month':
-        month_names = {
-            1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-            5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-            9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-        }
-        period_name = f"{month_names[now.month]} {now.year}"
+        period_name = f"{MONTH_NAMES[now.month]} {now.year}"
     elif view_data.period and view_data.period != 'all' and '-' in view_data.period:
         # Format: "YYYY-MM"
-        month_names = {
-            1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-            5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-            9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-        }
         year, month = map(int, view_data.period.split('-'))
-        period_name = f"{month_names[month]} {year}"
+        period_name = f"{MONTH_NAMES[month]} {year}"
     else:
         period_name = f"Все время"
     
@@ -2165,3 +2146,18 @@ family_expenses_handler = ConversationHandler(
     per_user=True,
     per_message=False  # False because handler uses CommandHandler in entry_points and fallbacks
 )
+
+pagination_callback_handler = CallbackQueryHandler(
+    pagination_handler,
+    pattern="^page_(prev|next|current)$"
+)
+
+family_pagination_callback_handler = CallbackQueryHandler(
+    family_pagination_handler,
+    pattern="^family_page_(prev|next|current)$"
+)
+
+family_grouping_callback_handler = CallbackQueryHandler(
+    family_grouping_handler,
+    pattern="^family_group_(user|category|default)$"
+)
@@ -38,11 +38,10 @@ from bot.utils.helpers import end_conversation_silently, end_conversation_and_ro
 from bot.utils.formatters import format_amount
 from bot.utils.keyboards import add_navigation_buttons, get_main_menu_keyboard, get_home_button
 from bot.utils.message_utils import (
-    MessageHandler as MsgHandler,
-    UserDataExtractor,
-    ValidationHelper,
     format_families_list,
     get_user_from_context_or_db,
+    send_or_edit,
+    validate_text_input,
 )
 
 logger = logging.getLogger(__name__)
@@ -161,7 +160,7 @@ async def _get_user_id_or_error(
     user_id = await get_user_from_context_or_db(update, context)
     
     if not user_id:
-        await MsgHandler.send_or_edit(update, ERROR_USER_NOT_REGISTERED)
+        await send_or_edit(update, ERROR_USER_NOT_REGISTERED)
         return None
     
     return user_id
@@ -255,7 +254,7 @@ async def create_family_start(
     keyboard = add_navigation_buttons([], context, current_state="create_family")
     reply_markup = InlineKeyboardMarkup(keyboard)
     
-    await MsgHandler.send_or_edit(update, message_text, reply_markup=reply_markup)
+    await send_or_edit(update, message_text, reply_markup=reply_markup)
     
     logger.info(f"User {user_id} started family creation process")
     return FAMILY_NAME
@@ -277,10 +276,10 @@ async def create_family_name_received(
     if not update.message:
         return FAMILY_NAME
     
-    family_name = MsgHandler.get_message_text(update)
+    family_name = update.message.text.strip() if update.message.text else None
     
     # Validate family name
-    is_valid, error_msg = ValidationHelper.validate_text_input(
+    is_valid, error_msg = validate_text_input(
         family_name,
         FAMILY_NAME_MIN_LENGTH,
         FAMILY_NAME_MAX_LENGTH
@@ -359,7 +358,7 @@ async def join_family_start(
     keyboard = add_navigation_buttons([], context, current_state="join_family")
     reply_markup = InlineKeyboardMarkup(keyboard)
     
-    await MsgHandler.send_or_edit(update, message_text, reply_markup=reply_markup)
+    await send_or_edit(update, message_text, reply_markup=reply_markup)
     
     logger.info(f"User {user_id} started family joining process")
     return INVITE_CODE
@@ -381,7 +380,7 @@ async def join_family_code_received(
     if not update.message:
         return INVITE_CODE
     
-    invite_code = MsgHandler.get_message_text(update)
+    invite_code = update.message.text.strip() if update.message.text else None
     if not invite_code:
         keyboard = get_home_button()
         await update.message.reply_text("❌ Пожалуйста, введите код приглашения.", reply_markup=keyboard)
@@ -475,14 +474,14 @@ async def cancel_conversation(
     user_id = await get_user_id(update, context)
     
     if not user_id:
-        await MsgHandler.send_or_edit(update, ERROR_USER_NOT_FOUND)
+        await send_or_edit(update, ERROR_USER_NOT_FOUND)
         return ConversationHandler.END
     
     # Get user and families
     async for session in get_db():
         user = await crud.get_user_by_id(session, user_id)
         if not user:
-            await MsgHandler.send_or_edit(update, ERROR_USER_NOT_FOUND)
+            await send_or_edit(update, ERROR_USER_NOT_FOUND)
             return ConversationHandler.END
         
         families = await crud.get_user_families(session, user.id)
@@ -558,7 +557,7 @@ async def cancel_conversation(
         
         reply_markup = get_main_menu_keyboard(has_families=bool(families))
         
-        await MsgHandler.send_or_edit(update, welcome_message, reply_markup=reply_markup)
+        await send_or_edit(update, welcome_message, reply_markup=reply_markup)
         
         logger.info(f"User {user_id} returned to main menu from conversation")
         return ConversationHandler.END
@@ -662,7 +661,7 @@ async def my_families_command(
     """
     user_id = await get_user_from_context_or_db(update, context)
     if not user_id:
-        await MsgHandler.send_or_edit(update, ERROR_USER_NOT_REGISTERED)
+        await send_or_edit(update, ERROR_USER_NOT_REGISTERED)
         return
     
     async for session in get_db():
@@ -691,14 +690,14 @@ async def my_families_command(
             keyboard = add_navigation_buttons(keyboard, context, current_state="my_families")
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await MsgHandler.send_or_edit(update, message, reply_markup=reply_markup)
+            await send_or_edit(update, message, reply_markup=reply_markup)
             
             logger.info(f"Showed {len(families)} families to user {user_id}")
             
         except Exception as e:
             logger.error(f"Error showing families: {e}", exc_info=True)
             keyboard = get_home_button()
-            await MsgHandler.send_or_edit(
+            await send_or_edit(
                 update,
                 "❌ Произошла ошибка при получении списка семей.",
                 reply_markup=keyboard
@@ -727,7 +726,7 @@ async def view_family_details(
     user_id = await get_user_from_context_or_db(update, context)
     if not user_id:
         keyboard = get_home_button()
-        await MsgHandler.send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
+        await send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
         return
     
     # Store family_id in context for later use
@@ -740,14 +739,14 @@ async def view_family_details(
             
             if not family:
                 keyboard = get_home_button()
-                await MsgHandler.send_or_edit(update, MSG_FAMILY_NOT_FOUND, reply_markup=keyboard)
+                await send_or_edit(update, MSG_FAMILY_NOT_FOUND, reply_markup=keyboard)
                 return
             
             # Check if user is member
             is_member = await crud.is_user_in_family(session, user_id, family_id)
             if not is_member:
                 keyboard = get_home_button()
-                await MsgHandler.send_or_edit(
+                await send_or_edit(
                     update,
                     "❌ Вы не являетесь членом этой семьи.",
                     reply_markup=keyboard
@@ -778,14 +777,14 @@ async def view_family_details(
             
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await MsgHandler.send_or_edit(update, message, reply_markup=reply_markup)
+            await send_or_edit(update, message, reply_markup=reply_markup)
             
             logger.info(f"User {user_id} viewed details for family {family_id}")
             
         except Exception as e:
             logger.error(f"Error showing family details: {e}", exc_info=True)
             keyboard = get_home_button()
-            await MsgHandler.send_or_edit(
+            await send_or_edit(
                 update,
                 "❌ Произошла ошибка при получении информации о семье.",
                 reply_markup=keyboard
@@ -814,7 +813,7 @@ async def leave_family_confirm(
     user_id = await get_user_from_context_or_db(update, context)
     if not user_id:
         keyboard = get_home_button()
-        await MsgHandler.send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
+        await send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
         return
     
     async for session in get_db():
@@ -823,7 +822,7 @@ async def leave_family_confirm(
             
             if not family:
                 keyboard = get_home_button()
-                await MsgHandler.send_or_edit(update, MSG_FAMILY_NOT_FOUND, reply_markup=keyboard)
+                await send_or_edit(update, MSG_FAMILY_NOT_FOUND, reply_markup=keyboard)
                 return
             
             message = (
@@ -841,12 +840,12 @@ async def leave_family_confirm(
             
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await MsgHandler.send_or_edit(update, message, reply_markup=reply_markup)
+            await send_or_edit(update, message, reply_markup=reply_markup)
             
         except Exception as e:
             logger.error(f"Error showing leave confirmation: {e}", exc_info=True)
             keyboard = get_home_button()
-            await MsgHandler.send_or_edit(
+            await send_or_edit(
                 update,
                 "❌ Произошла ошибка.",
                 reply_markup=keyboard
@@ -875,7 +874,7 @@ async def leave_family_execute(
     user_id = await get_user_from_context_or_db(update, context)
     if not user_id:
         keyboard = get_home_button()
-        await MsgHandler.send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
+        await send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
         return
     
     async for session in get_db():
@@ -899,12 +898,12 @@ async def leave_family_execute(
                 
                 reply_markup = InlineKeyboardMarkup(keyboard)
                 
-                await MsgHandler.send_or_edit(update, message, reply_markup=reply_markup)
+                await send_or_edit(update, message, reply_markup=reply_markup)
                 
                 logger.info(f"User {user_id} left family {family_id}")
             else:
                 keyboard = get_home_button()
-                await MsgHandler.send_or_edit(
+                await send_or_edit(
                     update,
                     "❌ Ошибка при выходе из семьи. Возможно, вы уже не являетесь её членом.",
                     reply_markup=keyboard
@@ -913,7 +912,7 @@ async def leave_family_execute(
         except Exception as e:
             logger.error(f"Error leaving family: {e}", exc_info=True)
             keyboard = get_home_button()
-            await MsgHandler.send_or_edit(
+            await send_or_edit(
                 update,
                 "❌ Произошла ошибка при выходе из семьи.",
                 reply_markup=keyboard
@@ -942,7 +941,7 @@ async def delete_family_confirm(
     user_id = await get_user_from_context_or_db(update, context)
     if not user_id:
         keyboard = get_home_button()
-        await MsgHandler.send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
+        await send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
         return
     
     async for session in get_db():
@@ -958,7 +957,7 @@ async def delete_family_confirm(
             
             if not family:
                 keyboard = get_home_button()
-                await MsgHandler.send_or_edit(update, MSG_FAMILY_NOT_FOUND, reply_markup=keyboard)
+                await send_or_edit(update, MSG_FAMILY_NOT_FOUND, reply_markup=keyboard)
                 return
             
             message = (
@@ -981,12 +980,12 @@ async def delete_family_confirm(
             
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await MsgHandler.send_or_edit(update, message, reply_markup=reply_markup)
+            await send_or_edit(update, message, reply_markup=reply_markup)
             
         except Exception as e:
             logger.error(f"Error showing delete confirmation: {e}", exc_info=True)
             keyboard = get_home_button()
-            await MsgHandler.send_or_edit(
+            await send_or_edit(
                 update,
                 "❌ Произошла ошибка.",
                 reply_markup=keyboard
@@ -1015,7 +1014,7 @@ async def delete_family_execute(
     user_id = await get_user_from_context_or_db(update, context)
     if not user_id:
         keyboard = get_home_button()
-        await MsgHandler.send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
+        await send_or_edit(update, ERROR_USER_NOT_REGISTERED, reply_markup=keyboard)
         return
     
     async for session in get_db():
@@ -1031,7 +1030,7 @@ async def delete_family_execute(
             family_name = family.name if family else "Unknown"
             
             if family:
-                await session.delete(family)
+                await crud.delete_family(session, family)
                 await session.commit()
                 
                 message = (
@@ -1047,17 +1046,17 @@ async def delete_family_execute(
                 
                 reply_markup = InlineKeyboardMarkup(keyboard)
                 
-                await MsgHandler.send_or_edit(update, message, reply_markup=reply_markup)
+                await send_or_edit(update, message, reply_markup=reply_markup)
                 
                 logger.info(f"User {user_id} deleted family {family_id}")
             else:
                 keyboard = get_home_button()
-                await MsgHandler.send_or_edit(update, MSG_FAMILY_NOT_FOUND, reply_markup=keyboard)
+                await send_or_edit(update, MSG_FAMILY_NOT_FOUND, reply_markup=keyboard)
             
         except Exception as e:
             logger.error(f"Error deleting family: {e}", exc_info=True)
             keyboard = get_home_button()
-            await MsgHandler.send_or_edit(
+            await send_or_edit(
                 update,
                 "❌ Произошла ошибка при удалении семьи.",
                 reply_markup=keyboard
@@ -343,7 +343,6 @@ async def show_family_settings(
     if not message:
         return
     
-    is_admin = await crud.is_family_admin(session, user_id, family_id)
     family = await crud.get_family_by_id(session, family_id)
     
     if not family:
@@ -352,6 +351,8 @@ async def show_family_settings(
         return
     
     members = await crud.get_family_members(session, family_id)
+    # Answered from the member list loaded above, no extra query
+    is_admin = await crud.is_family_admin(session, user_id, family_id)
     admin_count = sum(1 for _, member in members if member.role.value == "admin")
     member_count = len(members)
     
@@ -634,7 +635,7 @@ async def confirm_delete_family_callback(update: Update, context: ContextTypes.D
         
         family = await crud.get_family_by_id(session, settings_data.selected_family_id)
         if family:
-            await session.delete(family)
+            await crud.delete_family(session, family)
             await session.commit()
             return True, None
         return False, ErrorMessage.FAMILY_NOT_FOUND
@@ -11,7 +11,7 @@ from telegram.ext import (
 )
 
 from bot.utils.keyboards import get_back_button, get_help_keyboard
-from bot.utils.message_utils import MessageHandler as MsgHandler
+from bot.utils.message_utils import send_or_edit
 
 logger = logging.getLogger(__name__)
 
@@ -175,7 +175,7 @@ async def help_command(
     
     keyboard = get_help_keyboard()
     
-    await MsgHandler.send_or_edit(update, HELP_MAIN_TEXT, reply_markup=keyboard)
+    await send_or_edit(update, HELP_MAIN_TEXT, reply_markup=keyboard)
 
 
 # ============================================================================
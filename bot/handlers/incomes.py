@@ -409,7 +409,7 @@ async def show_category_selection(update: Update, context: ContextTypes.DEFAULT_
     income_data = IncomeData.from_context(context)
     
     async def get_categories(session):
-        return await crud.get_family_categories(
+        return await crud.get_family_categories_lite(
             session,
             income_data.family_id,
             category_type=CategoryTypeEnum.INCOME
@@ -536,7 +536,7 @@ async def _save_income(update: Update, context: ContextTypes.DEFAULT_TYPE, incom
             user_id=user_id,
             family_id=income_data.family_id,
             category_id=income_data.category_id,
-            amount=float(income_data.amount),
+            amount=income_data.amount,
             description=income_data.description
         )
         await session.commit()
@@ -1,5 +1,6 @@
 """Middleware for logging, performance tracking, and error handling."""
 
+import json
 import logging
 import time
 from typing import Any, Optional
@@ -7,22 +8,50 @@ from typing import Any, Optional
 from telegram import Update
 from telegram.ext import ContextTypes
 
+try:
+    import orjson
+except ImportError:  # optional, only speeds up error log serialization
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
 # ============================================================================
-# Logging Middleware
+# Request Setup Middleware
 # ============================================================================
 
-def _extract_update_info(update: Update) -> tuple[str, str]:
-    """Extract message type and content from update.
+async def request_setup_middleware(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Middleware to prepare the context and log an incoming update.
+    
+    Single pass over the update that:
+    - Stores the request start time for performance tracking (in
+      user_data rather than on the context, because PTB builds a fresh
+      context for error handlers)
+    - Stores commonly used user information for easy access by handlers
+      without repeated lookups
+    - Logs user ID, username, message type, and content
     
     Args:
         update: Telegram update object
-        
-    Returns:
-        Tuple of (message_type, content)
+        context: Telegram context object
     """
+    user = update.effective_user
+    if not user:
+        return
+    
+    context.user_data.update({
+        '_request_start_time': time.perf_counter(),
+        'effective_user_id': user.id,
+        'effective_username': user.username,
+        'effective_user_name': user.full_name,
+    })
+    
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     if update.message:
         message_type = "message"
         content = update.message.text or "[media/other]"
@@ -33,132 +62,91 @@ def _extract_update_info(update: Update) -> tuple[str, str]:
         message_type = "other"
         content = "[unknown]"
     
-    return message_type, content
-
-
-async def error_logging_middleware(
-    update: Update,
-    context: ContextTypes.DEFAULT_TYPE
-) -> None:
-    """Middleware to log all incoming updates.
-    
-    Logs user ID, username, message type, and content for debugging
-    and monitoring purposes.
-    
-    Args:
-        update: Telegram update object
-        context: Telegram context object
-    """
-    if not update.effective_user:
-        return
-    
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "no_username"
-    
-    message_type, content = _extract_update_info(update)
-    
-    logger.info(f"[{message_type}] User {user_id} (@{username}): {content}")
+    logger.info(
+        "[%s] User %s (@%s): %s",
+        message_type, user.id, user.username or "no_username", content
+    )
 
 
 # ============================================================================
-# Performance Tracking Middleware
+# Performance Tracking
 # ============================================================================
 
-def _store_request_start_time(context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Store request start time in context for performance tracking.
-    
-    Args:
-        context: Telegram context object
-    """
-    context.user_data['_request_start_time'] = time.time()
-
-
 def _log_request_duration(context: ContextTypes.DEFAULT_TYPE) -> None:
     """Log request duration if start time is available.
     
     Args:
         context: Telegram context object
     """
-    start_time = context.user_data.get('_request_start_time')
-    if start_time:
-        duration = time.time() - start_time
-        logger.debug(f"Request completed in {duration:.2f} seconds")
-        # Clean up
-        context.user_data.pop('_request_start_time', None)
-
-
-async def performance_logging_middleware(
-    update: Update,
-    context: ContextTypes.DEFAULT_TYPE
-) -> None:
-    """Middleware to track and log performance metrics.
-    
-    Stores request start time for later calculation of request duration.
-    Actual logging happens in the enhanced error handler or can be added
-    to individual handlers.
-    
-    Args:
-        update: Telegram update object
-        context: Telegram context object
-    """
-    _store_request_start_time(context)
+    start_time = context.user_data.pop('_request_start_time', None)
+    if start_time is not None:
+        duration = time.perf_counter() - start_time
+        logger.debug("Request completed in %.2f seconds", duration)
 
 
 # ============================================================================
-# User Context Enrichment Middleware
+# Enhanced Error Handler
 # ============================================================================
 
-async def user_context_middleware(
-    update: Update,
-    context: ContextTypes.DEFAULT_TYPE
-) -> None:
-    """Middleware to enrich context with user data.
+USER_ERROR_HTML = (
+    "❌ <b>Произошла ошибка</b>\n\n"
+    "К сожалению, при обработке вашего запроса произошла ошибка. "
+    "Мы уже работаем над её исправлением.\n\n"
+    "Пожалуйста, попробуйте:\n"
+    "• Повторить операцию через несколько секунд\n"
+    "• Использовать команду /start для перезапуска\n"
+    "• Связаться с поддержкой, если проблема повторяется\n\n"
+    "Приносим извинения за неудобства! 🙏"
+)
+
+
+def _dump_for_log(data: Any) -> str:
+    """Serialize a dict for the error log as compact JSON.
     
-    Stores commonly used user information in context for easy access
-    by handlers without repeated lookups.
+    Values JSON can't represent are rendered with str(); data with keys
+    JSON can't represent falls back to str() as a whole.
     
     Args:
-        update: Telegram update object
-        context: Telegram context object
+        data: Data to serialize
+        
+    Returns:
+        JSON string
     """
-    if not update.effective_user:
-        return
-    
-    user = update.effective_user
-    
-    # Store user info in context for easy access
-    context.user_data['effective_user_id'] = user.id
-    context.user_data['effective_username'] = user.username
-    context.user_data['effective_user_name'] = user.full_name
-
+    try:
+        if orjson is not None:
+            return orjson.dumps(
+                data, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        return json.dumps(data, default=str, ensure_ascii=False)
+    except TypeError:
+        return str(data)
 
-# ============================================================================
-# Enhanced Error Handler
-# ============================================================================
 
 def _build_detailed_error_log(
     update: object,
-    context: ContextTypes.DEFAULT_TYPE,
-    tb_string: str
+    context: ContextTypes.DEFAULT_TYPE
 ) -> str:
     """Build detailed error log message.
     
+    The traceback is not included; it is rendered by the logging
+    framework from ``exc_info``.
+    
     Args:
         update: Telegram update object
         context: Telegram context object
-        tb_string: Traceback string
         
     Returns:
         Formatted error log message
     """
-    update_str = update.to_dict() if isinstance(update, Update) else str(update)
+    update_str = (
+        _dump_for_log(update.to_dict()) if isinstance(update, Update) else str(update)
+    )
     
     return (
-        f"An exception was raised while handling an update\n"
+        f"Exception while handling an update\n"
         f"update = {update_str}\n\n"
-        f"context.chat_data = {context.chat_data}\n"
-        f"context.user_data = {context.user_data}\n\n"
-        f"{tb_string}"
+        f"context.chat_data = {_dump_for_log(context.chat_data)}\n"
+        f"context.user_data = {_dump_for_log(context.user_data)}"
     )
 
 
@@ -171,21 +159,10 @@ async def _send_user_error_message(update: Update) -> None:
     if not update.effective_message:
         return
     
-    error_text = (
-        "❌ <b>Произошла ошибка</b>\n\n"
-        "К сожалению, при обработке вашего запроса произошла ошибка. "
-        "Мы уже работаем над её исправлением.\n\n"
-        "Пожалуйста, попробуйте:\n"
-        "• Повторить операцию через несколько секунд\n"
-        "• Использовать команду /start для перезапуска\n"
-        "• Связаться с поддержкой, если проблема повторяется\n\n"
-        "Приносим извинения за неудобства! 🙏"
-    )
-    
     try:
-        await update.effective_message.reply_text(error_text, parse_mode="HTML")
+        await update.effective_message.reply_text(USER_ERROR_HTML, parse_mode="HTML")
     except Exception as e:
-        logger.error(f"Error sending error message to user: {e}")
+        logger.error("Error sending error message to user: %s", e)
 
 
 async def enhanced_error_handler(
@@ -203,31 +180,27 @@ async def enhanced_error_handler(
         update: Telegram update object
         context: Telegram context object containing the error
     """
-    # Log the error with full traceback
-    logger.error("Exception while handling an update:", exc_info=context.error)
-    
-    # Get detailed traceback
-    import traceback
-    tb_list = traceback.format_exception(
-        None,
-        context.error,
-        context.error.__traceback__
-    )
-    tb_string = ''.join(tb_list)
-    
-    # Build and log detailed error message
-    error_log = _build_detailed_error_log(update, context, tb_string)
-    logger.error(error_log)
+    # Log the error with context and full traceback in a single record.
+    # Serializing the update and context data is expensive, so skip it
+    # when ERROR records are filtered.
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error(
+            _build_detailed_error_log(update, context),
+            exc_info=context.error
+        )
     
     # Send user-friendly message
     if isinstance(update, Update):
         await _send_user_error_message(update)
         
         # Log performance if available
-        if context.user_data and '_request_start_time' in context.user_data:
-            start_time = context.user_data['_request_start_time']
-            duration = time.time() - start_time
-            logger.warning(f"Request failed after {duration:.2f} seconds")
+        start_time = (
+            context.user_data.pop('_request_start_time', None)
+            if context.user_data else None
+        )
+        if start_time is not None:
+            duration = time.perf_counter() - start_time
+            logger.warning("Request failed after %.2f seconds", duration)
 
 
 # ============================================================================
@@ -48,6 +48,10 @@ class CallbackPattern:
     START = "start"
 
 
+# Number of matching expenses listed in the results message
+RESULTS_LIMIT = 10
+
+
 class SearchType:
     """Search type identifiers."""
     DESCRIPTION = "description"
@@ -244,8 +248,9 @@ class MessageBuilder:
         )
     
     @staticmethod
-    def build_results_message(family_name: str, expenses: list) -> str:
+    def build_results_message(family_name: str, results: dict) -> str:
         """Build search results message."""
+        expenses = results['expenses']
         if not expenses:
             return (
                 f"{Emoji.SEARCH} <b>Результаты поиска</b>\n"
@@ -256,18 +261,17 @@ class MessageBuilder:
         message = (
             f"{Emoji.SEARCH} <b>Результаты поиска</b>\n"
             f"{Emoji.FAMILY} Семья: <b>{family_name}</b>\n"
-            f"{Emoji.NOTE} Найдено: <b>{len(expenses)}</b>\n\n"
+            f"{Emoji.NOTE} Найдено: <b>{results['count']}</b>\n\n"
         )
         
-        for expense in expenses[:10]:
+        for expense in expenses[:RESULTS_LIMIT]:
             message += format_expense(expense) + "\n"
             message += f"{Emoji.USER} {expense.user.name}\n\n"
         
-        if len(expenses) > 10:
-            message += f"\n... и еще {len(expenses) - 10} расходов\n"
+        if results['count'] > RESULTS_LIMIT:
+            message += f"\n... и еще {results['count'] - RESULTS_LIMIT} расходов\n"
         
-        total = sum(exp.amount for exp in expenses)
-        message += f"\n{Emoji.MONEY} <b>Итого:</b> {format_amount(total)}"
+        message += f"\n{Emoji.MONEY} <b>Итого:</b> {format_amount(results['total'])}"
         
         return message
 
@@ -492,7 +496,8 @@ async def search_query_received(update: Update, context: ContextTypes.DEFAULT_TY
         search_params = {
             'session': session,
             'entity_id': search_data.family_id,
-            'is_family': True
+            'is_family': True,
+            'limit': RESULTS_LIMIT
         }
         
         if search_data.search_type == SearchType.DESCRIPTION:
@@ -535,8 +540,8 @@ async def search_query_received(update: Update, context: ContextTypes.DEFAULT_TY
         elif search_data.search_type == SearchType.CATEGORY:
             search_params['category_id'] = search_data.category_id
         
-        expenses = await crud.search_expenses(**search_params)
-        return expenses, None
+        results = await crud.search_expenses(**search_params)
+        return results, None
     
     result = await handle_db_operation(perform_search, "Error performing search")
     
@@ -549,7 +554,7 @@ async def search_query_received(update: Update, context: ContextTypes.DEFAULT_TY
             await update.message.reply_text(error_msg, parse_mode="HTML", reply_markup=keyboard)
         return ConversationHandler.END
     
-    expenses, error_msg = result
+    results, error_msg = result
     
     if error_msg:
         if is_callback:
@@ -558,7 +563,7 @@ async def search_query_received(update: Update, context: ContextTypes.DEFAULT_TY
             await update.message.reply_text(error_msg, parse_mode="HTML", reply_markup=keyboard)
         return ConversationHandler.END
     
-    message = MessageBuilder.build_results_message(search_data.family_name, expenses)
+    message = MessageBuilder.build_results_message(search_data.family_name, results)
     keyboard = KeyboardBuilder.build_results_keyboard()
     
     if is_callback:
@@ -18,7 +18,7 @@ from bot.utils.constants import (
     WELCOME_RETURNING_USER,
 )
 from bot.utils.keyboards import get_main_menu_keyboard
-from bot.utils.message_utils import UserDataExtractor, format_families_list
+from bot.utils.message_utils import format_families_list, get_user_info
 from bot.utils.navigation import NavigationManager
 from bot.utils.formatters import format_amount
 
@@ -41,21 +41,13 @@ async def _get_or_create_user(session, telegram_id: int, full_name: str, usernam
     Returns:
         Tuple of (user object, is_new_user)
     """
-    user = await crud.get_user_by_telegram_id(session, telegram_id)
-    
-    if user is None:
-        # Create new user
-        user = await crud.create_user(
-            session,
-            telegram_id=telegram_id,
-            name=full_name,
-            username=username
-        )
-        logger.info(f"Created new user: {user.name} (id={user.id})")
-        return user, True
-    
-    logger.info(f"Existing user: {user.name} (id={user.id})")
-    return user, False
+    # Single upsert round-trip instead of lookup + insert
+    return await crud.get_or_create_user(
+        session,
+        telegram_id=telegram_id,
+        name=full_name,
+        username=username
+    )
 
 
 def _build_welcome_message(user, families, is_new_user: bool = False) -> str:
@@ -194,7 +186,7 @@ async def _process_start_command(
         return
     
     # Extract user information
-    telegram_id, full_name, username = UserDataExtractor.get_user_info(update)
+    telegram_id, full_name, username = get_user_info(update)
     if not telegram_id:
         logger.warning("Could not extract user info from update")
         return
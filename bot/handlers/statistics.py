@@ -1,8 +1,10 @@
 """Statistics handlers with improved architecture."""
 
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from decimal import Decimal
 from enum import IntEnum
 from typing import Optional, List, Tuple
 
@@ -18,6 +20,7 @@ from telegram.ext import (
 from bot.database import crud, get_db
 from bot.utils.formatters import format_amount, format_date
 from bot.utils.charts import create_category_chart
+from bot.utils.constants import MONTH_NAMES
 from bot.utils.helpers import end_conversation_silently, end_conversation_and_route, get_user_id
 from bot.utils.keyboards import add_navigation_buttons, get_back_button, get_home_button
 
@@ -203,12 +206,7 @@ def format_period_name(year: int, month: Optional[int] = None) -> str:
         Formatted period name
     """
     if month:
-        month_names = {
-            1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-            5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-            9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-        }
-        return f"{month_names[month]} {year}"
+        return f"{MONTH_NAMES[month]} {year}"
     else:
         return f"{year} год"
 
@@ -319,9 +317,6 @@ def format_detailed_statistics_message(
     Returns:
         Formatted message
     """
-    from decimal import Decimal
-    from collections import defaultdict
-    
     type_text = "Детализированная личная статистика" if stats_type == StatsType.PERSONAL else "Детализированная статистика семьи"
     income_total = income_stats.get('total', Decimal('0')) if income_stats else Decimal('0')
     expense_total = stats.get('total', Decimal('0')) if stats else Decimal('0')
@@ -447,16 +442,10 @@ class KeyboardBuilder:
     @staticmethod
     def build_month_selection_keyboard(months: List[Tuple[int, int]], context: ContextTypes.DEFAULT_TYPE) -> InlineKeyboardMarkup:
         """Build keyboard for month selection."""
-        month_names = {
-            1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-            5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-            9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-        }
-        
         keyboard = []
         # Show last 12 months, most recent first
         for year, month in reversed(months[-12:]):
-            month_name = f"{month_names[month]} {year}"
+            month_name = f"{MONTH_NAMES[month]} {year}"
             callback_data = f"{CallbackPattern.STATS_MONTH_PREFIX}{year}_{month}"
             keyboard.append([InlineKeyboardButton(month_name, callback_data=callback_data)])
         
@@ -5,14 +5,23 @@ import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Bot
 from telegram.error import TelegramError
 
-from bot.database import crud, get_db
+from bot.database import crud, db_session
+from bot.utils.constants import MONTH_NAMES
 from bot.utils.formatters import format_amount
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Users whose monthly reports are generated and sent at the same time
+MONTHLY_SUMMARY_CONCURRENCY = 25
+_summary_semaphore = asyncio.Semaphore(MONTHLY_SUMMARY_CONCURRENCY)
+# Delivered users recorded per UPDATE + commit
+MONTHLY_SUMMARY_BATCH_SIZE = 20
+
 
 async def send_long_message(bot: Bot, chat_id: int, text: str, parse_mode: str = "HTML") -> None:
     """Send a message, splitting it into multiple messages if it exceeds Telegram's limit.
@@ -50,7 +59,13 @@ async def send_long_message(bot: Bot, chat_id: int, text: str, parse_mode: str =
         await asyncio.sleep(0.1)  # Small delay between messages
 
 
-async def send_monthly_summary(bot: Bot, user, summary_data: dict, month_name: str, family_name: str = None) -> None:
+async def send_monthly_summary(
+    bot: Bot,
+    user,
+    summary_data: dict,
+    month_name: str,
+    family_name: str = None
+) -> None:
     """Send monthly summary to user as HTML report file.
     
     Args:
@@ -76,7 +91,9 @@ async def send_monthly_summary(bot: Bot, user, summary_data: dict, month_name: s
                 text=message,
                 parse_mode="HTML"
             )
-            logger.info(f"Sent monthly summary to user {user.id} ({user.telegram_id}) - no operations")
+            logger.info(
+                f"Sent monthly summary to user {user.id} ({user.telegram_id}) - no operations"
+            )
             return
         
         # Generate and send HTML report
@@ -124,6 +141,92 @@ async def send_monthly_summary(bot: Bot, user, summary_data: dict, month_name: s
         logger.error(f"Error sending monthly summary to user {user.id}: {e}", exc_info=True)
 
 
+async def _send_user_summaries(bot: Bot, user, reports: list, month_name: str) -> None:
+    """Send a user's family summaries one after another.
+    
+    Reports for one user go to the same chat, so they are sent in order;
+    Telegram's rate limits are enforced by the application's rate limiter.
+    
+    Args:
+        bot: Telegram bot instance
+        user: User object
+        reports: List of (family name, summary data) tuples
+        month_name: Name of the month (e.g., "Октябрь 2025")
+    """
+    async with _summary_semaphore:
+        for family_name, summary in reports:
+            await send_monthly_summary(bot, user, summary, month_name, family_name)
+
+
+async def _build_family_summaries(
+    session: AsyncSession,
+    families: list,
+    start_date: datetime,
+    end_date: datetime
+) -> dict:
+    """Build period summaries for distinct families.
+    
+    A summary covers the whole family, so it's built once per family and
+    shared by all its members. On PostgreSQL families are summarized
+    concurrently, each in its own short-lived session (an AsyncSession must
+    never be shared between concurrent awaits); SQLite stays on the
+    caller's session like get_period_financial_statistics does.
+    
+    Args:
+        session: Database session
+        families: Family objects, each at most once
+        start_date: Period start
+        end_date: Period end (inclusive)
+        
+    Returns:
+        Dictionary of family ID to summary, or to the exception raised for it
+    """
+    async def summarize(family_session: AsyncSession, family) -> dict:
+        return await crud.get_period_financial_statistics(
+            family_session,
+            family.id,
+            start_date=start_date,
+            end_date=end_date,
+            is_family=True
+        )
+    
+    if session.bind.dialect.name == "postgresql":
+        # Each summary reads expenses and incomes on two pooled connections
+        semaphore = asyncio.Semaphore(max(1, settings.DB_POOL_SIZE // 2))
+        
+        async def summarize_isolated(family) -> dict:
+            async with semaphore, AsyncSession(session.bind) as family_session:
+                return await summarize(family_session, family)
+        
+        results = await asyncio.gather(
+            *(summarize_isolated(family) for family in families),
+            return_exceptions=True
+        )
+    else:
+        results = []
+        for family in families:
+            try:
+                results.append(await summarize(session, family))
+            except Exception as e:
+                results.append(e)
+    
+    return {family.id: result for family, result in zip(families, results)}
+
+
+async def _mark_summaries_sent(user_ids: list[int], sent_at: datetime) -> None:
+    """Persist a batch of delivered monthly summaries in its own transaction.
+    
+    Args:
+        user_ids: Internal IDs of users whose summaries were sent
+        sent_at: Time of the scheduler run
+    """
+    try:
+        async with db_session() as session:
+            await crud.mark_monthly_summaries_sent(session, user_ids, sent_at)
+    except Exception as e:
+        logger.error(f"Failed to mark monthly summaries sent for users {user_ids}: {e}")
+
+
 async def check_and_send_monthly_summaries(bot: Bot) -> None:
     """Check if today is 1st day of month and send summaries to users."""
     now = datetime.now()
@@ -135,18 +238,20 @@ async def check_and_send_monthly_summaries(bot: Bot) -> None:
     
     logger.info("Today is 1st day of month, checking for monthly summaries to send")
     
-    # Calculate previous month range
+    # Calculate previous month range, computed once for all families. The end
+    # is the last moment of the month (inclusive bound, as in crud), not
+    # midnight of the last day, which would drop that day's operations.
     first_day_of_current_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    last_day_of_previous_month = first_day_of_current_month - timedelta(days=1)
+    end_of_previous_month = first_day_of_current_month - timedelta(microseconds=1)
+    last_day_of_previous_month = end_of_previous_month.replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
     first_day_of_previous_month = last_day_of_previous_month.replace(day=1)
     
     # Format month name
-    month_names = {
-        1: "Январь", 2: "Февраль", 3: "Март", 4: "Апрель",
-        5: "Май", 6: "Июнь", 7: "Июль", 8: "Август",
-        9: "Сентябрь", 10: "Октябрь", 11: "Ноябрь", 12: "Декабрь"
-    }
-    month_name = f"{month_names[last_day_of_previous_month.month]} {last_day_of_previous_month.year}"
+    month_name = (
+        f"{MONTH_NAMES[last_day_of_previous_month.month]} {last_day_of_previous_month.year}"
+    )
     
     current_hour = now.hour
     current_minute = now.minute
@@ -159,19 +264,15 @@ async def check_and_send_monthly_summaries(bot: Bot) -> None:
     
     sent_count = 0
     error_count = 0
+    # (user, families) due a summary this run
+    recipients = []
+    # (user, [(family name, summary), ...]) to send
+    pending = []
     
-    async for session in get_db():
+    async with db_session() as session:
         try:
-            # Get all users with monthly summary enabled
-            from sqlalchemy import select
-            from bot.database.models import User
-            
-            result = await session.execute(
-                select(User).where(User.monthly_summary_enabled == True)
-            )
-            users = result.scalars().all()
-            
-            logger.info(f"Found {len(users)} users with monthly summary enabled")
+            # Get all users with monthly summary enabled (families preloaded)
+            users = await crud.get_users_with_monthly_summary(session)
             
             for user in users:
                 # Check if already sent today
@@ -180,7 +281,8 @@ async def check_and_send_monthly_summaries(bot: Bot) -> None:
                     today_date = now.date()
                     if last_sent_date == today_date:
                         logger.debug(
-                            f"Skipping user {user.id}: monthly summary already sent today ({last_sent_date})"
+                            f"Skipping user {user.id}: monthly summary already sent today "
+                            f"({last_sent_date})"
                         )
                         continue
                 
@@ -194,50 +296,82 @@ async def check_and_send_monthly_summaries(bot: Bot) -> None:
                         )
                         continue
                 
-                # Get user's families
-                families = await crud.get_user_families(session, user.id)
+                # User's families, newest first (same order as get_user_families)
+                families = sorted(
+                    (membership.family for membership in user.family_memberships),
+                    key=lambda family: family.created_at,
+                    reverse=True
+                )
                 
                 if not families:
                     logger.debug(f"User {user.id} has no families, skipping")
                     continue
                 
-                # For each family, get summary for previous month (with income and expenses)
+                recipients.append((user, families))
+            
+            # Summaries for previous month (with income and expenses), once per family
+            distinct_families = list({
+                family.id: family for _, families in recipients for family in families
+            }.values())
+            family_summaries = await _build_family_summaries(
+                session,
+                distinct_families,
+                first_day_of_previous_month,
+                end_of_previous_month
+            )
+            
+            for user, families in recipients:
+                reports = []
                 for family in families:
-                    try:
-                        summary = await crud.get_period_financial_statistics(
-                            session,
-                            family.id,
-                            start_date=first_day_of_previous_month,
-                            end_date=last_day_of_previous_month,
-                            is_family=True
-                        )
-                        
-                        # Send summary with HTML report
-                        await send_monthly_summary(bot, user, summary, month_name, family.name)
-                        
-                        # Update last sent timestamp
-                        user.last_monthly_summary_sent = now
-                        await session.commit()
-                        
-                        sent_count += 1
-                        
-                        # Small delay to avoid rate limiting
-                        await asyncio.sleep(0.5)
-                        
-                    except Exception as e:
+                    summary = family_summaries[family.id]
+                    if isinstance(summary, BaseException):
                         logger.error(
                             f"Error processing monthly summary for user {user.id}, "
-                            f"family {family.id}: {e}"
+                            f"family {family.id}: {summary}"
                         )
                         error_count += 1
-            
-            logger.info(
-                f"Monthly summaries processing complete: "
-                f"sent={sent_count}, errors={error_count}"
-            )
+                        continue
+                    reports.append((family.name, summary))
+                
+                if reports:
+                    pending.append((user, reports))
             
         except Exception as e:
             logger.error(f"Error in check_and_send_monthly_summaries: {e}", exc_info=True)
+            return
+    
+    # Sending happens outside the read session, so no transaction stays open
+    # during the rate-limited broadcast. Users are served concurrently and
+    # marked as sent in small batches as their reports go out, so a crash
+    # mid-run doesn't make the next run re-send everything.
+    delivered: list[int] = []
+    
+    async def deliver(user, reports: list) -> None:
+        await _send_user_summaries(bot, user, reports, month_name)
+        delivered.append(user.id)
+        if len(delivered) >= MONTHLY_SUMMARY_BATCH_SIZE:
+            batch = delivered.copy()
+            delivered.clear()
+            await _mark_summaries_sent(batch, now)
+    
+    results = await asyncio.gather(
+        *(deliver(user, reports) for user, reports in pending),
+        return_exceptions=True
+    )
+    if delivered:
+        await _mark_summaries_sent(delivered, now)
+    
+    for (user, reports), result in zip(pending, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Error sending monthly summaries to user {user.id}: {result}")
+            error_count += 1
+            continue
+        sent_count += len(reports)
+    
+    logger.info(
+        f"Monthly summaries processing complete: "
+        f"sent={sent_count}, errors={error_count}"
+    )
 
 
 async def run_scheduler(bot: Bot) -> None:
@@ -1,7 +1,10 @@
 """Chart and visualization utilities for statistics display."""
 
+from datetime import datetime
 from typing import Dict, List, Optional
 
+from bot.utils.formatters import format_amount, format_date
+
 
 def create_text_bar(value: float, max_value: float, length: int = 10) -> str:
     """Create a text-based progress bar.
@@ -65,8 +68,6 @@ def create_category_chart(category_data: List[Dict], max_categories: int = 10) -
     if not category_data:
         return "📊 Нет данных по категориям"
     
-    from bot.utils.formatters import format_amount
-    
     lines = []
     
     # Get max amount for bar scaling
@@ -159,8 +160,6 @@ def format_statistics_message(
         🚗 Транспорт - 12,000 ₽ (26.4%)
         ██████░░░░
     """
-    from bot.utils.formatters import format_amount, format_date
-    
     lines = [
         f"📊 <b>Статистика за {period_name}</b>",
         ""
@@ -222,8 +221,6 @@ def format_period_name(period: str, start_date=None, end_date=None) -> str:
         >>> format_period_name('month')
         'Ноябрь 2025'
     """
-    from datetime import datetime
-    
     if period == "today":
         return "Сегодня"
     elif period == "week":
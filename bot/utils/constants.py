@@ -1,6 +1,6 @@
 """Constants for messages and mappings used across handlers."""
 
-from typing import Dict
+from typing import Dict, Tuple
 
 # ============================================================================
 # User Messages
@@ -98,6 +98,12 @@ TIME_MAPPING: Dict[str, str] = {
     "summary_time_18": "18:00"
 }
 
+# Month names indexed by month number (1-12)
+MONTH_NAMES: Tuple[str, ...] = (
+    "", "Январь", "Февраль", "Март", "Апрель", "Май", "Июнь",
+    "Июль", "Август", "Сентябрь", "Октябрь", "Ноябрь", "Декабрь"
+)
+
 # ============================================================================
 # Validation Limits
 # ============================================================================
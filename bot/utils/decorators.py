@@ -1,5 +1,6 @@
 """Utility decorators for bot handlers."""
 
+import time
 from functools import wraps
 from typing import Callable, TypeVar, cast
 
@@ -11,6 +12,14 @@ from config.settings import settings
 
 F = TypeVar('F', bound=Callable)
 
+ADMIN_ONLY_MESSAGE = "⛔️ Эта команда доступна только администраторам."
+
+# Telegram shows "typing" for ~5 seconds, so repeat actions within this
+# window are redundant. chat_id -> time.monotonic() of the last action.
+TYPING_DEBOUNCE_SECONDS = 4.0
+TYPING_CACHE_SIZE = 10_000
+_last_typing: dict[int, float] = {}
+
 
 def admin_only(func: F) -> F:
     """Decorator to restrict handler to admin users only.
@@ -30,13 +39,11 @@ def admin_only(func: F) -> F:
         
         if user_id not in settings.ADMIN_USER_IDS:
             logger.warning(
-                f"Unauthorized access attempt by user {user_id} "
-                f"({update.effective_user.username})"
+                "Unauthorized access attempt by user %s (%s)",
+                user_id, update.effective_user.username
             )
             if update.message:
-                await update.message.reply_text(
-                    "⛔️ Эта команда доступна только администраторам."
-                )
+                await update.message.reply_text(ADMIN_ONLY_MESSAGE)
             return
         
         return await func(update, context, *args, **kwargs)
@@ -57,9 +64,9 @@ def log_handler(func: F) -> F:
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
         if update.effective_user and update.message:
             logger.info(
-                f"Handler {func.__name__} called by user "
-                f"{update.effective_user.id} ({update.effective_user.username}): "
-                f"{update.message.text}"
+                "Handler %s called by user %s (%s): %s",
+                func.__name__, update.effective_user.id,
+                update.effective_user.username, update.message.text
             )
         
         return await func(update, context, *args, **kwargs)
@@ -79,10 +86,16 @@ def typing_action(func: F) -> F:
     @wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
         if update.effective_chat:
-            await context.bot.send_chat_action(
-                chat_id=update.effective_chat.id,
-                action="typing"
-            )
+            chat_id = update.effective_chat.id
+            now = time.monotonic()
+            if now - _last_typing.get(chat_id, float('-inf')) >= TYPING_DEBOUNCE_SECONDS:
+                if len(_last_typing) >= TYPING_CACHE_SIZE:
+                    _last_typing.clear()
+                _last_typing[chat_id] = now
+                await context.bot.send_chat_action(
+                    chat_id=chat_id,
+                    action="typing"
+                )
         
         return await func(update, context, *args, **kwargs)
     
@@ -1,16 +1,65 @@
 """Helper utilities for bot handlers."""
 
+import asyncio
 import logging
 import re
-from decimal import Decimal, InvalidOperation
-from typing import Optional
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Optional
 
 from telegram import Update
 from telegram.error import BadRequest
-from telegram.ext import ContextTypes
+from telegram.ext import ContextTypes, ConversationHandler
+
+from bot.database import crud, db_session
+from bot.utils.formatters import format_amount
+from bot.utils.keyboards import (
+    get_expense_notification_keyboard,
+    get_income_notification_keyboard,
+)
 
 logger = logging.getLogger(__name__)
 
+# Validation patterns, compiled once at import time
+_AMOUNT_RE = re.compile(r'^\d{1,10}(\.\d{1,2})?$')
+_INVITE_RE = re.compile(r'^[A-Z0-9]{8,16}$')
+_MAX_AMOUNT = Decimal('9999999999.99')
+
+# Control characters (ASCII < 32); newline and tab are allowed in free text
+_ALL_CTRL_CHARS = frozenset(map(chr, range(32)))
+_CTRL_CHARS = _ALL_CTRL_CHARS - {'\n', '\t'}
+_CTRL_TABLE = dict.fromkeys(map(ord, _CTRL_CHARS))
+
+# Telegram's error text when an edit doesn't change the message
+_NOT_MODIFIED = "Message is not modified"
+
+# telegram_id -> user_id. Users are never deleted, so entries don't
+# expire; the map is warmed from the database at startup so known users
+# skip the lookup after a restart too.
+USER_ID_CACHE_SIZE = 10_000
+_user_id_cache: Dict[int, int] = {}
+
+
+def _cache_user_id(telegram_id: int, user_id: int) -> None:
+    """Remember the user_id of a Telegram user."""
+    if len(_user_id_cache) >= USER_ID_CACHE_SIZE:
+        _user_id_cache.clear()
+    _user_id_cache[telegram_id] = user_id
+
+
+async def warm_user_id_cache() -> int:
+    """Preload user IDs of the newest USER_ID_CACHE_SIZE users.
+    
+    Returns:
+        Number of users loaded
+    """
+    async with db_session() as session:
+        user_ids = await crud.get_user_id_map(session, limit=USER_ID_CACHE_SIZE)
+    
+    _user_id_cache.clear()
+    _user_id_cache.update(user_ids)
+    return len(user_ids)
+
 
 async def safe_edit_message(query, text: str, **kwargs):
     """Safely edit message, handling 'Message is not modified' error.
@@ -27,7 +76,8 @@ async def safe_edit_message(query, text: str, **kwargs):
     try:
         await query.edit_message_text(text, **kwargs)
     except BadRequest as e:
-        if "Message is not modified" not in str(e):
+        # TelegramError keeps the text in .message; no str(e) needed
+        if _NOT_MODIFIED not in e.message:
             raise
         # If message is not modified, just answer the callback query
         await query.answer()
@@ -48,8 +98,6 @@ async def end_conversation_silently(update: Update, context: ContextTypes.DEFAUL
     Returns:
         ConversationHandler.END
     """
-    from telegram.ext import ConversationHandler
-    
     # Just end the conversation
     # navigation_back_callback_handler (in group=-1) will handle the actual navigation
     return ConversationHandler.END
@@ -68,7 +116,6 @@ async def end_conversation_and_route(update: Update, context: ContextTypes.DEFAU
     Returns:
         ConversationHandler.END
     """
-    from telegram.ext import ConversationHandler
     from bot.handlers.navigation import _handle_navigation_state
     
     query = update.callback_query
@@ -123,15 +170,20 @@ async def get_user_id(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Opt
     telegram_id = update.effective_user.id
     effective_user = update.effective_user
     
-    # Fetch user from database
-    from bot.database import crud, get_db
+    # Try the process-wide cache before opening a session
+    user_id = _user_id_cache.get(telegram_id)
+    if user_id is not None:
+        context.user_data['user_id'] = user_id
+        context.user_data['telegram_id'] = telegram_id
+        return user_id
     
-    async for session in get_db():
+    # Fetch user from database
+    async with db_session() as session:
         user = await crud.get_user_by_telegram_id(session, telegram_id)
         
         # If user doesn't exist, create them automatically
         if not user:
-            logger.info(f"User with telegram_id {telegram_id} not found, creating new user")
+            logger.info("User with telegram_id %s not found, creating new user", telegram_id)
             
             # Build full name from Telegram user data
             full_name = effective_user.full_name or effective_user.first_name or "Unknown"
@@ -145,9 +197,12 @@ async def get_user_id(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Opt
                     username=username
                 )
                 await session.commit()
-                logger.info(f"Auto-created user: {user.name} (id={user.id}, telegram_id={telegram_id})")
+                logger.info(
+                    "Auto-created user: %s (id=%s, telegram_id=%s)",
+                    user.name, user.id, telegram_id
+                )
             except Exception as e:
-                logger.error(f"Error auto-creating user with telegram_id {telegram_id}: {e}")
+                logger.error("Error auto-creating user with telegram_id %s: %s", telegram_id, e)
                 await session.rollback()
                 return None
         
@@ -155,10 +210,22 @@ async def get_user_id(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Opt
         user_id = user.id
         context.user_data['user_id'] = user_id
         context.user_data['telegram_id'] = telegram_id
-        logger.info(f"Retrieved user_id {user_id} from database for telegram_id {telegram_id}")
+        _cache_user_id(telegram_id, user_id)
+        logger.info("Retrieved user_id %s from database for telegram_id %s", user_id, telegram_id)
         return user_id
+
+
+@lru_cache(maxsize=1024)
+def _parse_amount(amount_str: str) -> Optional[Decimal]:
+    """Parse an amount string that matched _AMOUNT_RE.
     
-    return None
+    Users keep entering the same round amounts, and Decimal is immutable,
+    so parsed values are cached.
+    """
+    amount = Decimal(amount_str)
+    if amount <= 0 or amount > _MAX_AMOUNT:
+        return None
+    return amount
 
 
 def validate_amount(amount_str: str) -> Optional[Decimal]:
@@ -176,29 +243,16 @@ def validate_amount(amount_str: str) -> Optional[Decimal]:
         - Can have up to 2 decimal places
         - Maximum 10 digits before decimal point
     """
-    if not amount_str or not amount_str.strip():
+    if not amount_str:
         return None
     
     amount_str = amount_str.strip().replace(',', '.')
     
-    # Check format with regex
-    if not re.match(r'^\d{1,10}(\.\d{1,2})?$', amount_str):
+    # Check format with regex before any Decimal parsing
+    if not _AMOUNT_RE.match(amount_str):
         return None
     
-    try:
-        amount = Decimal(amount_str)
-        
-        # Check if positive
-        if amount <= 0:
-            return None
-        
-        # Check maximum value
-        if amount > Decimal('9999999999.99'):
-            return None
-        
-        return amount
-    except (InvalidOperation, ValueError):
-        return None
+    return _parse_amount(amount_str)
 
 
 def validate_description(description: str, max_length: int = 500) -> bool:
@@ -229,7 +283,7 @@ def validate_description(description: str, max_length: int = 500) -> bool:
         return False
     
     # Check for control characters (except newline and tab)
-    if any(ord(char) < 32 and char not in '\n\t' for char in description):
+    if not _CTRL_CHARS.isdisjoint(description):
         return False
     
     return True
@@ -259,7 +313,7 @@ def validate_family_name(name: str) -> bool:
         return False
     
     # Check for control characters
-    if any(ord(char) < 32 for char in name):
+    if not _ALL_CTRL_CHARS.isdisjoint(name):
         return False
     
     return True
@@ -284,7 +338,7 @@ def validate_invite_code(code: str) -> bool:
     code = code.strip().upper()
     
     # Check format
-    if not re.match(r'^[A-Z0-9]{8,16}$', code):
+    if not _INVITE_RE.match(code):
         return False
     
     return True
@@ -311,7 +365,7 @@ def sanitize_input(text: str, max_length: int = 1000) -> str:
     text = text[:max_length]
     
     # Remove control characters (except newline and tab)
-    text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\t')
+    text = text.translate(_CTRL_TABLE)
     
     return text
 
@@ -333,11 +387,6 @@ async def notify_expense_to_family(
         expense: Expense object with loaded user and category relationships
         family_members: List of tuples (User, FamilyMember) from get_family_members
     """
-    from bot.utils.formatters import format_amount
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
     try:
         # Get user who created the expense
         expense_user = expense.user
@@ -353,12 +402,11 @@ async def notify_expense_to_family(
         if expense.description:
             message += f"📝 <b>Описание:</b> {expense.description}\n"
         
-        # Import keyboard for navigation buttons
-        from bot.utils.keyboards import get_expense_notification_keyboard
         reply_markup = get_expense_notification_keyboard()
         
-        # Send notification to all family members except the one who created expense
+        # Notify all family members except the one who created expense
         # family_members is a list of tuples (User, FamilyMember)
+        recipients = []
         for user, family_member in family_members:
             # Skip the user who created the expense
             if user.id == expense.user_id:
@@ -367,31 +415,42 @@ async def notify_expense_to_family(
             # Check if user has notifications enabled
             if not user.expense_notifications_enabled:
                 logger.debug(
-                    f"User {user.id} has expense notifications disabled, skipping"
+                    "User %s has expense notifications disabled, skipping",
+                    user.id
                 )
                 continue
             
-            try:
-                await bot.send_message(
+            recipients.append(user)
+        
+        # Send concurrently; one failure must not cancel the other sends
+        results = await asyncio.gather(
+            *(
+                bot.send_message(
                     chat_id=user.telegram_id,
                     text=message,
                     parse_mode="HTML",
                     reply_markup=reply_markup
                 )
-                logger.info(
-                    f"Sent expense notification to user {user.id} "
-                    f"for expense {expense.id}"
-                )
-            except Exception as e:
-                # Log error but continue sending to other members
+                for user in recipients
+            ),
+            return_exceptions=True
+        )
+        
+        for user, result in zip(recipients, results):
+            if isinstance(result, BaseException):
                 # Common errors: user blocked bot, chat not found
                 logger.warning(
-                    f"Failed to send expense notification "
-                    f"to user {user.id}: {e}"
+                    "Failed to send expense notification to user %s: %s",
+                    user.id, result
+                )
+            else:
+                logger.info(
+                    "Sent expense notification to user %s for expense %s",
+                    user.id, expense.id
                 )
         
     except Exception as e:
-        logger.error(f"Error in notify_expense_to_family: {e}")
+        logger.error("Error in notify_expense_to_family: %s", e)
 
 
 async def notify_income_to_family(
@@ -411,11 +470,6 @@ async def notify_income_to_family(
         income: Income object with loaded user and category relationships
         family_members: List of tuples (User, FamilyMember) from get_family_members
     """
-    from bot.utils.formatters import format_amount
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
     try:
         # Get user who created the income
         income_user = income.user
@@ -431,12 +485,11 @@ async def notify_income_to_family(
         if income.description:
             message += f"📝 <b>Описание:</b> {income.description}\n"
         
-        # Import keyboard for navigation buttons
-        from bot.utils.keyboards import get_income_notification_keyboard
         reply_markup = get_income_notification_keyboard()
         
-        # Send notification to all family members except the one who created income
+        # Notify all family members except the one who created income
         # family_members is a list of tuples (User, FamilyMember)
+        recipients = []
         for user, family_member in family_members:
             # Skip the user who created the income
             if user.id == income.user_id:
@@ -445,29 +498,40 @@ async def notify_income_to_family(
             # Check if user has notifications enabled
             if not user.expense_notifications_enabled:
                 logger.debug(
-                    f"User {user.id} has operation notifications disabled, skipping"
+                    "User %s has operation notifications disabled, skipping",
+                    user.id
                 )
                 continue
             
-            try:
-                await bot.send_message(
+            recipients.append(user)
+        
+        # Send concurrently; one failure must not cancel the other sends
+        results = await asyncio.gather(
+            *(
+                bot.send_message(
                     chat_id=user.telegram_id,
                     text=message,
                     parse_mode="HTML",
                     reply_markup=reply_markup
                 )
-                logger.info(
-                    f"Sent income notification to user {user.id} "
-                    f"for income {income.id}"
-                )
-            except Exception as e:
-                # Log error but continue sending to other members
+                for user in recipients
+            ),
+            return_exceptions=True
+        )
+        
+        for user, result in zip(recipients, results):
+            if isinstance(result, BaseException):
                 # Common errors: user blocked bot, chat not found
                 logger.warning(
-                    f"Failed to send income notification "
-                    f"to user {user.id}: {e}"
+                    "Failed to send income notification to user %s: %s",
+                    user.id, result
+                )
+            else:
+                logger.info(
+                    "Sent income notification to user %s for income %s",
+                    user.id, income.id
                 )
         
     except Exception as e:
-        logger.error(f"Error in notify_income_to_family: {e}")
+        logger.error("Error in notify_income_to_family: %s", e)
 
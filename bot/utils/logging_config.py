@@ -1,13 +1,142 @@
 """Logging configuration for the Family Finance Bot."""
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
 from config.settings import settings
 
+# Writes to stdout and the log files happen on this listener's thread;
+# loggers in the event loop only enqueue records.
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+# Log files are written through a large buffer and flushed at most every
+# LOG_FLUSH_INTERVAL seconds (immediately for ERROR records), instead of
+# one write() per record
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 2.0
+_flush_stop: Optional[threading.Event] = None
+
+
+class _BufferedFileMixin:
+    """Buffer log file writes instead of flushing after every record."""
+    
+    _last_flush = 0.0
+    
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=LOG_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+    
+    def flush(self) -> None:
+        """Write out the buffer at most every LOG_FLUSH_INTERVAL seconds.
+        
+        StreamHandler.emit calls this after every record, so it is
+        throttled; any other caller, logging.shutdown included, gets a
+        no-op within the interval. Use force_flush() to write out now.
+        """
+        if time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL:
+            self.force_flush()
+    
+    def force_flush(self) -> None:
+        """Write out the buffer now."""
+        super().flush()
+        self._last_flush = time.monotonic()
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            self.force_flush()
+
+
+class BufferedRotatingFileHandler(_BufferedFileMixin, logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler with buffered writes."""
+
+
+class BufferedWatchedFileHandler(_BufferedFileMixin, logging.handlers.WatchedFileHandler):
+    """WatchedFileHandler with buffered writes."""
+
+
+def _start_flusher(handlers: list) -> threading.Event:
+    """
+    Periodically flush buffered file handlers from a daemon thread.
+    
+    Bounds how long records stay in the buffer when the bot is idle.
+    
+    Args:
+        handlers: Buffered file handlers
+        
+    Returns:
+        Event that stops the thread when set
+    """
+    stop = threading.Event()
+    
+    def run() -> None:
+        while not stop.wait(LOG_FLUSH_INTERVAL):
+            for handler in handlers:
+                handler.force_flush()
+    
+    threading.Thread(target=run, name="log-flusher", daemon=True).start()
+    return stop
+
+
+def stop_logging() -> None:
+    """Flush queued log records, stop the background log writer and close its handlers."""
+    global _queue_listener, _flush_stop
+    if _flush_stop is not None:
+        _flush_stop.set()
+        _flush_stop = None
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        # flush() is throttled, write out what the buffers still hold
+        for handler in _queue_listener.handlers:
+            if isinstance(handler, _BufferedFileMixin):
+                handler.force_flush()
+            handler.close()
+        _queue_listener = None
+
+
+def _create_file_handler(
+    filename: str,
+    max_bytes: int,
+    backup_count: int
+) -> logging.Handler:
+    """
+    Create a buffered log file handler.
+    
+    With LOG_EXTERNAL_ROTATION the file is rotated by logrotate and the
+    handler only reopens it after a move; otherwise the handler rotates
+    the file itself. The main and admin bots share the log files, so
+    external rotation avoids both processes renaming the same file.
+    
+    Args:
+        filename: Path to log file
+        max_bytes: Maximum size of log file before rotation
+        backup_count: Number of backup files to keep
+        
+    Returns:
+        Buffered file handler
+    """
+    if settings.LOG_EXTERNAL_ROTATION:
+        return BufferedWatchedFileHandler(filename, encoding='utf-8')
+    
+    return BufferedRotatingFileHandler(
+        filename=filename,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding='utf-8'
+    )
+
 
 def setup_logging(
     log_file: Optional[str] = None,
@@ -49,23 +178,13 @@ def setup_logging(
     console_handler.setFormatter(simple_formatter)
     
     # File handler with rotation
-    file_handler = logging.handlers.RotatingFileHandler(
-        filename=log_file,
-        maxBytes=max_bytes,
-        backupCount=backup_count,
-        encoding='utf-8'
-    )
+    file_handler = _create_file_handler(log_file, max_bytes, backup_count)
     file_handler.setLevel(log_level)
     file_handler.setFormatter(detailed_formatter)
     
     # Error file handler - only errors and above
     error_log_file = str(log_dir / "errors.log")
-    error_handler = logging.handlers.RotatingFileHandler(
-        filename=error_log_file,
-        maxBytes=max_bytes,
-        backupCount=backup_count,
-        encoding='utf-8'
-    )
+    error_handler = _create_file_handler(error_log_file, max_bytes, backup_count)
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
     
@@ -74,12 +193,23 @@ def setup_logging(
     root_logger.setLevel(log_level)
     
     # Remove existing handlers
+    stop_logging()
     root_logger.handlers.clear()
     
-    # Add handlers
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(error_handler)
+    # Handlers run behind a queue so file and console I/O never blocks
+    # the event loop; respect_handler_level keeps errors.log ERROR-only
+    global _queue_listener, _flush_stop
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
+    _flush_stop = _start_flusher([file_handler, error_handler])
     
     # Reduce verbosity of third-party libraries
     logging.getLogger("telegram").setLevel(logging.WARNING)
@@ -101,6 +231,9 @@ def setup_logging(
     logging.info("=" * 60)
 
 
+atexit.register(stop_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance.
@@ -128,9 +261,9 @@ def log_user_action(action_name: str):
             pass
     """
     def decorator(func):
+        logger = get_logger(func.__module__)
+        
         async def wrapper(*args, **kwargs):
-            logger = get_logger(func.__module__)
-            
             # Try to extract user info from args
             user_id = None
             try:
@@ -140,17 +273,17 @@ def log_user_action(action_name: str):
                 pass
             
             logger.info(
-                f"Action: {action_name} | User: {user_id or 'Unknown'} | "
-                f"Function: {func.__name__}"
+                "Action: %s | User: %s | Function: %s",
+                action_name, user_id or 'Unknown', func.__name__
             )
             
             try:
                 result = await func(*args, **kwargs)
-                logger.debug(f"Action {action_name} completed successfully")
+                logger.debug("Action %s completed successfully", action_name)
                 return result
             except Exception as e:
                 logger.error(
-                    f"Action {action_name} failed: {str(e)}",
+                    "Action %s failed: %s", action_name, e,
                     exc_info=True
                 )
                 raise
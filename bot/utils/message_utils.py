@@ -1,178 +1,234 @@
 """Utility functions for working with Telegram messages and updates."""
 
+import asyncio
 import logging
+import re
+from decimal import Decimal
+from functools import lru_cache
 from typing import Optional, Tuple
 
 from telegram import InlineKeyboardMarkup, Message, Update
+from telegram.error import BadRequest, TelegramError
 from telegram.ext import ContextTypes
 
+from bot.utils.helpers import _NOT_MODIFIED, get_user_id
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_AMOUNT = "999999999.99"
+_DEFAULT_MAX_AMOUNT = Decimal(DEFAULT_MAX_AMOUNT)
 
-class MessageHandler:
-    """Helper class for handling Telegram messages consistently."""
-
-    @staticmethod
-    async def send_or_edit(
-        update: Update,
-        text: str,
-        parse_mode: str = "HTML",
-        reply_markup: Optional[InlineKeyboardMarkup] = None
-    ) -> Optional[Message]:
-        """Send or edit message depending on update type.
-        
-        Args:
-            update: Telegram update object
-            text: Message text to send
-            parse_mode: Parse mode for the message
-            reply_markup: Optional keyboard markup
-            
-        Returns:
-            Sent or edited message, or None on error
-        """
-        try:
-            if update.callback_query:
-                await update.callback_query.answer()
-                return await update.callback_query.edit_message_text(
-                    text,
-                    parse_mode=parse_mode,
-                    reply_markup=reply_markup
-                )
-            elif update.message:
-                return await update.message.reply_text(
-                    text,
-                    parse_mode=parse_mode,
-                    reply_markup=reply_markup
-                )
-        except Exception as e:
-            logger.error(f"Error sending/editing message: {e}")
-            return None
-
-    @staticmethod
-    def is_callback_query(update: Update) -> bool:
-        """Check if update is a callback query.
-        
-        Args:
-            update: Telegram update object
-            
-        Returns:
-            True if update contains callback query
-        """
-        return update.callback_query is not None
-
-    @staticmethod
-    def get_message_text(update: Update) -> Optional[str]:
-        """Extract message text from update.
-        
-        Args:
-            update: Telegram update object
-            
-        Returns:
-            Message text or None
-        """
-        if update.message and update.message.text:
-            return update.message.text.strip()
-        return None
 
+# Amount with up to 2 decimal places, "." or "," as separator. Checked
+# before Decimal() so inputs like "NaN", "1e5" or "1_000" never reach it.
+_AMOUNT_RE = re.compile(r"^\s*-?\d+(?:[.,]\d{1,2})?\s*$")
 
-class UserDataExtractor:
-    """Helper class for extracting user data from Telegram updates."""
 
-    @staticmethod
-    def get_user_full_name(telegram_user) -> str:
-        """Build full name from Telegram user object.
-        
-        Args:
-            telegram_user: Telegram user object
-            
-        Returns:
-            Full name string or default User_ID format
-        """
-        name_parts = []
-        if telegram_user.first_name:
-            name_parts.append(telegram_user.first_name)
-        if telegram_user.last_name:
-            name_parts.append(telegram_user.last_name)
-        
-        return " ".join(name_parts) if name_parts else f"User_{telegram_user.id}"
+# Sends to one chat are serialized so they keep their order, while other
+# chats proceed concurrently. The API rate itself is paced by the
+# application's AIORateLimiter. chat_id -> lock.
+CHAT_LOCKS_SIZE = 10_000
+_chat_locks: dict[int, asyncio.Lock] = {}
 
-    @staticmethod
-    def get_user_info(update: Update) -> Tuple[Optional[int], Optional[str], Optional[str]]:
-        """Extract user information from update.
-        
-        Args:
-            update: Telegram update object
-            
-        Returns:
-            Tuple of (telegram_id, full_name, username)
-        """
-        if not update.effective_user:
-            return None, None, None
 
-        telegram_user = update.effective_user
-        telegram_id = telegram_user.id
-        full_name = UserDataExtractor.get_user_full_name(telegram_user)
-        username = telegram_user.username
+def _chat_lock(chat_id: int) -> asyncio.Lock:
+    """Get the lock serializing sends to a chat."""
+    lock = _chat_locks.get(chat_id)
+    if lock is None:
+        if len(_chat_locks) >= CHAT_LOCKS_SIZE:
+            # Drop idle locks only, busy ones still order their waiters
+            for key in [k for k, v in _chat_locks.items() if not v.locked()]:
+                del _chat_locks[key]
+        lock = _chat_locks[chat_id] = asyncio.Lock()
+    return lock
 
-        return telegram_id, full_name, username
 
+@lru_cache(maxsize=8)
+def _max_amount(max_value: str) -> Decimal:
+    """Parse a maximum amount once per distinct value."""
+    return Decimal(max_value)
 
-class ValidationHelper:
-    """Helper class for common validation tasks."""
 
-    @staticmethod
-    def validate_text_input(text: Optional[str], min_length: int, max_length: int) -> Tuple[bool, Optional[str]]:
-        """Validate text input length.
-        
-        Args:
-            text: Text to validate
-            min_length: Minimum allowed length
-            max_length: Maximum allowed length
-            
-        Returns:
-            Tuple of (is_valid, error_message)
-        """
-        if not text:
-            return False, "❌ Пожалуйста, введите текст."
-
-        text = text.strip()
-        
-        if len(text) < min_length:
-            return False, f"❌ Текст слишком короткий. Минимум {min_length} символов."
-        
-        if len(text) > max_length:
-            return False, f"❌ Текст слишком длинный. Максимум {max_length} символов."
+def _is_unchanged(
+    message,
+    text: str,
+    parse_mode: Optional[str],
+    reply_markup: Optional[InlineKeyboardMarkup]
+) -> bool:
+    """Check if editing a message would leave it as it is.
+    
+    Compares against the message attached to the callback query, i.e. what
+    the user currently sees, so no cache of sent texts is needed.
+    
+    Args:
+        message: Message the callback query came from (may be inaccessible)
+        text: New message text
+        parse_mode: Parse mode of the new text
+        reply_markup: New keyboard markup
         
-        return True, None
+    Returns:
+        True if both text and markup are unchanged
+    """
+    if not isinstance(message, Message) or message.reply_markup != reply_markup:
+        return False
+    current = message.text_html if parse_mode == "HTML" else message.text
+    return current == text
 
-    @staticmethod
-    def validate_amount(amount_str: str, max_value: str = "999999999.99") -> Tuple[bool, Optional[str], Optional[float]]:
-        """Validate amount input.
-        
-        Args:
-            amount_str: Amount string to validate
-            max_value: Maximum allowed value
-            
-        Returns:
-            Tuple of (is_valid, error_message, decimal_value)
-        """
-        from decimal import Decimal, InvalidOperation
-
-        try:
-            # Replace comma with dot for decimal separator
-            amount_str = amount_str.strip().replace(',', '.')
-            amount = Decimal(amount_str)
-            
-            if amount <= 0:
-                return False, "❌ Сумма должна быть положительной.", None
-            
-            if amount > Decimal(max_value):
-                return False, f"❌ Сумма слишком большая. Максимум {max_value}", None
-            
-            return True, None, amount
-            
-        except (InvalidOperation, ValueError):
-            return False, "❌ Неверный формат. Введите число (например: 5000 или 5000.50)", None
+
+async def send_or_edit(
+    update: Update,
+    text: str,
+    parse_mode: str = "HTML",
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+) -> Optional[Message]:
+    """Send or edit message depending on update type.
+    
+    Args:
+        update: Telegram update object
+        text: Message text to send
+        parse_mode: Parse mode for the message
+        reply_markup: Optional keyboard markup
+    
+    Returns:
+        Sent or edited message, or None on Telegram API error
+    """
+    chat = update.effective_chat
+    if chat is None:
+        return await _send_or_edit(update, text, parse_mode, reply_markup)
+    async with _chat_lock(chat.id):
+        return await _send_or_edit(update, text, parse_mode, reply_markup)
+
+
+async def _send_or_edit(
+    update: Update,
+    text: str,
+    parse_mode: str,
+    reply_markup: Optional[InlineKeyboardMarkup]
+) -> Optional[Message]:
+    """Send or edit message, see send_or_edit."""
+    try:
+        if update.callback_query:
+            await update.callback_query.answer()
+            if _is_unchanged(update.callback_query.message, text, parse_mode, reply_markup):
+                # Telegram would reject the edit with "Message is not modified"
+                return update.callback_query.message
+            return await update.callback_query.edit_message_text(
+                text,
+                parse_mode=parse_mode,
+                reply_markup=reply_markup
+            )
+        elif update.message:
+            return await update.message.reply_text(
+                text,
+                parse_mode=parse_mode,
+                reply_markup=reply_markup
+            )
+    except BadRequest as e:
+        if _NOT_MODIFIED in e.message:
+            # Same text sent twice, e.g. a double-tapped button
+            return update.callback_query.message
+        logger.error("Error sending/editing message: %s", e)
+        return None
+    except TelegramError as e:
+        logger.error("Error sending/editing message: %s", e)
+        return None
+
+
+def get_user_full_name(telegram_user) -> str:
+    """Build full name from Telegram user object.
+    
+    Args:
+        telegram_user: Telegram user object
+    
+    Returns:
+        Full name string or default User_ID format
+    """
+    first_name = telegram_user.first_name
+    last_name = telegram_user.last_name
+    
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    return first_name or last_name or f"User_{telegram_user.id}"
+
+
+def get_user_info(update: Update) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    """Extract user information from update.
+    
+    Args:
+        update: Telegram update object
+    
+    Returns:
+        Tuple of (telegram_id, full_name, username)
+    """
+    telegram_user = update.effective_user
+    if not telegram_user:
+        return None, None, None
+    
+    return (
+        telegram_user.id,
+        get_user_full_name(telegram_user),
+        telegram_user.username,
+    )
+
+
+def validate_text_input(
+    text: Optional[str],
+    min_length: int,
+    max_length: int
+) -> Tuple[bool, Optional[str]]:
+    """Validate text input length.
+    
+    Args:
+        text: Text to validate
+        min_length: Minimum allowed length
+        max_length: Maximum allowed length
+    
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not text:
+        return False, "❌ Пожалуйста, введите текст."
+    
+    # strip() only scans the whitespace at the ends and returns the same
+    # string when there is none, so it costs nothing for typical input
+    length = len(text.strip())
+    
+    if length < min_length:
+        return False, f"❌ Текст слишком короткий. Минимум {min_length} символов."
+    
+    if length > max_length:
+        return False, f"❌ Текст слишком длинный. Максимум {max_length} символов."
+    
+    return True, None
+
+
+def validate_amount(
+    amount_str: str,
+    max_value: str = DEFAULT_MAX_AMOUNT
+) -> Tuple[bool, Optional[str], Optional[float]]:
+    """Validate amount input.
+    
+    Args:
+        amount_str: Amount string to validate
+        max_value: Maximum allowed value
+    
+    Returns:
+        Tuple of (is_valid, error_message, decimal_value)
+    """
+    if not _AMOUNT_RE.match(amount_str):
+        return False, "❌ Неверный формат. Введите число (например: 5000 или 5000.50)", None
+    
+    # Replace comma with dot for decimal separator
+    amount = Decimal(amount_str.strip().replace(',', '.'))
+    
+    if amount <= 0:
+        return False, "❌ Сумма должна быть положительной.", None
+    
+    limit = _DEFAULT_MAX_AMOUNT if max_value == DEFAULT_MAX_AMOUNT else _max_amount(max_value)
+    if amount > limit:
+        return False, f"❌ Сумма слишком большая. Максимум {max_value}", None
+    
+    return True, None, amount
 
 
 async def get_user_from_context_or_db(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -187,7 +243,6 @@ async def get_user_from_context_or_db(update: Update, context: ContextTypes.DEFA
     Returns:
         User ID or None if not found
     """
-    from bot.utils.helpers import get_user_id
     return await get_user_id(update, context)
 
 
@@ -200,9 +255,31 @@ def format_families_list(families) -> str:
     Returns:
         Formatted string with family list
     """
-    if not families:
-        return ""
-    
-    family_lines = [f"• {family.name}" for family in families]
-    return "\n".join(family_lines)
+    return "\n".join(f"• {family.name}" for family in families) if families else ""
+
+
+# Backward-compatible namespaces for the functions above
+class MessageHandler:
+    """Helpers for handling Telegram messages consistently."""
+
+    __slots__ = ()
+
+    send_or_edit = staticmethod(send_or_edit)
+
+
+class UserDataExtractor:
+    """Helpers for extracting user data from Telegram updates."""
+
+    __slots__ = ()
+
+    get_user_full_name = staticmethod(get_user_full_name)
+    get_user_info = staticmethod(get_user_info)
+
+
+class ValidationHelper:
+    """Helpers for common validation tasks."""
+
+    __slots__ = ()
 
+    validate_text_input = staticmethod(validate_text_input)
+    validate_amount = staticmethod(validate_amount)
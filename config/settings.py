@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import List
+from typing import FrozenSet
 
 from dotenv import load_dotenv
 
@@ -24,17 +24,30 @@ class Settings:
         "DATABASE_URL", 
         f"sqlite:///{BASE_DIR}/family_finance.db"
     )
+    # Compiled SQL cache entries per engine (SQLAlchemy default is 500)
+    DB_QUERY_CACHE_SIZE: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+    # Connection pool (PostgreSQL only, SQLite keeps SQLAlchemy's defaults)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Seconds a handler waits for a free connection before failing
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # asyncpg prepared statements kept per connection
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "200"))
     
     # Application Settings
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Leave log rotation to an external tool (logrotate) and just reopen
+    # the files when they are moved
+    LOG_EXTERNAL_ROTATION: bool = os.getenv("LOG_EXTERNAL_ROTATION", "False").lower() == "true"
     
-    # Admin Configuration
-    ADMIN_USER_IDS: List[int] = [
+    # Admin Configuration (a frozenset for O(1) admin checks)
+    ADMIN_USER_IDS: FrozenSet[int] = frozenset(
         int(user_id.strip()) 
         for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") 
         if user_id.strip()
-    ]
+    )
     
     # Bot Settings
     MAX_RETRIES: int = 3
@@ -43,6 +56,11 @@ class Settings:
     def __init__(self):
         """Validate settings on initialization."""
         self.validate()
+        
+        # DATABASE_URL doesn't change after startup, so the backend
+        # checks are computed once
+        self.is_sqlite: bool = self.DATABASE_URL.startswith("sqlite")
+        self.is_postgresql: bool = self.DATABASE_URL.startswith("postgresql")
     
     def validate(self) -> None:
         """Validate required settings."""
@@ -55,16 +73,6 @@ class Settings:
             raise ValueError(
                 "DATABASE_URL is not set. Please check your .env file."
             )
-    
-    @property
-    def is_sqlite(self) -> bool:
-        """Check if the database is SQLite."""
-        return self.DATABASE_URL.startswith("sqlite")
-    
-    @property
-    def is_postgresql(self) -> bool:
-        """Check if the database is PostgreSQL."""
-        return self.DATABASE_URL.startswith("postgresql")
 
 
 # Create a global settings instance
@@ -2,9 +2,15 @@
 """
 Скрипт для создания анимированных GIF-изображений для Family Finance Bot.
 Создаёт красивую анимацию с финансовой тематикой в трёх разрешениях.
+
+Требует Pillow и NumPy, которых нет в requirements.txt бота:
+    pip install pillow numpy
 """
 
 import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import os
 
@@ -22,32 +28,34 @@ COLORS = {
     'chart_red': '#FF5252',     # Красный для графиков
 }
 
+# Число ступеней сжатия, по которым кэшируются спрайты монет
+SMALL_COIN_BUCKETS = 16
+LARGE_COIN_BUCKETS = 32
+
+# Частицы: базовые позиции (доли ширины/высоты) и размеры, фиксированный seed
+NUM_PARTICLES = 15
+_PARTICLE_BASE = np.random.default_rng(42).random((NUM_PARTICLES, 2))
+_PARTICLE_SIZES = np.random.default_rng(43).integers(1, 4, size=NUM_PARTICLES)
+
 def hex_to_rgb(hex_color):
     """Конвертация HEX в RGB"""
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
-def interpolate_color(color1, color2, factor):
-    """Интерполяция между двумя цветами"""
-    r1, g1, b1 = hex_to_rgb(color1)
-    r2, g2, b2 = hex_to_rgb(color2)
-    r = int(r1 + (r2 - r1) * factor)
-    g = int(g1 + (g2 - g1) * factor)
-    b = int(b1 + (b2 - b1) * factor)
-    return (r, g, b)
-
-def draw_gradient_background(draw, width, height):
+def draw_gradient_background(img, width, height):
     """Рисует градиентный фон"""
-    for y in range(height):
-        factor = y / height
-        color = interpolate_color(COLORS['bg_dark'], COLORS['bg_gradient'], factor)
-        draw.line([(0, y), (width, y)], fill=color)
+    # Цвета всех строк считаются одним векторным выражением NumPy
+    # вместо интерполяции и draw.line на каждую строку
+    factor = np.arange(height, dtype=np.float64)[:, np.newaxis] / height
+    color1 = np.array(hex_to_rgb(COLORS['bg_dark']), dtype=np.float64)
+    color2 = np.array(hex_to_rgb(COLORS['bg_gradient']), dtype=np.float64)
+    rows = (color1 + (color2 - color1) * factor).astype(np.uint8)
+    # Полоса шириной в 1 пиксель растягивается до полного кадра средствами PIL
+    strip = Image.fromarray(rows[:, np.newaxis, :])
+    img.paste(strip.resize((width, height), Image.NEAREST), (0, 0))
 
-def draw_coin(draw, x, y, radius, rotation, glow=False):
-    """Рисует анимированную монету с 3D эффектом"""
-    # Сжатие по горизонтали для 3D эффекта вращения
-    squeeze = abs(math.cos(rotation))
-    
+def draw_coin(draw, x, y, radius, squeeze, glow=False):
+    """Рисует монету с 3D эффектом (squeeze - сжатие по горизонтали при вращении)"""
     if squeeze < 0.1:
         squeeze = 0.1
     
@@ -109,6 +117,23 @@ def draw_coin(draw, x, y, radius, rotation, glow=False):
                    (cx + radius * 0.1 * squeeze, cy + radius * 0.15)],
                   fill=symbol_color, width=line_width)
 
+@lru_cache(maxsize=64)
+def _coin_sprite(radius, squeeze_bucket, buckets, glow):
+    """Рисует монету в отдельный RGBA-спрайт, кэшируемый по ступени сжатия"""
+    squeeze = squeeze_bucket / (buckets - 1)
+    half = radius + 3 * (radius // 5) + 1
+    sprite = Image.new('RGBA', (2 * half, 2 * half), (0, 0, 0, 0))
+    draw_coin(ImageDraw.Draw(sprite), half, half, radius, squeeze, glow)
+    return sprite
+
+def stamp_coin(img, x, y, radius, rotation, glow=False, buckets=SMALL_COIN_BUCKETS):
+    """Накладывает готовый спрайт вращающейся монеты вместо рисования примитивами"""
+    # Сжатие по горизонтали для 3D эффекта вращения
+    squeeze_bucket = round(abs(math.cos(rotation)) * (buckets - 1))
+    sprite = _coin_sprite(radius, squeeze_bucket, buckets, glow)
+    half = sprite.width // 2
+    img.paste(sprite, (round(x) - half, round(y) - half), sprite)
+
 def draw_chart(draw, x, y, width, height, frame, total_frames):
     """Рисует анимированный график"""
     # Фон графика
@@ -126,18 +151,17 @@ def draw_chart(draw, x, y, width, height, frame, total_frames):
         draw.line([(x + 5, gy), (x + width - 5, gy)], fill=grid_color, width=1)
     
     # Данные графика (волнистая линия)
-    points = []
     num_points = 8
     progress = frame / total_frames
     
-    for i in range(num_points + 1):
-        px = x + 10 + (width - 20) * i / num_points
-        # Анимированная синусоида + тренд вверх
-        wave = math.sin((i / num_points + progress) * 2 * math.pi) * 0.2
-        trend = (i / num_points) * 0.4
-        value = 0.3 + trend + wave
-        py = y + height - (height * 0.1) - (height * 0.8 * value)
-        points.append((px, py))
+    t = np.arange(num_points + 1) / num_points
+    px = x + 10 + (width - 20) * t
+    # Анимированная синусоида + тренд вверх
+    wave = np.sin((t + progress) * 2 * np.pi) * 0.2
+    trend = t * 0.4
+    value = 0.3 + trend + wave
+    py = y + height - (height * 0.1) - (height * 0.8 * value)
+    points = list(zip(px.tolist(), py.tolist()))
     
     # Заливка под графиком
     fill_points = points.copy()
@@ -226,9 +250,14 @@ def draw_wallet_icon(draw, x, y, size, open_factor):
         fill=hex_to_rgb(COLORS['accent'])
     )
 
-def draw_text_logo(draw, x, y, width, height, alpha):
-    """Рисует текстовый логотип"""
-    # Основной текст
+@lru_cache(maxsize=8)
+def _text_sprites(height):
+    """Растеризует надписи логотипа один раз на разрешение.
+    
+    Возвращает список (маска покрытия, цвет, смещение относительно точки
+    привязки). Кадры отличаются только прозрачностью, поэтому шрифт и
+    глифы в цикле по кадрам больше не нужны.
+    """
     text_main = "💰 Family Finance"
     text_sub = "Bot"
     
@@ -242,64 +271,70 @@ def draw_text_logo(draw, x, y, width, height, alpha):
         font_sub = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", sub_size)
     except:
         try:
-            font_main = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", main_size)
-            font_sub = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", sub_size)
+            font_main = ImageFont.truetype(
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", main_size
+            )
+            font_sub = ImageFont.truetype(
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", sub_size
+            )
         except:
             font_main = ImageFont.load_default()
             font_sub = ImageFont.load_default()
     
-    # Цвета текста с альфа-каналом
-    text_color = (*hex_to_rgb(COLORS['text']), int(255 * alpha))
-    accent_color = (*hex_to_rgb(COLORS['primary']), int(255 * alpha))
-    
-    # Основной текст
-    bbox = draw.textbbox((0, 0), text_main, font=font_main)
-    text_width = bbox[2] - bbox[0]
-    draw.text((x - text_width // 2, y), text_main, font=font_main, fill=text_color)
-    
-    # Подзаголовок
-    bbox_sub = draw.textbbox((0, 0), text_sub, font=font_sub)
-    sub_width = bbox_sub[2] - bbox_sub[0]
-    draw.text((x - sub_width // 2, y + main_size + 5), text_sub, font=font_sub, fill=accent_color)
+    sprites = []
+    for text, font, color, dy in (
+        (text_main, font_main, COLORS['text'], 0),
+        (text_sub, font_sub, COLORS['primary'], main_size + 5),
+    ):
+        left, top, right, bottom = font.getbbox(text)
+        mask = Image.new('L', (right - left, bottom - top), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+        # Текст центрируется по ширине, как раньше через textbbox
+        offset = (left - (right - left) // 2, top + dy)
+        sprites.append((mask, hex_to_rgb(color), offset))
+    return sprites
+
+def draw_text_logo(img, x, y, height, alpha):
+    """Рисует текстовый логотип"""
+    # Таблица масштабирования маски под прозрачность кадра
+    lut = [int(v * alpha) for v in range(256)]
+    for mask, color, (dx, dy) in _text_sprites(height):
+        left, top = x + dx, y + dy
+        img.paste(color, (left, top, left + mask.width, top + mask.height), mask.point(lut))
 
 def draw_particles(draw, width, height, frame, total_frames):
     """Рисует летающие частицы (блики, звёздочки)"""
-    import random
-    random.seed(42)  # Фиксированный seed для воспроизводимости
-    
-    num_particles = 15
-    for i in range(num_particles):
-        # Базовая позиция
-        base_x = random.random() * width
-        base_y = random.random() * height
-        
-        # Анимация позиции
-        progress = (frame / total_frames + i / num_particles) % 1.0
-        px = base_x + math.sin(progress * 2 * math.pi + i) * 20
-        py = base_y - progress * height * 0.3  # Движение вверх
-        py = py % height
-        
-        # Размер и прозрачность
-        size = random.randint(1, 3)
-        alpha = int(100 + 100 * math.sin(progress * 2 * math.pi))
-        
-        particle_color = (*hex_to_rgb(COLORS['primary']), alpha)
+    base_x = _PARTICLE_BASE[:, 0] * width
+    base_y = _PARTICLE_BASE[:, 1] * height
+    
+    # Анимация позиции и прозрачности - векторно для всех частиц сразу
+    index = np.arange(NUM_PARTICLES)
+    progress = (frame / total_frames + index / NUM_PARTICLES) % 1.0
+    phase = progress * 2 * np.pi
+    px = base_x + np.sin(phase + index) * 20
+    py = (base_y - progress * height * 0.3) % height  # Движение вверх
+    alphas = (100 + 100 * np.sin(phase)).astype(np.int64)
+    
+    primary = hex_to_rgb(COLORS['primary'])
+    particles = zip(px.tolist(), py.tolist(), _PARTICLE_SIZES.tolist(), alphas.tolist())
+    for x, y, size, alpha in particles:
         draw.ellipse(
-            [px - size, py - size, px + size, py + size],
-            fill=particle_color
+            [x - size, y - size, x + size, y + size],
+            fill=(*primary, alpha)
         )
 
 def create_frame(width, height, frame_num, total_frames):
     """Создаёт один кадр анимации"""
-    # RGBA для поддержки прозрачности
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 255))
+    # Фон полностью непрозрачный, поэтому рисуем сразу в RGB:
+    # режим 'RGBA' у ImageDraw смешивает полупрозрачные заливки с фоном
+    img = Image.new('RGB', (width, height), hex_to_rgb(COLORS['bg_dark']))
     draw = ImageDraw.Draw(img, 'RGBA')
     
     # Прогресс анимации (0.0 - 1.0)
     progress = frame_num / total_frames
     
     # Фон с градиентом
-    draw_gradient_background(draw, width, height)
+    draw_gradient_background(img, width, height)
     
     # Частицы на заднем плане
     draw_particles(draw, width, height, frame_num, total_frames)
@@ -313,12 +348,14 @@ def create_frame(width, height, frame_num, total_frames):
     # Левая монета
     coin1_x = cx - width * 0.32
     coin1_y = cy + math.sin(progress * 2 * math.pi) * 10
-    draw_coin(draw, coin1_x, coin1_y, coin_radius, progress * 2 * math.pi, glow=True)
+    stamp_coin(img, coin1_x, coin1_y, coin_radius, progress * 2 * math.pi,
+               glow=True, buckets=LARGE_COIN_BUCKETS)
     
     # Правая монета (с задержкой)
     coin2_x = cx + width * 0.32
     coin2_y = cy + math.sin((progress + 0.5) * 2 * math.pi) * 10
-    draw_coin(draw, coin2_x, coin2_y, coin_radius, (progress + 0.5) * 2 * math.pi, glow=True)
+    stamp_coin(img, coin2_x, coin2_y, coin_radius, (progress + 0.5) * 2 * math.pi,
+               glow=True, buckets=LARGE_COIN_BUCKETS)
     
     # Маленькие монетки
     small_coin_radius = int(coin_radius * 0.5)
@@ -330,7 +367,7 @@ def create_frame(width, height, frame_num, total_frames):
     ]):
         scx = cx + width * offset_x
         scy = cy + height * offset_y + math.sin((progress + phase) * 2 * math.pi) * 5
-        draw_coin(draw, scx, scy, small_coin_radius, (progress + phase) * 2 * math.pi)
+        stamp_coin(img, scx, scy, small_coin_radius, (progress + phase) * 2 * math.pi)
     
     # График в центре
     chart_width = int(width * 0.35)
@@ -347,26 +384,32 @@ def create_frame(width, height, frame_num, total_frames):
     # Текст логотипа внизу
     text_y = cy + int(height * 0.28)
     text_alpha = 0.7 + 0.3 * math.sin(progress * 2 * math.pi)
-    draw_text_logo(draw, cx, text_y, width, height, text_alpha)
-    
-    # Конвертируем в RGB для GIF
-    rgb_img = Image.new('RGB', (width, height), hex_to_rgb(COLORS['bg_dark']))
-    rgb_img.paste(img, mask=img.split()[3])
+    draw_text_logo(img, cx, text_y, height, text_alpha)
     
-    return rgb_img
+    return img
 
 def create_animated_gif(width, height, filename, num_frames=30, duration=100):
     """Создаёт анимированный GIF"""
     print(f"Создание {filename} ({width}x{height})...")
     
+    # Кадры независимы друг от друга - рендерим их параллельно на всех ядрах
+    render = partial(create_frame, width, height, total_frames=num_frames)
     frames = []
-    for i in range(num_frames):
-        print(f"  Кадр {i+1}/{num_frames}", end='\r')
-        frame = create_frame(width, height, i, num_frames)
-        frames.append(frame)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for i, frame in enumerate(executor.map(render, range(num_frames), chunksize=2)):
+            print(f"  Кадр {i+1}/{num_frames}", end='\r')
+            frames.append(frame)
     
     print(f"  Сохранение...")
     
+    # Палитра подбирается один раз по первому кадру и переиспользуется
+    # остальными кадрами, вместо отдельного квантования каждого кадра при сохранении
+    palette_frame = frames[0].quantize(colors=128, method=Image.MEDIANCUT, dither=Image.NONE)
+    frames = [palette_frame] + [
+        frame.quantize(palette=palette_frame, dither=Image.NONE)
+        for frame in frames[1:]
+    ]
+    
     # Сохраняем GIF
     frames[0].save(
         filename,
@@ -382,9 +425,8 @@ def create_animated_gif(width, height, filename, num_frames=30, duration=100):
 
 def main():
     """Главная функция"""
-    print("=" * 50)
-    print("🎬 Создание GIF-анимаций для Family Finance Bot")
-    print("=" * 50)
+    rule = "=" * 50
+    print(f"{rule}\n🎬 Создание GIF-анимаций для Family Finance Bot\n{rule}")
     
     # Создаём папку для изображений
     output_dir = "assets"
@@ -401,10 +443,10 @@ def main():
         filepath = os.path.join(output_dir, filename)
         create_animated_gif(width, height, filepath, num_frames=24, duration=80)
     
-    print("\n" + "=" * 50)
-    print("✨ Все GIF-файлы успешно созданы!")
-    print(f"📁 Расположение: {os.path.abspath(output_dir)}/")
-    print("=" * 50)
+    print(
+        f"\n{rule}\n✨ Все GIF-файлы успешно созданы!\n"
+        f"📁 Расположение: {os.path.abspath(output_dir)}/\n{rule}"
+    )
 
 if __name__ == "__main__":
     main()
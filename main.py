@@ -6,7 +6,11 @@ This module starts the Telegram bot and handles graceful shutdown.
 import asyncio
 import signal
 import sys
-from typing import Optional
+
+try:
+    import uvloop
+except ImportError:  # optional, not available on Windows
+    uvloop = None
 
 from bot import FamilyFinanceBot
 from bot.utils.logging_config import setup_logging, get_logger
@@ -20,6 +24,8 @@ logger = get_logger(__name__)
 class BotRunner:
     """Manages the bot lifecycle with proper startup and shutdown."""
 
+    __slots__ = ("bot", "shutdown_event")
+
     def __init__(self) -> None:
         """Initialize the bot runner."""
         self.bot: FamilyFinanceBot = FamilyFinanceBot()
@@ -27,7 +33,7 @@ class BotRunner:
     
     def handle_shutdown(self, signum: int, frame) -> None:
         """Handle shutdown signals (SIGINT, SIGTERM)."""
-        logger.info(f"Received signal {signum}, initiating shutdown...")
+        logger.info("Received signal %s, initiating shutdown...", signum)
         self.shutdown_event.set()
     
     async def run(self) -> None:
@@ -35,11 +41,9 @@ class BotRunner:
         try:
             # Setup signal handlers for graceful shutdown
             loop = asyncio.get_running_loop()
+            # (the handler sets the event directly, no task is scheduled)
             for sig in (signal.SIGINT, signal.SIGTERM):
-                loop.add_signal_handler(
-                    sig,
-                    lambda s=sig: asyncio.create_task(self.shutdown(s))
-                )
+                loop.add_signal_handler(sig, self.handle_shutdown, sig, None)
             
             # Start the bot
             await self.bot.start()
@@ -48,27 +52,22 @@ class BotRunner:
             await self.shutdown_event.wait()
             
         except Exception as e:
-            logger.error(f"Error running bot: {e}", exc_info=True)
+            logger.error("Error running bot: %s", e, exc_info=True)
             raise
         finally:
             await self.bot.stop()
-    
-    async def shutdown(self, sig: Optional[int] = None) -> None:
-        """Perform graceful shutdown."""
-        if sig:
-            logger.info(f"Received exit signal {sig}...")
-        self.shutdown_event.set()
 
 
 async def main() -> None:
     """Main async function to run the bot."""
-    logger.info("=" * 50)
-    logger.info("Family Finance Bot Starting")
-    logger.info("=" * 50)
-    logger.info(f"Debug mode: {settings.DEBUG}")
-    logger.info(f"Log level: {settings.LOG_LEVEL}")
-    logger.info(f"Database: {settings.DATABASE_URL}")
-    logger.info("=" * 50)
+    # One multi-line record instead of a record per banner line
+    separator = "=" * 50
+    logger.info(
+        "\n%s\nFamily Finance Bot Starting\n%s\n"
+        "Debug mode: %s\nLog level: %s\nDatabase: %s\n%s",
+        separator, separator,
+        settings.DEBUG, settings.LOG_LEVEL, settings.DATABASE_URL, separator
+    )
     
     runner = BotRunner()
     
@@ -77,7 +76,7 @@ async def main() -> None:
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
     finally:
         logger.info("Bot shutdown complete")
@@ -85,7 +84,15 @@ async def main() -> None:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None and sys.version_info >= (3, 11):
+            # Run on libuv's event loop when uvloop is installed
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as loop_runner:
+                loop_runner.run(main())
+        else:
+            if uvloop is not None:
+                # asyncio.Runner appeared in 3.11, set the policy instead
+                uvloop.install()
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
         sys.exit(0)
@@ -1,13 +1,15 @@
 """Pytest configuration and fixtures."""
 
 import asyncio
+from types import SimpleNamespace
 from typing import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import pytest_asyncio
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from bot.database.models import Base, User, Family, FamilyMember, Category, Expense
 from bot.database import init_database
@@ -23,23 +25,52 @@ def event_loop() -> Generator:
     loop.close()
 
 
-@pytest.fixture
-def mock_settings(monkeypatch):
-    """Mock settings for testing."""
-    monkeypatch.setenv("BOT_TOKEN", "test_token_123456789:ABCdefGHIjklMNOpqrsTUVwxyz")
-    monkeypatch.setenv("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
-    monkeypatch.setenv("DEBUG", "True")
-    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+@pytest.fixture(autouse=True)
+def clear_crud_caches():
+    """Reset module-level caches between tests (each has its own DB)."""
+    from bot.database import crud
+    from bot.utils import helpers
+    
+    crud._invalid_invite_codes.clear()
+    crud.invalidate_summary_cache()
+    helpers._user_id_cache.clear()
+    yield
 
 
-@pytest_asyncio.fixture
-async def test_engine(mock_settings) -> AsyncGenerator[AsyncEngine, None]:
-    """Create a test database engine with in-memory SQLite."""
+@pytest.fixture(scope="session")
+def mock_settings():
+    """Mock settings for testing (set once for the whole session)."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("BOT_TOKEN", "test_token_123456789:ABCdefGHIjklMNOpqrsTUVwxyz")
+        monkeypatch.setenv("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+        monkeypatch.setenv("DEBUG", "True")
+        monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+        yield
+
+
+@pytest_asyncio.fixture(scope="session")
+async def test_engine() -> AsyncGenerator[AsyncEngine, None]:
+    """Create one in-memory SQLite engine and schema for the test session."""
+    # Named shared-cache database: every pooled connection sees the same
+    # schema, so the engine can use a real pool instead of one static
+    # connection. It lives while the pool holds a connection open.
     engine = create_async_engine(
-        "sqlite+aiosqlite:///:memory:",
+        "sqlite+aiosqlite:///file:testdb?mode=memory&cache=shared&uri=true",
         echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
     )
     
+    # Let SQLAlchemy emit BEGIN itself: the sqlite3 driver's implicit
+    # transactions don't work with the per-test SAVEPOINTs below
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     # Create all tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -52,17 +83,27 @@ async def test_engine(mock_settings) -> AsyncGenerator[AsyncEngine, None]:
 
 @pytest_asyncio.fixture
 async def test_session(test_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
-    async_session = sessionmaker(
-        test_engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
+    """Create a test database session inside a transaction rolled back after the test.
     
-    async with async_session() as session:
-        yield session
-        await session.rollback()
-
+    Commits in the test only release a SAVEPOINT, so every test starts
+    from the empty schema without recreating it.
+    """
+    async with test_engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+# Data fixtures only flush: rows get their IDs and Python-side defaults
+# without a commit and refresh round-trip each
 
 @pytest_asyncio.fixture
 async def test_user(test_session: AsyncSession) -> User:
@@ -73,8 +114,7 @@ async def test_user(test_session: AsyncSession) -> User:
         username="testuser"
     )
     test_session.add(user)
-    await test_session.commit()
-    await test_session.refresh(user)
+    await test_session.flush()
     return user
 
 
@@ -86,8 +126,7 @@ async def test_family(test_session: AsyncSession) -> Family:
         invite_code="TESTCODE"
     )
     test_session.add(family)
-    await test_session.commit()
-    await test_session.refresh(family)
+    await test_session.flush()
     return family
 
 
@@ -100,8 +139,7 @@ async def test_category(test_session: AsyncSession) -> Category:
         is_default=True
     )
     test_session.add(category)
-    await test_session.commit()
-    await test_session.refresh(category)
+    await test_session.flush()
     return category
 
 
@@ -120,8 +158,7 @@ async def test_family_member(
         role=RoleEnum.ADMIN
     )
     test_session.add(member)
-    await test_session.commit()
-    await test_session.refresh(member)
+    await test_session.flush()
     return member
 
 
@@ -143,11 +180,45 @@ async def test_expense(
         description="Test expense"
     )
     test_session.add(expense)
-    await test_session.commit()
-    await test_session.refresh(expense)
+    await test_session.flush()
     return expense
 
 
+@pytest.fixture
+def make_update():
+    """Factory for lightweight Telegram Update stand-ins.
+    
+    Plain namespaces are much cheaper to build than MagicMock(spec=Update),
+    which introspects the whole Telegram class on every test.
+    """
+    def _make_update(
+        telegram_id: int = 123456789,
+        text: str = None,
+        first_name: str = "Test",
+        last_name: str = "User",
+        username: str = "testuser"
+    ) -> SimpleNamespace:
+        user = SimpleNamespace(
+            id=telegram_id,
+            first_name=first_name,
+            last_name=last_name,
+            full_name=f"{first_name} {last_name}",
+            username=username,
+            is_bot=False
+        )
+        message = SimpleNamespace(text=text, reply_text=AsyncMock())
+        return SimpleNamespace(
+            update_id=1,
+            effective_user=user,
+            effective_chat=SimpleNamespace(id=telegram_id, type="private"),
+            effective_message=message,
+            message=message,
+            callback_query=None
+        )
+    
+    return _make_update
+
+
 @pytest.fixture
 def mock_telegram_update():
     """Create a mock Telegram Update object."""
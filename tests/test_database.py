@@ -2,11 +2,14 @@
 
 import pytest
 from decimal import Decimal
-from datetime import datetime
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from sqlalchemy import event, select
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.database.models import User, Family, FamilyMember, Category, Expense, RoleEnum, generate_invite_code
+from bot.database.models import (
+    User, Family, FamilyMember, Category, CategoryTypeEnum, Expense, RoleEnum, generate_invite_code
+)
 from bot.database import crud
 
 
@@ -50,10 +53,7 @@ class TestModels:
     @pytest.mark.asyncio
     async def test_invite_code_uniqueness(self, test_session: AsyncSession):
         """Test that invite codes are unique."""
-        codes = set()
-        for i in range(100):
-            code = generate_invite_code()
-            codes.add(code)
+        codes = {generate_invite_code() for _ in range(100)}
         
         # All codes should be unique
         assert len(codes) == 100
@@ -167,6 +167,34 @@ class TestCRUD:
         user = await crud.get_user_by_telegram_id(test_session, 999999999)
         assert user is None
     
+    @pytest.mark.asyncio
+    async def test_get_user_by_id(self, test_session: AsyncSession, test_user: User):
+        """Test getting user by internal ID."""
+        assert await crud.get_user_by_id(test_session, test_user.id) is test_user
+        assert await crud.get_user_by_id(test_session, test_user.id + 1000) is None
+    
+    @pytest.mark.asyncio
+    async def test_mark_monthly_summaries_sent(self, test_session: AsyncSession, test_user: User):
+        """Test recording sent monthly summaries in one update."""
+        sent_at = datetime(2026, 10, 1, 9, 0)
+        await crud.mark_monthly_summaries_sent(test_session, [test_user.id], sent_at)
+        
+        result = await test_session.execute(
+            select(User.last_monthly_summary_sent).where(User.id == test_user.id)
+        )
+        assert result.scalar_one() == sent_at
+    
+    @pytest.mark.asyncio
+    async def test_get_user_id_map(self, test_session: AsyncSession, test_user: User):
+        """Test the telegram_id -> user_id map, newest users first."""
+        newer = await crud.create_user(test_session, telegram_id=555666777, name="Newer")
+        await test_session.commit()
+        
+        user_ids = await crud.get_user_id_map(test_session)
+        assert user_ids == {test_user.telegram_id: test_user.id, 555666777: newer.id}
+        
+        assert await crud.get_user_id_map(test_session, limit=1) == {555666777: newer.id}
+    
     @pytest.mark.asyncio
     async def test_create_user(self, test_session: AsyncSession):
         """Test creating a new user."""
@@ -182,6 +210,43 @@ class TestCRUD:
         assert user.name == "Created User"
         assert user.username == "createduser"
     
+    @pytest.mark.asyncio
+    async def test_get_or_create_user(self, test_session: AsyncSession, test_user: User):
+        """Test upserting a new and an existing user."""
+        user, is_new = await crud.get_or_create_user(
+            test_session,
+            telegram_id=444555666,
+            name="Upserted User"
+        )
+        assert is_new is True
+        assert user.id is not None
+        assert user.currency == "₽"
+        
+        statements = []
+        engine = test_session.bind.sync_engine
+        
+        def count(*args):
+            # The per-test SAVEPOINT stands in for the driver's implicit BEGIN
+            if not args[2].startswith("SAVEPOINT"):
+                statements.append(args[2])
+        
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            existing, is_new = await crud.get_or_create_user(
+                test_session,
+                telegram_id=test_user.telegram_id,
+                name="Renamed In Telegram"
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        
+        # A returning user is only read, never written
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("SELECT")
+        assert is_new is False
+        assert existing.id == test_user.id
+        assert existing.name == test_user.name
+    
     @pytest.mark.asyncio
     async def test_create_family(self, test_session: AsyncSession):
         """Test creating a family."""
@@ -204,6 +269,46 @@ class TestCRUD:
         assert family.id == test_family.id
         assert family.name == test_family.name
     
+    @pytest.mark.asyncio
+    async def test_invalid_invite_code_cache(
+        self,
+        test_session: AsyncSession,
+        test_family: Family,
+        monkeypatch
+    ):
+        """Test that a cached miss is dropped once a family takes the code."""
+        assert await crud.get_family_by_invite_code(test_session, "NEWCODE0") is None
+        assert "NEWCODE0" in crud._invalid_invite_codes
+        
+        monkeypatch.setattr("bot.database.crud.generate_invite_code", lambda: "NEWCODE0")
+        await crud.regenerate_invite_code(test_session, test_family.id)
+        
+        family = await crud.get_family_by_invite_code(test_session, "NEWCODE0")
+        assert family is not None
+        assert family.id == test_family.id
+    
+    @pytest.mark.asyncio
+    async def test_regenerate_invite_code_retries_on_collision(
+        self,
+        test_session: AsyncSession,
+        test_family: Family,
+        monkeypatch
+    ):
+        """Test that a colliding invite code is replaced by a fresh one."""
+        other = Family(name="Other Family", invite_code="TAKEN000")
+        test_session.add(other)
+        await test_session.commit()
+        
+        codes = iter(["TAKEN000", "FRESH000"])
+        monkeypatch.setattr("bot.database.crud.generate_invite_code", lambda: next(codes))
+        
+        new_code = await crud.regenerate_invite_code(test_session, test_family.id)
+        await test_session.commit()
+        
+        assert new_code == "FRESH000"
+        assert test_family.invite_code == "FRESH000"
+        assert other.invite_code == "TAKEN000"
+    
     @pytest.mark.asyncio
     async def test_add_family_member(
         self,
@@ -236,7 +341,86 @@ class TestCRUD:
         
         assert len(families) > 0
         assert any(f.id == test_family_member.family_id for f in families)
+
+    @pytest.mark.asyncio
+    async def test_membership_checks(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_family_member: FamilyMember
+    ):
+        """Test membership and admin checks for members and outsiders."""
+        assert await crud.is_user_in_family(test_session, test_user.id, test_family.id)
+        assert await crud.is_family_admin(test_session, test_user.id, test_family.id)
+        
+        assert not await crud.is_user_in_family(test_session, test_user.id + 1, test_family.id)
+        assert not await crud.is_family_admin(test_session, test_user.id + 1, test_family.id)
+    
+    @pytest.mark.asyncio
+    async def test_get_family_members_primes_role_cache(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_family_member: FamilyMember
+    ):
+        """Test that loading members answers later admin checks."""
+        members = await crud.get_family_members(test_session, test_family.id)
+        
+        assert len(members) == 1
+        roles = test_session.info["family_member_roles"]
+        assert roles[(test_user.id, test_family.id)] == RoleEnum.ADMIN
+    
+    @pytest.mark.asyncio
+    async def test_member_role_cached_per_session(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family
+    ):
+        """Test that the role cache follows membership changes."""
+        assert not await crud.is_user_in_family(test_session, test_user.id, test_family.id)
+        
+        await crud.add_family_member(test_session, test_user.id, test_family.id, role="admin")
+        assert await crud.is_family_admin(test_session, test_user.id, test_family.id)
+        
+        assert await crud.remove_family_member(test_session, test_user.id, test_family.id)
+        assert not await crud.is_user_in_family(test_session, test_user.id, test_family.id)
+        assert await crud.get_family_member(test_session, test_user.id, test_family.id) is None
+        assert not await crud.remove_family_member(test_session, test_user.id, test_family.id)
     
+    @pytest.mark.asyncio
+    async def test_get_user_families_with_members(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family_member: FamilyMember
+    ):
+        """Test preloading family members together with the families."""
+        families = await crud.get_user_families(test_session, test_user.id, with_members=True)
+        
+        assert len(families) == 1
+        assert [m.user.id for m in families[0].members] == [test_user.id]
+    
+    @pytest.mark.asyncio
+    async def test_get_users_with_monthly_summary(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family_member: FamilyMember
+    ):
+        """Test that summary recipients come with their families preloaded."""
+        test_user.monthly_summary_enabled = True
+        await test_session.commit()
+
+        users = await crud.get_users_with_monthly_summary(test_session)
+
+        assert [u.id for u in users] == [test_user.id]
+        # Relationships are already loaded, no lazy IO needed
+        families = [m.family for m in users[0].family_memberships]
+        assert [f.id for f in families] == [test_family_member.family_id]
+
     @pytest.mark.asyncio
     async def test_create_expense(
         self,
@@ -262,6 +446,31 @@ class TestCRUD:
         assert expense.amount == Decimal("99.99")
         assert expense.description == "Test expense"
     
+    @pytest.mark.asyncio
+    async def test_bulk_create_expenses(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category
+    ):
+        """Test creating several expenses in one INSERT."""
+        base = {
+            'user_id': test_user.id,
+            'family_id': test_family.id,
+            'category_id': test_category.id,
+        }
+        expenses = await crud.bulk_create_expenses(test_session, [
+            {**base, 'amount': Decimal("10"), 'description': "First"},
+            {**base, 'amount': Decimal("2.50"), 'description': None},
+            {**base, 'amount': Decimal("7.25"), 'description': "Third"},
+        ])
+        
+        assert [e.amount for e in expenses] == [Decimal("10"), Decimal("2.50"), Decimal("7.25")]
+        assert [e.description for e in expenses] == ["First", None, "Third"]
+        assert all(e.id is not None and e.date is not None for e in expenses)
+        assert await crud.bulk_create_expenses(test_session, []) == []
+    
     @pytest.mark.asyncio
     async def test_get_family_expenses(
         self,
@@ -278,6 +487,576 @@ class TestCRUD:
         
         assert len(expenses) > 0
         assert any(e.id == test_expense.id for e in expenses)
+        assert len(await crud.get_family_expenses(test_session, test_family.id)) == len(expenses)
+        
+        test_session.expunge_all()
+        expense = (await crud.get_family_expenses(test_session, test_family.id))[0]
+        with pytest.raises(InvalidRequestError):
+            expense.category
+    
+    @pytest.mark.asyncio
+    async def test_get_family_expenses_with_users(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test expense lists load only what the list views render."""
+        test_session.expunge_all()
+        
+        expenses = await crud.get_family_expenses_with_users(test_session, test_family.id)
+        
+        expense = expenses[0]
+        assert expense.id == test_expense.id
+        assert expense.amount == Decimal("100.50")
+        assert expense.user.name == test_user.name
+        assert (expense.category.icon, expense.category.name) == (
+            test_category.icon, test_category.name
+        )
+        with pytest.raises(InvalidRequestError):
+            expense.family
+    
+    @pytest.mark.asyncio
+    async def test_get_family_expenses_grouped(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test grouping by user and by category, one statement each."""
+        test_session.expunge_all()
+        statements = []
+        engine = test_session.bind.sync_engine
+        
+        def count(*args):
+            # The per-test SAVEPOINT stands in for the driver's implicit BEGIN
+            if not args[2].startswith("SAVEPOINT"):
+                statements.append(args[2])
+        
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            by_user = await crud.get_family_expenses_by_user(test_session, test_family.id)
+            by_category = await crud.get_family_expenses_by_category(test_session, test_family.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        
+        assert len(statements) == 2
+        assert by_user[test_user.id]['name'] == test_user.name
+        assert by_user[test_user.id]['amount'] == Decimal("100.50")
+        assert by_user[test_user.id]['expenses'][0].category.name == test_category.name
+        assert by_category[test_category.id]['icon'] == test_category.icon
+        assert by_category[test_category.id]['expenses'][0].user.name == test_user.name
+    
+    @pytest.mark.asyncio
+    async def test_get_family_expenses_detailed_report(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test detailed report groups expenses under their categories."""
+        other = Category(name="Other Category", icon="📦", is_default=True)
+        test_session.add(other)
+        await test_session.commit()
+        for amount in ("20.00", "30.00"):
+            await crud.create_expense(
+                test_session,
+                user_id=test_user.id,
+                family_id=test_family.id,
+                category_id=other.id,
+                amount=Decimal(amount)
+            )
+        await test_session.commit()
+        
+        report = await crud.get_family_expenses_detailed_report(test_session, test_family.id)
+        
+        assert report['total'] == Decimal("150.50")
+        assert isinstance(report['total'], Decimal)
+        assert report['count'] == 3
+        first, second = report['by_category']
+        assert first['category_id'] == test_category.id
+        assert [e['description'] for e in first['expenses']] == ["Test expense"]
+        assert second['category_id'] == other.id
+        assert second['count'] == len(second['expenses']) == 2
+        assert second['expenses'][0]['description'] == "—"
+        assert round(first['percentage'] + second['percentage']) == 100
+        assert await crud.get_user_expenses_detailed_monthly_report(
+            test_session, test_user.id, test_family.id
+        ) == report
+    
+    @pytest.mark.asyncio
+    async def test_get_family_expenses_summary(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test family summary splits totals by category and by user."""
+        summary = await crud.get_family_expenses_summary(test_session, test_family.id)
+        
+        assert summary['total'] == Decimal("100.50")
+        assert isinstance(summary['by_category'][0]['amount'], Decimal)
+        assert summary['count'] == 1
+        assert summary['by_category'] == [{
+            'category_id': test_category.id,
+            'category_name': test_category.name,
+            'category_icon': test_category.icon,
+            'amount': Decimal("100.50"),
+            'count': 1
+        }]
+        assert summary['by_user'] == [{
+            'user_id': test_user.id,
+            'user_name': test_user.name,
+            'amount': Decimal("100.50"),
+            'count': 1
+        }]
+    
+    @pytest.mark.asyncio
+    async def test_get_user_expenses_summary(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test user summary and period statistics share category totals."""
+        summary = await crud.get_user_expenses_summary(test_session, test_user.id, test_family.id)
+        statistics = await crud.get_period_statistics(test_session, test_family.id, is_family=True)
+        
+        assert summary['total'] == statistics['total'] == Decimal("100.50")
+        assert isinstance(summary['total'], Decimal)
+        assert isinstance(summary['count'], int)
+        assert summary['count'] == statistics['count'] == 1
+        assert summary['by_category'][0]['category_id'] == test_category.id
+        assert statistics['by_category'][0]['percentage'] == 100.0
+        expenses = statistics['by_category'][0]['expenses']
+        assert [e['amount'] for e in expenses] == [Decimal("100.50")]
+    
+    @pytest.mark.asyncio
+    async def test_expenses_summary_cache(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test bounded-period summaries are cached until an expense is added."""
+        start_date, end_date = crud.calculate_date_range("today")
+        
+        summary = await crud.get_family_expenses_summary(
+            test_session, test_family.id, start_date, end_date
+        )
+        assert await crud.get_family_expenses_summary(
+            test_session, test_family.id, start_date, end_date
+        ) is summary
+        # Unbounded periods always hit the database
+        assert await crud.get_family_expenses_summary(test_session, test_family.id) is not summary
+        
+        await crud.create_expense(
+            test_session,
+            user_id=test_user.id,
+            family_id=test_family.id,
+            category_id=test_category.id,
+            amount=Decimal("9.50")
+        )
+        # Cached entries are only dropped once the write is committed
+        assert await crud.get_family_expenses_summary(
+            test_session, test_family.id, start_date, end_date
+        ) is summary
+        await test_session.commit()
+        
+        refreshed = await crud.get_family_expenses_summary(
+            test_session, test_family.id, start_date, end_date
+        )
+        assert refreshed['total'] == Decimal("110.00")
+        assert refreshed['count'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_summary_cache_kept_on_rollback(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test a rolled back write leaves cached summaries in place."""
+        await test_session.commit()
+        start_date, end_date = crud.calculate_date_range("today")
+        summary = await crud.get_family_expenses_summary(
+            test_session, test_family.id, start_date, end_date
+        )
+        
+        await crud.create_expense(
+            test_session,
+            user_id=test_user.id,
+            family_id=test_family.id,
+            category_id=test_category.id,
+            amount=Decimal("9.50")
+        )
+        family_id = test_family.id
+        await test_session.rollback()
+        
+        assert await crud.get_family_expenses_summary(
+            test_session, family_id, start_date, end_date
+        ) is summary
+    
+    @pytest.mark.asyncio
+    async def test_delete_family_invalidates_summaries(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_expense: Expense
+    ):
+        """Test deleting a family drops its members' personal summaries."""
+        start_date, end_date = crud.calculate_date_range("month")
+        personal = await crud.get_detailed_statistics(
+            test_session, test_user.id, start_date, end_date
+        )
+        assert personal['total'] == Decimal("100.50")
+        
+        await crud.delete_family(test_session, test_family)
+        await test_session.commit()
+        
+        personal = await crud.get_detailed_statistics(
+            test_session, test_user.id, start_date, end_date
+        )
+        assert personal['total'] == 0
+    
+    def test_summary_cache_sweeps_expired_entries(self, monkeypatch):
+        """Test caching a summary drops the scope's expired entries."""
+        scope = ('family', 1)
+        monkeypatch.setattr(crud.time, 'monotonic', lambda: 0.0)
+        crud._cache_summary(scope, ('old',), {})
+        
+        monkeypatch.setattr(crud.time, 'monotonic', lambda: crud.SUMMARY_CACHE_TTL + 1.0)
+        crud._cache_summary(scope, ('new',), {})
+        
+        assert list(crud._summary_cache[scope]) == [('new',)]
+    
+    @pytest.mark.asyncio
+    async def test_statistics_cache(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test statistics are cached per user and family until an expense is added."""
+        start_date, end_date = crud.calculate_date_range("month")
+        
+        personal = await crud.get_detailed_statistics(
+            test_session, test_user.id, start_date, end_date
+        )
+        family = await crud.get_period_statistics(
+            test_session, test_family.id, start_date, end_date, is_family=True
+        )
+        assert await crud.get_detailed_statistics(
+            test_session, test_user.id, start_date, end_date
+        ) is personal
+        assert await crud.get_period_statistics(
+            test_session, test_family.id, start_date, end_date, is_family=True
+        ) is family
+        
+        await crud.create_expense(
+            test_session,
+            user_id=test_user.id,
+            family_id=test_family.id,
+            category_id=test_category.id,
+            amount=Decimal("9.50")
+        )
+        await test_session.commit()
+        
+        personal = await crud.get_detailed_statistics(
+            test_session, test_user.id, start_date, end_date
+        )
+        family = await crud.get_period_statistics(
+            test_session, test_family.id, start_date, end_date, is_family=True
+        )
+        assert personal['total'] == family['total'] == Decimal("110.00")
+    
+    @pytest.mark.asyncio
+    async def test_get_detailed_statistics(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test detailed statistics come from a single statement."""
+        other = Category(name="Other Category", icon="📦", is_default=True)
+        test_session.add(other)
+        await test_session.commit()
+        await crud.create_expense(
+            test_session,
+            user_id=test_user.id,
+            family_id=test_family.id,
+            category_id=other.id,
+            amount=Decimal("20.00")
+        )
+        await test_session.commit()
+        statements = []
+        engine = test_session.bind.sync_engine
+        
+        def count(*args):
+            # The per-test SAVEPOINT stands in for the driver's implicit BEGIN
+            if not args[2].startswith("SAVEPOINT"):
+                statements.append(args[2])
+        
+        start_date, end_date = crud.calculate_date_range("month")
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            statistics = await crud.get_detailed_statistics(
+                test_session, test_family.id, start_date, end_date, is_family=True
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        
+        assert len(statements) == 1
+        assert statistics['total'] == Decimal("120.50")
+        first, second = statistics['by_category']
+        assert [e['id'] for e in first['expenses']] == [test_expense.id]
+        assert first['expenses'][0]['user_name'] == test_user.name
+        assert second['category_id'] == other.id
+        assert [e['amount'] for e in second['expenses']] == [Decimal("20.00")]
+    
+    @pytest.mark.asyncio
+    async def test_get_available_periods(
+        self,
+        test_session: AsyncSession,
+        test_family: Family,
+        test_expense: Expense
+    ):
+        """Test available periods list expense months and their years."""
+        periods = await crud.get_available_periods(test_session, test_family.id, is_family=True)
+        
+        assert periods == {
+            'months': [(test_expense.date.year, test_expense.date.month)],
+            'years': [test_expense.date.year]
+        }
+    
+    @pytest.mark.asyncio
+    async def test_daily_expenses(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test daily totals and the top expense day share one aggregation."""
+        daily = await crud.get_daily_expenses(test_session, test_family.id, is_family=True)
+        top_day = await crud.get_top_expense_day(test_session, test_user.id)
+        
+        assert daily == [top_day]
+        assert top_day[1] == Decimal("100.50")
+        assert crud.find_top_expense_day(daily) == top_day
+        assert crud.find_top_expense_day([]) is None
+    
+    @pytest.mark.asyncio
+    async def test_get_category_details(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test category totals cover all expenses while the list is paginated."""
+        await crud.create_expense(
+            test_session,
+            user_id=test_user.id,
+            family_id=test_family.id,
+            category_id=test_category.id,
+            amount=Decimal("9.50")
+        )
+        
+        details = await crud.get_category_details(
+            test_session, test_family.id, test_category.id, is_family=True, limit=1
+        )
+        totals = await crud.get_category_details(
+            test_session, test_user.id, test_category.id, totals_only=True
+        )
+        
+        assert details['total'] == totals['total'] == Decimal("110.00")
+        assert details['count'] == totals['count'] == 2
+        assert len(details['expenses']) == 1
+        assert details['expenses'][0]['user_name'] == test_user.name
+        assert totals['expenses'] == []
+    
+    @pytest.mark.asyncio
+    async def test_get_two_period_statistics(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test current and previous periods are split from one query."""
+        test_expense.date = datetime(2025, 1, 15)
+        await crud.create_expense(
+            test_session,
+            user_id=test_user.id,
+            family_id=test_family.id,
+            category_id=test_category.id,
+            amount=Decimal("9.50")
+        )
+        await test_session.commit()
+        
+        current, previous = await crud.get_two_period_statistics(
+            test_session, test_family.id,
+            datetime.now() - timedelta(days=1), datetime.now() + timedelta(days=1),
+            datetime(2025, 1, 1), datetime(2025, 1, 31),
+            is_family=True
+        )
+        
+        assert (current['total'], current['count']) == (Decimal("9.50"), 1)
+        assert (previous['total'], previous['count']) == (Decimal("100.50"), 1)
+        assert previous['by_category'][0]['percentage'] == 100.0
+        assert crud.compare_periods(current, previous)['count_change'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_get_period_income_statistics(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family
+    ):
+        """Test income statistics list every category's incomes from one statement."""
+        salary = Category(
+            name="Salary", icon="💼", is_default=True, category_type=CategoryTypeEnum.INCOME
+        )
+        gifts = Category(
+            name="Gifts", icon="🎁", is_default=True, category_type=CategoryTypeEnum.INCOME
+        )
+        test_session.add_all([salary, gifts])
+        await test_session.commit()
+        for category, amount in ((salary, "300.00"), (salary, "100.00"), (gifts, "100.00")):
+            await crud.create_income(
+                test_session,
+                user_id=test_user.id,
+                family_id=test_family.id,
+                category_id=category.id,
+                amount=Decimal(amount)
+            )
+        statements = []
+        engine = test_session.bind.sync_engine
+        
+        def count(*args):
+            # The per-test SAVEPOINT stands in for the driver's implicit BEGIN
+            if not args[2].startswith("SAVEPOINT"):
+                statements.append(args[2])
+        
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            statistics = await crud.get_period_income_statistics(
+                test_session, test_family.id, is_family=True
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        
+        assert len(statements) == 1
+        assert (statistics['total'], statistics['count']) == (Decimal("500.00"), 3)
+        first, second = statistics['by_category']
+        assert (first['category_id'], first['count'], first['percentage']) == (salary.id, 2, 80.0)
+        assert sorted(e['amount'] for e in first['expenses']) == [
+            Decimal("100.00"), Decimal("300.00")
+        ]
+        assert second['expenses'][0]['description'] == "—"
+    
+    @pytest.mark.asyncio
+    async def test_statistics_errors_are_logged(self, caplog):
+        """Test statistics failures are logged with the entity, then re-raised."""
+        with pytest.raises(AttributeError):
+            await crud.get_daily_expenses(None, 5, is_family=True)
+        
+        assert "Error getting daily expenses for family 5" in caplog.text
+    
+    def test_compare_periods(self):
+        """Test period comparison, including changes from an empty period."""
+        comparison = crud.compare_periods(
+            {'total': Decimal("150"), 'count': 3},
+            {'total': Decimal("100"), 'count': 0}
+        )
+        
+        assert comparison == {
+            'total_change': Decimal("50"),
+            'total_change_percent': 50.0,
+            'count_change': 3,
+            'count_change_percent': 100.0
+        }
+    
+    @pytest.mark.asyncio
+    async def test_search_expenses(
+        self,
+        test_session: AsyncSession,
+        test_user: User,
+        test_family: Family,
+        test_category: Category,
+        test_expense: Expense
+    ):
+        """Test search loads only the limit, with totals over all matches, in one statement."""
+        await crud.create_expense(
+            test_session,
+            user_id=test_user.id,
+            family_id=test_family.id,
+            category_id=test_category.id,
+            amount=Decimal("9.50"),
+            description="Test lunch"
+        )
+        
+        statements = []
+        engine = test_session.bind.sync_engine
+        
+        def count(*args):
+            # The per-test SAVEPOINT stands in for the driver's implicit BEGIN
+            if not args[2].startswith("SAVEPOINT"):
+                statements.append(args[2])
+        
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            results = await crud.search_expenses(
+                test_session, test_family.id, is_family=True, query="test", limit=1
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        
+        assert len(statements) == 1
+        assert results['count'] == 2
+        assert results['total'] == Decimal("110.00")
+        assert len(results['expenses']) == 1
+        assert results['expenses'][0].user.name == test_user.name
+        assert await crud.search_expenses(test_session, test_user.id, query="missing") == {
+            'total': Decimal('0'), 'count': 0, 'expenses': []
+        }
+    
+    def test_calculate_date_range(self):
+        """Test periods span whole days, weeks and months."""
+        for period, min_days, max_days in (("today", 1, 1), ("week", 7, 7), ("month", 28, 31)):
+            start, end = crud.calculate_date_range(period)
+            next_start = end + timedelta(microseconds=1)
+            
+            assert start <= datetime.now() < next_start
+            assert start.time() == next_start.time() == datetime.min.time()
+            assert min_days <= (next_start - start).days <= max_days
+        
+        assert crud.calculate_date_range("month")[0].day == 1
+        assert crud.calculate_date_range("week")[0].weekday() == 0
+        assert crud.calculate_date_range("all") == (None, None)
     
     @pytest.mark.asyncio
     async def test_update_user_settings(self, test_session: AsyncSession, test_user: User):
@@ -291,6 +1070,95 @@ class TestCRUD:
         
         assert updated_user.currency == "$"
         assert updated_user.timezone == "America/New_York"
+        # Already loaded instance is refreshed from RETURNING
+        assert updated_user is test_user
+        assert test_user.currency == "$"
+        # Only unknown keys: nothing is written, loaded user is returned
+        assert await crud.update_user_settings(test_session, test_user.id, foo="bar") is test_user
+        assert await crud.update_user_settings(test_session, 999999) is None
+    
+    @pytest.mark.asyncio
+    async def test_update_family_settings_ignores_unknown_fields(
+        self,
+        test_session: AsyncSession,
+        test_family: Family
+    ):
+        """Test that only whitelisted family fields are updated."""
+        family = await crud.update_family_settings(
+            test_session,
+            test_family.id,
+            name="Renamed",
+            invite_code="HACKED00"
+        )
+        
+        assert family.name == "Renamed"
+        assert family.invite_code == "TESTCODE"
+        assert await crud.update_family_settings(test_session, 999999, name="X") is None
+    
+    @pytest.mark.asyncio
+    async def test_category_name_exists(
+        self,
+        test_session: AsyncSession,
+        test_family: Family
+    ):
+        """Test category name lookup scoped by family and excluded id."""
+        category = await crud.create_category(test_session, "Pets", "🐶", family_id=test_family.id)
+        
+        assert await crud.category_name_exists(test_session, "Pets", family_id=test_family.id)
+        assert not await crud.category_name_exists(test_session, "Pets")
+        assert not await crud.category_name_exists(
+            test_session,
+            "Pets",
+            family_id=test_family.id,
+            exclude_category_id=category.id
+        )
+    
+    @pytest.mark.asyncio
+    async def test_merge_and_delete_category(
+        self,
+        test_session: AsyncSession,
+        test_expense: Expense,
+        test_category: Category
+    ):
+        """Test moving expenses to another category and deleting the old one."""
+        target = Category(name="Target Category", icon="🎯", is_default=True)
+        test_session.add(target)
+        await test_session.commit()
+        
+        assert await crud.count_category_expenses(test_session, test_category.id) == 1
+        assert await crud.count_category_incomes(test_session, test_category.id) == 0
+        
+        moved_expenses, moved_incomes, deleted = await crud.merge_and_delete_category(
+            test_session,
+            test_category.id,
+            target.id
+        )
+        await test_session.commit()
+        
+        assert (moved_expenses, moved_incomes, deleted) == (1, 0, True)
+        assert await crud.get_category_by_id(test_session, test_category.id) is None
+        result = await test_session.execute(
+            select(Expense.category_id).where(Expense.id == test_expense.id)
+        )
+        assert result.scalar() == target.id
+    
+    @pytest.mark.asyncio
+    async def test_get_family_categories_lite(
+        self,
+        test_session: AsyncSession,
+        test_family: Family,
+        test_category: Category
+    ):
+        """Test lightweight category rows match the ORM listing."""
+        await crud.create_category(test_session, "Pets", "🐶", family_id=test_family.id)
+        
+        rows = await crud.get_family_categories_lite(test_session, test_family.id)
+        categories = await crud.get_family_categories(test_session, test_family.id)
+        
+        assert [row.id for row in rows] == [cat.id for cat in categories]
+        assert rows[0] == (test_category.id, test_category.name, test_category.icon, True)
+        assert rows[-1].name == "Pets"
+        assert rows[-1].is_default is False
     
     @pytest.mark.asyncio
     async def test_get_default_categories(self, test_session: AsyncSession):
@@ -311,6 +1179,14 @@ class TestCRUD:
         for cat in default_cats:
             assert cat.is_default is True
             assert cat.family_id is None
+        
+        expense_cats = await crud.get_default_categories(
+            test_session, category_type=CategoryTypeEnum.EXPENSE
+        )
+        assert {cat.name for cat in expense_cats} >= {"Food", "Transport", "Entertainment"}
+        assert await crud.get_default_categories(
+            test_session, category_type=CategoryTypeEnum.INCOME
+        ) == []
     
     @pytest.mark.asyncio
     async def test_cascade_delete_family(
@@ -2,8 +2,7 @@
 
 import pytest
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock, patch
-from telegram import Update, User as TelegramUser, Message, Chat
+from unittest.mock import MagicMock, patch
 from telegram.ext import ContextTypes, ConversationHandler
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,23 +14,14 @@ class TestStartHandler:
     """Test /start command handler."""
     
     @pytest.mark.asyncio
-    async def test_start_new_user(self, test_session: AsyncSession, mock_settings):
+    async def test_start_new_user(self, test_session: AsyncSession, make_update, mock_settings):
         """Test /start command for a new user."""
         # Create mocks
-        update = MagicMock(spec=Update)
+        update = make_update(
+            telegram_id=999888777, first_name="New", last_name="User", username="newuser"
+        )
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         
-        # Mock user
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = 999888777
-        telegram_user.first_name = "New"
-        telegram_user.last_name = "User"
-        telegram_user.username = "newuser"
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
         # Patch the database session
         with patch('bot.handlers.start.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
@@ -49,22 +39,18 @@ class TestStartHandler:
         self,
         test_session: AsyncSession,
         test_user: User,
+        make_update,
         mock_settings
     ):
         """Test /start command for an existing user."""
-        update = MagicMock(spec=Update)
+        update = make_update(
+            telegram_id=test_user.telegram_id,
+            first_name="Test",
+            last_name="User",
+            username=test_user.username
+        )
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        telegram_user.first_name = "Test"
-        telegram_user.last_name = "User"
-        telegram_user.username = test_user.username
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.start.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -78,19 +64,14 @@ class TestFamilyHandlers:
     """Test family-related handlers."""
     
     @pytest.mark.asyncio
-    async def test_create_family_start(self, test_session: AsyncSession, mock_settings):
+    async def test_create_family_start(
+        self, test_session: AsyncSession, make_update, mock_settings
+    ):
         """Test starting family creation."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=123456789)
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = 123456789
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.family.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -107,21 +88,14 @@ class TestFamilyHandlers:
         self,
         test_session: AsyncSession,
         test_user: User,
+        make_update,
         mock_settings
     ):
         """Test receiving family name."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=test_user.telegram_id, text="My New Family")
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.text = "My New Family"
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.family.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -139,21 +113,14 @@ class TestFamilyHandlers:
         test_session: AsyncSession,
         test_user: User,
         test_family: Family,
+        make_update,
         mock_settings
     ):
         """Test joining a family with invite code."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=test_user.telegram_id, text=test_family.invite_code)
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.text = test_family.invite_code
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.family.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -168,21 +135,14 @@ class TestFamilyHandlers:
         self,
         test_session: AsyncSession,
         test_user: User,
+        make_update,
         mock_settings
     ):
         """Test joining a family with invalid invite code."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=test_user.telegram_id, text="INVALIDCODE")
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.text = "INVALIDCODE"
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.family.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -205,20 +165,14 @@ class TestExpenseHandlers:
         test_user: User,
         test_family: Family,
         test_family_member: FamilyMember,
+        make_update,
         mock_settings
     ):
         """Test starting expense addition."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=test_user.telegram_id)
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.expenses.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -234,21 +188,14 @@ class TestExpenseHandlers:
         test_session: AsyncSession,
         test_user: User,
         test_family: Family,
+        make_update,
         mock_settings
     ):
         """Test entering valid expense amount."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=test_user.telegram_id, text="150.50")
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {'family_id': test_family.id}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.text = "150.50"
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.expenses.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -264,21 +211,14 @@ class TestExpenseHandlers:
         self,
         test_session: AsyncSession,
         test_user: User,
+        make_update,
         mock_settings
     ):
         """Test entering invalid expense amount."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=test_user.telegram_id, text="invalid_amount")
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.text = "invalid_amount"
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.expenses.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -288,7 +228,8 @@ class TestExpenseHandlers:
             # Should ask again
             update.message.reply_text.assert_called()
             call_args = update.message.reply_text.call_args[0][0]
-            assert "ошибка" in call_args.lower() or "error" in call_args.lower() or "некорректно" in call_args.lower()
+            text = call_args.lower()
+            assert "ошибка" in text or "error" in text or "некорректно" in text
     
     @pytest.mark.asyncio
     async def test_view_expenses(
@@ -298,20 +239,14 @@ class TestExpenseHandlers:
         test_family: Family,
         test_family_member: FamilyMember,
         test_expense: Expense,
+        make_update,
         mock_settings
     ):
         """Test viewing expenses."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=test_user.telegram_id)
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.expenses.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -333,20 +268,14 @@ class TestStatisticsHandlers:
         test_family: Family,
         test_family_member: FamilyMember,
         test_expense: Expense,
+        make_update,
         mock_settings
     ):
         """Test statistics command."""
-        update = MagicMock(spec=Update)
+        update = make_update(telegram_id=test_user.telegram_id)
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {}
         
-        telegram_user = MagicMock(spec=TelegramUser)
-        telegram_user.id = test_user.telegram_id
-        
-        update.effective_user = telegram_user
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
         with patch('bot.handlers.statistics.get_session') as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = test_session
             
@@ -361,15 +290,12 @@ class TestErrorHandling:
     """Test error handling."""
     
     @pytest.mark.asyncio
-    async def test_cancel_handler(self):
+    async def test_cancel_handler(self, make_update):
         """Test cancel command."""
-        update = MagicMock(spec=Update)
+        update = make_update()
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.user_data = {'some_data': 'value'}
         
-        update.message = MagicMock(spec=Message)
-        update.message.reply_text = AsyncMock()
-        
         from bot.handlers.navigation import cancel_handler
         result = await cancel_handler(update, context)
         
@@ -378,15 +304,12 @@ class TestErrorHandling:
         update.message.reply_text.assert_called()
     
     @pytest.mark.asyncio
-    async def test_error_handler(self):
+    async def test_error_handler(self, make_update):
         """Test global error handler."""
-        update = MagicMock(spec=Update)
+        update = make_update()
         context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
         context.error = Exception("Test error")
         
-        update.effective_message = MagicMock(spec=Message)
-        update.effective_message.reply_text = AsyncMock()
-        
         from bot.handlers.errors import error_handler
         await error_handler(update, context)
         